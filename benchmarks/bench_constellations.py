@@ -0,0 +1,60 @@
+# benchmarks/bench_constellations.py
+"""
+Benchmark of the prime constellation tables (utils/prime_constellations.py): time to build them up to a reasoner's
+upper_bound, then twin / triplet / quadruplet claims (half of them true constellations, half with a shifted member)
+confirmed by index lookup against the former check (gap pattern, then every member through isprime). Both must
+agree on every claim.
+Run from the repository root:  python -m benchmarks.bench_constellations [--claims N] [--bound N] [--seed N]
+"""
+
+import argparse
+import random
+from time import perf_counter
+from utils.prime_service import isprime
+from utils.prime_constellations import ConstellationTable, CONSTELLATION_PATTERNS
+
+def member_check(op, members):
+    """ The former check: one of the op's spacings, and every member prime. """
+    offsets = tuple(m - members[0] for m in members)
+    return offsets in CONSTELLATION_PATTERNS[op] and all(isprime(m) for m in members)
+
+def build_claims(table, op, claims, rng):
+    out = []
+    for _ in range(claims):
+        patterns = table.starts[op]
+        offsets = rng.choice([o for o, starts in patterns.items() if len(starts)])
+        members = [int(patterns[offsets][rng.randrange(len(patterns[offsets]))]) + o for o in offsets]
+        if rng.random() < 0.5:
+            members[rng.randrange(len(members))] += rng.choice([-2, 2, 4])
+        out.append(sorted(members))
+    return out
+
+def run(claims, bound, seed):
+    rng = random.Random(seed)
+    table = ConstellationTable()
+    isprime(bound) # the prime table is built beforehand: only the constellation pass is timed
+    t0 = perf_counter()
+    table.ensure(bound)
+    t_build = perf_counter() - t0
+    counts = ", ".join(f"{sum(len(s) for s in table.starts[op].values())} {op}" for op in CONSTELLATION_PATTERNS)
+    print(f"tables to {table.limit}: {counts}, {len(table.gap_records)} maximal gaps, built in {1000 * t_build:.1f} ms")
+    print(f"{'constellation':>17} | {'claims':>6} | {'lookup us':>9} | {'isprime us':>10} | {'speedup':>7} | mismatches")
+    for op in CONSTELLATION_PATTERNS:
+        cases = build_claims(table, op, claims, rng)
+        t0 = perf_counter()
+        found = [table.index(op, members) > 0 for members in cases]
+        t_lookup = perf_counter() - t0
+        t0 = perf_counter()
+        expected = [member_check(op, members) for members in cases]
+        t_check = perf_counter() - t0
+        mismatches = sum(1 for a, b in zip(found, expected) if a != b)
+        print(f"{op:>17} | {len(cases):>6} | {1e6 * t_lookup / len(cases):>9.2f} | {1e6 * t_check / len(cases):>10.2f} | "
+              f"{t_check / max(t_lookup, 1e-9):>6.1f}x | {mismatches}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--claims", type=int, default=5000, help="claims per constellation")
+    parser.add_argument("--bound", type=int, default=10**6, help="upper_bound the tables are built to")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the claims")
+    args = parser.parse_args()
+    run(args.claims, args.bound, args.seed)
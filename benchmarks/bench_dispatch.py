@@ -0,0 +1,92 @@
+# benchmarks/bench_dispatch.py
+"""
+Microbenchmark of op dispatch in the reasoning loop: per-call overhead of Reasoner.process_graph and of the tree
+search's action registry, with the op registry (reasoning/op_registry.py, built once at import) against the former
+dispatch (a dict of 30 lambdas rebuilt on every process_graph call; an action closure building a CallAction and
+looking its method up by name on every call). The reasoning itself is replaced by a no-op so only dispatch is timed;
+a full pass over the configured sentences then checks that both dispatches return the same results.
+Run from the repository root:  python -m benchmarks.bench_dispatch [--calls N]
+"""
+
+import argparse
+from functools import partial
+from time import perf_counter
+import networkx as nx
+from config.settings import sentences, action_ops
+from utils.text_helpers import normalize_sentence
+from models.semantic_parser import parse_math_sentence
+from models.graph_reasoner import equation_to_graph
+from reasoning.reasoning_core import Reasoner
+from reasoning.tree_search_core import CallAction
+from reasoning.op_registry import OP_SPECS
+from loggers.log_utils import build_action_registry
+
+def rebuilt_map_dispatch(reasoner, graph, reasons):
+    """ The former process_graph: the op -> lambda map is built again for every graph. """
+    op = graph.graph.get('operation')
+    operation_map = {name: (lambda g, reason=reason: reason(g, lambda role: reasoner._get_node_by_role(g, role)))
+                     for name, reason in reasons.items()}
+    handler = operation_map.get(op)
+    return handler(graph) if handler else None
+
+def spec_dispatch(reasoner, graph, reasons):
+    """ process_graph now: one lookup in the table built at import. """
+    reason = reasons.get(graph.graph.get('operation'))
+    return reason(graph, partial(reasoner._get_node_by_role, graph)) if reason else None
+
+def by_name_action(action_name):
+    """ The former registry entry: CallAction built and its method looked up by name on every call. """
+    def wrapper(graph, state):
+        return CallAction(graph, state, display=True).__getattribute__(action_name)()
+    return wrapper
+
+def build_graphs():
+    graphs = []
+    for sentence in sentences:
+        try:
+            graph = equation_to_graph(parse_math_sentence(normalize_sentence(sentence)))
+        except Exception:
+            continue
+        if isinstance(graph, nx.DiGraph) and graph.graph.get('operation') in OP_SPECS:
+            graphs.append(graph)
+    return graphs
+
+def per_call(fn, graphs, calls):
+    rounds = max(1, calls // len(graphs))
+    t0 = perf_counter()
+    for _ in range(rounds):
+        for graph in graphs:
+            fn(graph)
+    return (perf_counter() - t0) / (rounds * len(graphs))
+
+def run(calls):
+    graphs = build_graphs()
+    reasoner = Reasoner(upper_bound=2000)
+    no_op = {op: (lambda graph, get_node_by_role: None) for op in OP_SPECS}
+    # No-op reasoning behind both action registries too: the timed call is only the dispatch
+    idle = type('IdleReasoner', (), {'process_graph': lambda self, graph: None})()
+    state = {'reasoner': idle}
+    old_actions = {op: by_name_action(name) for op, name in action_ops.items()}
+    new_actions = build_action_registry(action_ops)
+    timings = [
+        ("process_graph", per_call(lambda g: rebuilt_map_dispatch(reasoner, g, no_op), graphs, calls),
+                          per_call(lambda g: spec_dispatch(reasoner, g, no_op), graphs, calls)),
+        ("action", per_call(lambda g: old_actions[g.graph['operation']](g, state), graphs, calls),
+                   per_call(lambda g: new_actions[g.graph['operation']](g, state), graphs, calls)),
+    ]
+    # Same results through the real reasoning (graph, state and description of every action)
+    state = {'reasoner': reasoner}
+    reasons = {op: spec.reason for op, spec in OP_SPECS.items()}
+    mismatches = sum(1 for graph in graphs if rebuilt_map_dispatch(reasoner, graph, reasons) != reasoner.process_graph(graph))
+    op_actions = [(old_actions[op], new_actions[op]) for op in (graph.graph['operation'] for graph in graphs)]
+    mismatches += sum(1 for graph, (old, new) in zip(graphs, op_actions) if old(graph, state)[2] != new(graph, state)[2])
+    print(f"{'dispatch':>13} | {'graphs':>6} | {'former ns/call':>14} | {'op registry ns/call':>19} | {'speedup':>7}")
+    for name, former, current in timings:
+        print(f"{name:>13} | {len(graphs):>6} | {1e9 * former:>14.0f} | {1e9 * current:>19.0f} | {former / max(current, 1e-12):>6.1f}x")
+    print(f"mismatches {mismatches}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=100000, help="dispatches timed per variant")
+    args = parser.parse_args()
+    run(args.calls)
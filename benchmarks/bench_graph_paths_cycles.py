@@ -0,0 +1,82 @@
+# benchmarks/bench_graph_paths_cycles.py
+"""
+Benchmark of the bounded path / cycle enumeration (reasoning/graph_candidate_handlers.py) against the previous
+pairwise nx.all_simple_paths loop and unbounded nx.simple_cycles, on the per-sentence graphs of the configured
+sentences and on the merged global graph (nx.compose of all of them, as utils/visualization_helpers.py builds it).
+The global graph is also merged with relabeled copies of itself, standing in for the knowledge graph of a longer run.
+Both implementations must produce the same paths (in the same order) and the same cycles.
+Run from the repository root:  python -m benchmarks.bench_graph_paths_cycles [--repeat N] [--copies N]
+"""
+
+import argparse
+from time import perf_counter
+import networkx as nx
+from config.settings import sentences, GRAPH_CYCLE_MAX_LENGTH
+from utils.text_helpers import normalize_sentence
+from models.semantic_parser import parse_math_sentence
+from models.graph_reasoner import equation_to_graph
+from reasoning.graph_candidate_handlers import transitive_paths, bounded_cycles
+
+def build_graphs():
+    graphs = []
+    for sentence in sentences:
+        graph = equation_to_graph(parse_math_sentence(normalize_sentence(sentence)))
+        if isinstance(graph, (nx.Graph, nx.DiGraph)):
+            graphs.append(graph)
+    return graphs
+
+def merged(graphs, copies=1):
+    global_graph = nx.DiGraph()
+    for graph in graphs:
+        global_graph = nx.compose(global_graph, graph)
+    if copies > 1:
+        global_graph = nx.union_all([nx.relabel_nodes(global_graph, {n: (i, n) for n in global_graph}) for i in range(copies)])
+    return global_graph
+
+def pairwise_paths(graph):
+    paths = []
+    for n1 in graph.nodes():
+        for n2 in graph.nodes():
+            if n1 != n2:
+                paths.extend(path for path in nx.all_simple_paths(graph, n1, n2, cutoff=2) if len(path) == 3)
+    return paths
+
+def unbounded_cycles(graph):
+    cycles = nx.simple_cycles(graph) if graph.is_directed() else nx.cycle_basis(graph)
+    return [cycle for cycle in cycles if 1 < len(cycle) <= GRAPH_CYCLE_MAX_LENGTH]
+
+def _rotation(cycle):
+    i = min(range(len(cycle)), key=lambda k: str(cycle[k]))
+    return tuple(str(n) for n in cycle[i:] + cycle[:i])
+
+def timed(func, graphs, repeat):
+    t0 = perf_counter()
+    for _ in range(repeat):
+        out = [func(graph) for graph in graphs]
+    return (perf_counter() - t0) / repeat, out
+
+def run(repeat, copies):
+    graphs = build_graphs()
+    workloads = {"per-sentence": graphs, "global": [merged(graphs)]}
+    if copies > 1:
+        workloads[f"global x{copies}"] = [merged(graphs, copies)]
+    print(f"{'workload':>12} | {'nodes':>5} | {'edges':>5} | {'what':>6} | {'old ms':>9} | {'new ms':>9} | {'speedup':>7} | {'found':>5} | mismatches")
+    for name, workload in workloads.items():
+        nodes = sum(graph.number_of_nodes() for graph in workload)
+        edges = sum(graph.number_of_edges() for graph in workload)
+        cases = [("paths", pairwise_paths, lambda graph: list(transitive_paths(graph)), lambda out: out),
+                 ("cycles", unbounded_cycles, lambda graph: [c for c in bounded_cycles(graph) if len(c) > 1],
+                  lambda out: sorted(_rotation(cycle) for cycle in out))]
+        for what, old, new, key in cases:
+            t_old, expected = timed(old, workload, repeat)
+            t_new, got = timed(new, workload, repeat)
+            mismatches = sum(1 for e, g in zip(expected, got) if key(e) != key(g))
+            print(f"{name:>12} | {nodes:>5} | {edges:>5} | {what:>6} | {1000 * t_old:>9.3f} | {1000 * t_new:>9.3f} | "
+                  f"{t_old / max(t_new, 1e-9):>6.1f}x | {sum(len(g) for g in got):>5} | {mismatches}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions per workload")
+    parser.add_argument("--copies", type=int, default=8, help="relabeled copies merged into the scaled global graph")
+    args = parser.parse_args()
+    run(args.repeat, args.copies)
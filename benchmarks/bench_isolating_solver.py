@@ -0,0 +1,70 @@
+# benchmarks/bench_isolating_solver.py
+"""
+Benchmark of the isolating solver (reasoning/isolating_solver.py) against sp.solve over the arithmetic ops.
+Equations come from the semantic parser (sentences with a variable operand) with varying numbers; every solution is
+checked against sp.solve's first root.
+Run from the repository root:  python -m benchmarks.bench_isolating_solver [--values N]
+"""
+
+import argparse
+from time import perf_counter
+import sympy as sp
+from utils.text_helpers import normalize_sentence
+from models.semantic_parser import parse_math_sentence
+from reasoning.symbolic_tools import build_sympy_equation
+from reasoning.isolating_solver import isolate, SHAPE_CACHE, SOLVER_STATS
+
+# op -> sentence templates ({a}, {b} are numbers)
+TEMPLATES = {
+    'add': ["The sum of x and {a} is {b}.", "The sum of {a} and y is {b}."],
+    'sub': ["x minus {a} is {b}.", "{b} minus y is {a}."],
+    'mul': ["The product of {a} and x equals {b}.", "Three times y equals {b}."],
+    'div': ["x divided by {a} is {b}.", "the quotient of x and {a} is {b}."],
+    'squared': ["x squared equals {b}"],
+    'cubed': ["y cubed is {b}"],
+    'sqrt': ["the square root of x is {a}"],
+    'cbrt': ["the cube root of x is {a}"],
+    'root': ["the 4th root of x is {a}"],
+}
+
+def build_workload(values):
+    workload = {}
+    for op, templates in TEMPLATES.items():
+        eqs = []
+        for template in templates:
+            for a in range(2, values + 2):
+                parsed = parse_math_sentence(normalize_sentence(template.format(a=a, b=3 * a + 1)))
+                eq = build_sympy_equation(parsed).get('eq')
+                if isinstance(eq, sp.Equality):
+                    eqs.append(eq)
+        workload[op] = eqs
+    return workload
+
+def first_solution(eq, sym):
+    solved = sp.solve(eq, sym)
+    if not solved:
+        return None
+    return solved[0] if isinstance(solved, list) else solved
+
+def run(values):
+    workload = build_workload(values)
+    print(f"{'op':>8} | {'eqs':>4} | {'sp.solve ms':>11} | {'isolate ms':>10} | {'speedup':>7} | {'fast path':>9} | mismatches")
+    for op, eqs in workload.items():
+        pairs = [(eq, sym) for eq in eqs for sym in sorted(eq.free_symbols, key=str)]
+        t0 = perf_counter()
+        expected = [first_solution(eq, sym) for eq, sym in pairs]
+        t_solve = perf_counter() - t0
+        SHAPE_CACHE.clear()
+        SOLVER_STATS.update({key: 0 for key in SOLVER_STATS})
+        t0 = perf_counter()
+        got = [isolate(eq, sym) for eq, sym in pairs]
+        t_isolate = perf_counter() - t0
+        mismatches = sum(1 for e, g in zip(expected, got) if e != g)
+        n = max(len(pairs), 1)
+        print(f"{op:>8} | {len(pairs):>4} | {1000 * t_solve / n:>11.3f} | {1000 * t_isolate / n:>10.3f} | {t_solve / max(t_isolate, 1e-9):>6.1f}x | "
+              f"{SOLVER_STATS['fast']:>4}/{len(pairs):<4} | {mismatches}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--values", type=int, default=25, help="number of numeric variants per sentence template")
+    run(parser.parse_args().values)
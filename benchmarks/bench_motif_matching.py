@@ -0,0 +1,83 @@
+# benchmarks/bench_motif_matching.py
+"""
+Benchmark of motif matching (reasoning/graph_candidate_handlers.motif_subgraph_candidates) with the compiled,
+label-indexed motifs against running VF2 for every KNOWN_MOTIFS entry (with to_directed() per call), on the
+per-sentence graphs of the configured sentences and on the merged global graph, and of the batch motif miner
+(reasoning/motif_miner.py: one sweep over all the sentences, and record by record as the pipeline adds them).
+Reports VF2 runs (for the miner: VF2 runs of the disconnected motifs and anchored searches of the connected ones) and
+checks that the per-sentence matches are the same.
+Run from the repository root:  python -m benchmarks.bench_motif_matching [--repeat N]
+"""
+
+import argparse
+from time import perf_counter
+import networkx as nx
+from config.settings import sentences
+from utils.text_helpers import normalize_sentence
+from models.semantic_parser import parse_math_sentence
+from models.graph_reasoner import equation_to_graph
+from reasoning.graph_candidate_motifs import KNOWN_MOTIFS, MOTIF_STATS
+from reasoning.graph_candidate_handlers import motif_subgraph_candidates, flexible_node_match, flexible_edge_match, motif_candidate
+from reasoning.motif_miner import MotifMiner
+
+def build_records():
+    records = []
+    for step, sentence in enumerate(sentences, 1):
+        parsed = parse_math_sentence(normalize_sentence(sentence))
+        graph = equation_to_graph(parsed)
+        if isinstance(graph, nx.DiGraph):
+            records.append({"step": step, "sentence": sentence, "parsed": parsed, "graph": graph})
+    return records
+
+def unfiltered_matches(graph):
+    matches = []
+    for motif_name, motif_graph in KNOWN_MOTIFS.items():
+        motif = motif_graph if motif_graph.is_directed() else motif_graph.to_directed()
+        matcher = nx.algorithms.isomorphism.DiGraphMatcher(graph, motif, node_match=flexible_node_match, edge_match=flexible_edge_match)
+        for subiso in matcher.subgraph_isomorphisms_iter():
+            mapping = ', '.join(f"{pattern}->{data}" for pattern, data in subiso.items())
+            matches.append(f"Motif subgraph matched: {motif_name}, mapping [{mapping}]")
+    return matches
+
+def timed(func, items, repeat):
+    t0 = perf_counter()
+    for _ in range(repeat):
+        out = [func(item) for item in items]
+    return (perf_counter() - t0) / repeat, out
+
+def run(repeat):
+    records = build_records()
+    global_graph = nx.DiGraph()
+    for record in records:
+        global_graph = nx.compose(global_graph, record["graph"])
+    workloads = {"per-sentence": records, "global": [{**records[-1], "graph": global_graph}]}
+    print(f"{'workload':>12} | {'graphs':>6} | {'old ms':>8} | {'new ms':>8} | {'speedup':>7} | {'VF2 runs old/new':>16} | {'matches':>7} | mismatches")
+    for name, workload in workloads.items():
+        t_old, expected = timed(lambda record: unfiltered_matches(record["graph"]), workload, repeat)
+        MOTIF_STATS.update({key: 0 for key in MOTIF_STATS})
+        t_new, got = timed(lambda record: [c['derived_eq'] for c in motif_subgraph_candidates(record["graph"], record, True)], workload, repeat)
+        mismatches = sum(1 for e, g in zip(expected, got) if e != g)
+        runs_old = len(workload) * len(KNOWN_MOTIFS)
+        runs_new = MOTIF_STATS["vf2_runs"] // repeat
+        print(f"{name:>12} | {len(workload):>6} | {1000 * t_old:>8.2f} | {1000 * t_new:>8.2f} | {t_old / max(t_new, 1e-9):>6.1f}x | "
+              f"{f'{runs_old}/{runs_new}':>16} | {sum(len(g) for g in got):>7} | {mismatches}")
+    expected = [unfiltered_matches(record["graph"]) for record in records]
+    for name, batches in (("batch sweep", [list(enumerate(records))]), ("incremental", [[(i, record)] for i, record in enumerate(records)])):
+        MOTIF_STATS.update({key: 0 for key in MOTIF_STATS})
+        t0 = perf_counter()
+        for _ in range(repeat):
+            miner = MotifMiner()
+            for batch in batches:
+                miner.add(batch)
+        t_new = (perf_counter() - t0) / repeat
+        got = [[motif_candidate(record, motif_name, mapping, True)['derived_eq'] for motif_name, mapping in miner.record_matches(i)]
+               for i, record in enumerate(records)]
+        mismatches = sum(1 for e, g in zip(expected, got) if e != g)
+        runs = f'{MOTIF_STATS["vf2_runs"] // repeat} + {MOTIF_STATS["anchored_runs"] // repeat} anchored'
+        print(f"{name:>12} | {len(records):>6} | {'':>8} | {1000 * t_new:>8.2f} | {'':>7} | {runs:>16} | "
+              f"{sum(len(g) for g in got):>7} | {mismatches}  (+{len(miner.spanning_matches())} spanning sentences)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=10, help="timing repetitions per workload")
+    run(parser.parse_args().repeat)
@@ -0,0 +1,53 @@
+# benchmarks/bench_parallel_verification.py
+"""
+Scaling benchmark for the parallel verification stage.
+Verifies the equations of the configured sentences plus a set of heavier symbolic identities with 1/2/4/8/16 workers.
+Run from the repository root:  python -m benchmarks.bench_parallel_verification [--repeat N]
+"""
+
+import argparse
+from time import perf_counter
+import sympy as sp
+from config.settings import sentences
+from utils.text_helpers import normalize_sentence
+from models.semantic_parser import parse_math_sentence
+from reasoning.symbolic_tools import build_sympy_equation
+from verification.verification_executor import VerificationExecutor
+
+WORKER_COUNTS = [1, 2, 4, 8, 16]
+
+def build_workload(repeat):
+    items = []
+    for sentence in sentences:
+        parsed = parse_math_sentence(normalize_sentence(sentence))
+        built = build_sympy_equation(parsed)
+        if built.get('eq') is not None:
+            items.append((built['eq'], parsed.get('op')))
+    # CPU-heavy identities, representative of symbolic candidates with free variables
+    x, y = sp.symbols('x y')
+    heavy = [sp.Eq(sp.sin(x)**2 + sp.cos(x)**2, 1, evaluate=False),
+             sp.Eq(sp.expand((x + y)**6), (x + y)**6, evaluate=False),
+             sp.Eq(sp.sin(2*x), 2*sp.sin(x)*sp.cos(x), evaluate=False),
+             sp.Eq((x**3 - y**3) / (x - y), x**2 + x*y + y**2, evaluate=False)]
+    items += [(eq, 'eq') for eq in heavy]
+    return items * repeat
+
+def run(repeat):
+    items = build_workload(repeat)
+    print(f"{len(items)} candidates per run")
+    print(f"{'workers':>8} | {'seconds':>8} | {'speedup':>8}")
+    baseline = None
+    for workers in WORKER_COUNTS:
+        with VerificationExecutor(workers=workers, timeout=60, max_tasks_per_worker=10**6) as executor:
+            # Warm-up: start all workers so start-up cost is not measured
+            executor.verify_many(items[:workers])
+            t0 = perf_counter()
+            executor.verify_many(items)
+            elapsed = perf_counter() - t0
+        baseline = baseline or elapsed
+        print(f"{workers:>8} | {elapsed:>8.3f} | {baseline / elapsed:>7.2f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=4, help="how many times the workload is repeated")
+    run(parser.parse_args().repeat)
@@ -0,0 +1,39 @@
+# benchmarks/bench_prime_counting.py
+"""
+Benchmark of prime counting and nth prime past the prime table (utils/prime_service.py) against sympy: π(x) by
+Lucy's method (lucy_primepi) against sp.primepi, and the nth prime by inverting π (nth_prime) against sp.prime,
+for arguments growing by powers of ten. This is what where_is_prime / prime_order answer with once n is beyond the
+table. Every answer is compared with sympy's; sympy is skipped above --sympy-max (it gets slow there).
+Run from the repository root:  python -m benchmarks.bench_prime_counting [--max-exponent N] [--sympy-max N]
+"""
+
+import argparse
+from time import perf_counter
+import sympy as sp
+from utils.prime_service import lucy_primepi, nth_prime
+
+def timed(fn, arg):
+    t0 = perf_counter()
+    result = fn(arg)
+    return result, perf_counter() - t0
+
+def run(max_exponent, sympy_max):
+    cases = [("primepi", lucy_primepi, sp.primepi), ("prime", nth_prime, sp.prime)]
+    print(f"{'function':>8} | {'argument':>8} | {'result':>14} | {'fast ms':>9} | {'sympy ms':>9} | {'speedup':>7} | mismatches")
+    for name, fast, reference in cases:
+        for exponent in range(5, max_exponent + 1):
+            arg = 10**exponent
+            got, t_fast = timed(fast, arg)
+            if arg > sympy_max:
+                print(f"{name:>8} | {f'1e{exponent}':>8} | {got:>14} | {1000 * t_fast:>9.1f} | {'-':>9} | {'-':>7} | -")
+                continue
+            expected, t_ref = timed(reference, arg)
+            print(f"{name:>8} | {f'1e{exponent}':>8} | {got:>14} | {1000 * t_fast:>9.1f} | {1000 * t_ref:>9.1f} | "
+                  f"{t_ref / max(t_fast, 1e-9):>6.1f}x | {int(got != expected)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-exponent", type=int, default=10, help="largest argument, as a power of ten")
+    parser.add_argument("--sympy-max", type=int, default=10**9, help="largest argument sympy is timed on")
+    args = parser.parse_args()
+    run(args.max_exponent, args.sympy_max)
@@ -0,0 +1,53 @@
+# benchmarks/bench_prime_service.py
+"""
+Benchmark of the prime number service (utils/prime_service.py) against sympy: isprime, nextprime, nth prime and π(x)
+over random arguments below the table bound, plus the cost of building the table (segmented sieve) and of mapping
+a saved one, as a verification worker does. Every answer is compared with sympy's.
+Run from the repository root:  python -m benchmarks.bench_prime_service [--calls N] [--limit N] [--seed N]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+from time import perf_counter
+import sympy as sp
+from utils.prime_service import PrimeTable
+
+def timed(fn, args):
+    t0 = perf_counter()
+    results = [fn(a) for a in args]
+    return results, perf_counter() - t0
+
+def run(calls, limit, seed):
+    rng = random.Random(seed)
+    path = os.path.join(tempfile.mkdtemp(), "prime_table.u32")
+    t0 = perf_counter()
+    table = PrimeTable(path=path, max_limit=limit)
+    table.ensure(limit)
+    t_build = perf_counter() - t0
+    t0 = perf_counter()
+    mapped = PrimeTable(path=path, max_limit=limit)
+    t_map = perf_counter() - t0
+    print(f"table to {table.limit}: {len(table.primes)} primes, sieved in {1000 * t_build:.1f} ms, mapped in {1000 * t_map:.2f} ms"
+          f" ({os.path.getsize(path) / 2**20:.1f} MiB file)")
+
+    values = [rng.randint(0, limit - 1000) for _ in range(calls)]
+    orders = [rng.randint(1, len(table.primes)) for _ in range(calls)]
+    cases = [("isprime", values, mapped.isprime, sp.isprime), ("nextprime", values, mapped.nextprime, sp.nextprime),
+             ("prime", orders, mapped.prime, sp.prime), ("primepi", values, mapped.primepi, sp.primepi)]
+    print(f"{'function':>9} | {'calls':>6} | {'table us/call':>13} | {'sympy us/call':>13} | {'speedup':>7} | mismatches")
+    for name, args, fast, reference in cases:
+        got, t_fast = timed(fast, args)
+        expected, t_ref = timed(reference, args)
+        mismatches = sum(1 for a, b in zip(got, expected) if a != b)
+        print(f"{name:>9} | {len(args):>6} | {1e6 * t_fast / len(args):>13.2f} | {1e6 * t_ref / len(args):>13.2f} | "
+              f"{t_ref / max(t_fast, 1e-9):>6.1f}x | {mismatches}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000, help="random arguments per function")
+    parser.add_argument("--limit", type=int, default=10**7, help="bound of the prime table")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the arguments")
+    args = parser.parse_args()
+    run(args.calls, args.limit, args.seed)
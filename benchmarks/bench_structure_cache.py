@@ -0,0 +1,79 @@
+# benchmarks/bench_structure_cache.py
+"""
+Benchmark of the structural analysis cache (reasoning/structure_cache.py): the configured sentences are rewritten
+with other numbers (same wording, so the same graph shape with different node values), and the cycle, path,
+undirected structure (cliques, stars, components, bipartite sides) and motif analyses run on every graph directly
+and through the cache.
+Both must find the same structures (compared per analysis as multisets of node sets).
+Run from the repository root:  python -m benchmarks.bench_structure_cache [--variants N] [--seed N]
+"""
+
+import argparse
+import random
+import re
+from collections import Counter
+from time import perf_counter
+import networkx as nx
+from config.settings import sentences
+from utils.text_helpers import normalize_sentence
+from models.semantic_parser import parse_math_sentence
+from models.graph_reasoner import equation_to_graph
+from reasoning.graph_candidate_handlers import cycle_analysis, path_analysis, undirected_structure_analysis, motif_analysis
+from reasoning.structure_cache import cached_analysis, structure_cache_info, STRUCTURE_CACHE, STRUCTURE_STATS
+
+ANALYSES = {"cycles": cycle_analysis, "paths": path_analysis, "undirected_structure": undirected_structure_analysis,
+            "motifs": motif_analysis}
+
+def build_graphs(variants, seed):
+    rng = random.Random(seed)
+    graphs = []
+    for sentence in sentences:
+        for i in range(variants):
+            text = sentence if i == 0 else re.sub(r"\d+", lambda _: str(rng.randint(2, 500)), sentence)
+            try:
+                graph = equation_to_graph(parse_math_sentence(normalize_sentence(text)))
+            except Exception:
+                continue
+            if isinstance(graph, nx.DiGraph):
+                graphs.append(graph)
+    return graphs
+
+def run_all(graphs, analyze):
+    out = []
+    for graph in graphs:
+        found = {}
+        for name, analysis in ANALYSES.items():
+            try:
+                found[name] = analyze(graph, name, analysis)
+            except Exception as e:
+                found[name] = type(e).__name__
+        out.append(found)
+    return out
+
+def structures(items):
+    if isinstance(items, str):
+        return items
+    return Counter((tag, frozenset(str(node) for node in nodes)) for tag, nodes in items)
+
+def run(variants, seed):
+    graphs = build_graphs(variants, seed)
+    t0 = perf_counter()
+    direct = run_all(graphs, lambda graph, name, analysis: analysis(graph))
+    t_direct = perf_counter() - t0
+    STRUCTURE_CACHE.clear()
+    STRUCTURE_STATS.update({key: 0 for key in STRUCTURE_STATS})
+    t0 = perf_counter()
+    cached = run_all(graphs, cached_analysis)
+    t_cached = perf_counter() - t0
+    mismatches = sum(1 for d, c in zip(direct, cached) for name in ANALYSES if structures(d[name]) != structures(c[name]))
+    info = structure_cache_info()
+    print(f"{'graphs':>6} | {'shapes':>6} | {'hit rate':>8} | {'ordered':>7} | {'direct ms':>9} | {'cached ms':>9} | {'speedup':>7} | mismatches")
+    print(f"{len(graphs):>6} | {info['shapes']:>6} | {info['hits'] / max(info['hits'] + info['misses'], 1):>8.1%} | {info['ordered_hits']:>7} | "
+          f"{1000 * t_direct:>9.2f} | {1000 * t_cached:>9.2f} | {t_direct / max(t_cached, 1e-9):>6.1f}x | {mismatches}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--variants", type=int, default=10, help="versions of each sentence (the first keeps its numbers)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the replacement numbers")
+    args = parser.parse_args()
+    run(args.variants, args.seed)
@@ -3,20 +3,63 @@ import os
 from pathlib import Path
 
 cache_dir = Path.home()
+PACKAGE_DIR = Path(__file__).resolve().parent.parent # repository root: files shared across runs are kept under it, not under the working directory
 embedding_cache_file = "embedding_cache.pkl" # path for output cache
 LOGFILE = "loggers/logs/unknown_parses.log" # path for output log
 
 CANDIDATE_VERIFICATION_THRESHOLD = 0.85 # threshold for which candidates to keep
+CANDIDATE_QUEUE_SIZE = 64 # max candidates buffered between generation, enhancement and verification (streaming pipeline)
 PROVENANCE_FILE = "loggers/provenance.log" # provenance
+CANDIDATE_FILTER_FILE = str(PACKAGE_DIR / "loggers" / "logs" / "candidate_filter.pkl") # Bloom filter of candidates processed in earlier runs (utils/cache_helpers.py)
+CANDIDATE_FILTER_CAPACITY = 10**6 # expected number of distinct candidates in the filter
+CANDIDATE_FILTER_FP_RATE = 0.001 # target false-positive rate (a false positive skips a new candidate)
+
+# symbolic verification executor (verification/verification_executor.py)
+VERIFICATION_WORKERS = max(1, (os.cpu_count() or 2) // 2) # number of verification worker processes
+VERIFICATION_TIMEOUT = 10.0 # per-candidate time budget (in seconds) before a 'timeout' verdict
+VERIFICATION_MAX_TASKS_PER_WORKER = 200 # recycle a worker process after this many candidates
+VERIFICATION_START_METHOD = None # multiprocessing start method for the workers (None: 'forkserver' where available, else 'spawn')
+
+# fact base of verified formulas (verification/fact_base.py)
+FACT_KEY_MAX_OPS = 60 # formulas with a larger side bypass the fact base: its keys are computed in the parent process, without deadline
+FACT_KEY_MAX_DEGREE = 64 # ... as do formulas with an integer power above this
+
+# prime number service (utils/prime_service.py)
+PRIME_TABLE_FILE = os.environ.get("PRIME_TABLE_FILE", str(PACKAGE_DIR / "loggers" / "logs" / "prime_table.u32")) # memory-mapped table of primes, shared by processes (verification workers)
+PRIME_TABLE_MIN_LIMIT = 10**6 # bound of the first sieve
+PRIME_TABLE_MAX_LIMIT = 10**8 # the table is never extended past this bound (prime/primepi are computed past it, isprime/nextprime go to sympy)
+PRIME_SEGMENT_SIZE = 2**20 # numbers sieved per segment when the table is extended
+
+# prime constellation tables (utils/prime_constellations.py)
+CONSTELLATION_MIN_LIMIT = 10**4 # bound of the first tables (Reasoner extends them to its upper_bound; inputs past it, up to PRIME_TABLE_MAX_LIMIT)
+
+SIMPLIFY_MEMO_SIZE = 4096 # max entries in each process's simplify/expand/factor memo (utils/sympy_helpers.py; verification workers keep their own)
+
+# rewrite engine for algebraic candidates (reasoning/rewrite_engine.py)
+REWRITE_MAX_ITERATIONS = 4 # saturation rounds before giving up
+REWRITE_MAX_NODES = 300 # e-node budget of one saturation
+REWRITE_MAX_CANDIDATES = 3 # rewrites extracted per group (rearrange, factor, expand, modular)
+REWRITE_SYMPY_MAX_OPS = 40 # factor/expand rules skip e-classes whose term has more operations (sp.count_ops)
+REWRITE_SYMPY_MAX_DEGREE = 12 # ... or an integer power above this
+
+# isolating solver (reasoning/isolating_solver.py)
+ISOLATE_SHAPE_CACHE_SIZE = 1024 # solving plans kept, one per (equation shape, symbol) (least recently used dropped first)
+
+# graph topology candidates (reasoning/graph_candidate_handlers.py)
+GRAPH_CYCLE_MAX_LENGTH = 4 # longest cycle enumerated; longer cycles are never visited
+
+# structural analysis cache (reasoning/structure_cache.py)
+STRUCTURE_CACHE_SIZE = 4096 # graph shapes kept (oldest dropped first)
+STRUCTURE_WL_ITERATIONS = 3 # Weisfeiler-Lehman refinement rounds of the shape hash
 
 # pre-trained models
 OPENAI_MODEL = os.environ.get("OPENAI_MATH_MODEL", "gpt-4.1")
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", None)
 DEFAULT_TRANSFORMER_MODEL = 'tbs17/MathBERT'
 
-# list of available candidate graph generators
-candidate_graphs = ['direct_sympy', 'commutativity_or_rearrangement', 'factoring_lhs', 'expand_lhs', 'odd_prime_mod_2', 'fermat_little_theorem', 
-                        'graph_star_discovery', 'graph_bipartite_discovery', 'graph_motif_subgraph_discovery', 'graph_clique_discovery', 'graph_path_discovery', 'graph_cycle_discovery']
+# list of enabled candidate generators (generation methods or plugin names, see reasoning/candidate_generator.py); remove entries to switch plugins off
+candidate_graphs = ['direct_sympy', 'commutativity_or_rearrangement', 'isolating_solve', 'factoring_lhs', 'expand_lhs', 'odd_prime_mod_2', 'fermat_little_theorem', 'prime_patterns', 'cross_sentence_substitution',
+                        'graph_star_discovery', 'graph_bipartite_discovery', 'graph_motif_subgraph_discovery', 'graph_motif_spanning_discovery', 'graph_clique_discovery', 'graph_path_discovery', 'graph_cycle_discovery']
 
 # dict of all available operations and their respective action
 action_ops = {'sum_of_two_primes': 'sum_of_two_primes_action', 'twin_primes': 'twin_primes_action',
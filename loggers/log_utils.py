@@ -5,6 +5,7 @@ from datetime import datetime
 from config.settings import LOGFILE
 from pprint import pprint
 from reasoning.tree_search_core import CallAction
+from reasoning.op_registry import OP_SPECS, resolve_action
 from tabulate import tabulate
 try:
     from colorama import init, Fore, Style
@@ -33,11 +34,15 @@ def logstep(desc, payload, *, color=None, log_step=False):
     print()
 
 def find_action(action_name):
+    action = resolve_action(action_name) # looked up once here, not on every call
     def wrapper(graph, state):
-        return CallAction(graph, state, display=True).__getattribute__(action_name)()
+        return action(CallAction(graph, state, display=True))
     return wrapper
 
-def build_action_registry(actions):
+def build_action_registry(actions=None):
+    """ op -> action(graph, state) for the op -> CallAction method name mapping (default: the actions of OP_SPECS). """
+    if actions is None:
+        actions = {op: spec.action.__name__ for op, spec in OP_SPECS.items() if spec.action is not None}
     registry = {}
     for op, action_method in actions.items():
         registry[op] = find_action(action_method)
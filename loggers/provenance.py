@@ -3,6 +3,7 @@
 import os
 import json
 from config.settings import PROVENANCE_FILE
+from utils.candidate_helpers import candidate_fingerprint
 
 def log_generation(candidates):
     with open(PROVENANCE_FILE, "a") as f:
@@ -12,5 +13,6 @@ def log_generation(candidates):
                 "note": cand.get('note', ''),
                 "orig_sentence": cand.get('orig_sentence'),
                 "step": cand.get('source_step'),
+                "key": candidate_fingerprint(cand), # canonical candidate key, to rebuild the candidate filter
                 # Add any more fields you want...
             }) + "\n")
\ No newline at end of file
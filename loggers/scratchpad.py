@@ -1,19 +1,132 @@
 # loggers/scratchpad.py
 
-from collections import deque
+from collections import deque, Counter
+import networkx as nx
+
+def record_symbols(record):
+    """ Free symbols of a record's SymPy equation (empty if it has none). """
+    eq = record.get('sympy_eq', {}).get('eq') if isinstance(record, dict) and isinstance(record.get('sympy_eq'), dict) else None
+    if isinstance(eq, tuple):
+        eq = eq[0] if eq else None
+    return getattr(eq, 'free_symbols', set())
+
+def record_graph(record):
+    """ The record's equation graph, or None if it has none. """
+    graph = record.get('graph') if isinstance(record, dict) else None
+    return graph if isinstance(graph, (nx.Graph, nx.DiGraph)) else None
 
 class Scratchpad:
     def __init__(self, capacity=100):
         self.memory = deque(maxlen=capacity)
+        self.total_added = 0 # number of records ever added; records get absolute indices 0, 1, 2, ...
+        self.symbol_index = {} # symbol -> {absolute record index: record}, over the records still held
+        # Knowledge graph of the records still held: what nx.compose of their graphs (oldest first) would give,
+        # maintained as records come and go
+        self.global_graph = nx.DiGraph()
+        # node / (u, v) / None (the graph attributes) -> [number of held records having it, Counter of their attribute keys]
+        self._node_refs, self._edge_refs, self._graph_attr_refs = {}, {}, {}
 
     def add(self, item):
+        if self.memory.maxlen is not None and len(self.memory) == self.memory.maxlen:
+            # The oldest record is about to be evicted
+            self._unindex(self.start, self.memory[0])
         self.memory.append(item)
+        for sym in record_symbols(item):
+            self.symbol_index.setdefault(sym, {})[self.total_added] = item
+        graph = record_graph(item)
+        if graph is not None:
+            self._compose(graph)
+        self.total_added += 1
+
+    def _unindex(self, index, record):
+        for sym in record_symbols(record):
+            records = self.symbol_index.get(sym)
+            if records is not None:
+                records.pop(index, None)
+                if not records:
+                    del self.symbol_index[sym]
+        graph = record_graph(record)
+        if graph is not None:
+            self._decompose(graph)
+
+    def _compose(self, graph):
+        # The newest record's attributes win, as in nx.compose
+        self._ref(self._graph_attr_refs, None, graph.graph)
+        self.global_graph.graph.update(graph.graph)
+        for node, attrs in graph.nodes(data=True):
+            self._ref(self._node_refs, node, attrs)
+            if node in self.global_graph:
+                self.global_graph.nodes[node].update(attrs)
+            else:
+                self.global_graph.add_node(node, **attrs)
+        for u, v, attrs in graph.edges(data=True):
+            self._ref(self._edge_refs, (u, v), attrs)
+            if self.global_graph.has_edge(u, v):
+                self.global_graph.edges[u, v].update(attrs)
+            else:
+                self.global_graph.add_edge(u, v, **attrs)
+
+    @staticmethod
+    def _ref(refs, key, attrs):
+        ref = refs.setdefault(key, [0, Counter()])
+        ref[0] += 1
+        ref[1].update(attrs.keys())
+
+    def _decompose(self, graph):
+        """
+        Removes the graph of the oldest held record: an element no other record has goes, and so do attribute keys only
+        it set. Any other value came from a later record, which would have overwritten it anyway.
+        """
+        for u, v, attrs in graph.edges(data=True):
+            if self._unref(self._edge_refs, (u, v), attrs, self.global_graph.edges[u, v]):
+                self.global_graph.remove_edge(u, v)
+        for node, attrs in graph.nodes(data=True):
+            if self._unref(self._node_refs, node, attrs, self.global_graph.nodes[node]):
+                self.global_graph.remove_node(node)
+        if self._unref(self._graph_attr_refs, None, graph.graph, self.global_graph.graph):
+            self.global_graph.graph.clear()
+
+    @staticmethod
+    def _unref(refs, key, attrs, merged):
+        """ Drops one record's reference to an element; True if no held record has it any more. """
+        ref = refs[key]
+        ref[0] -= 1
+        if ref[0] == 0:
+            del refs[key]
+            return True
+        ref[1].subtract(attrs.keys())
+        for attr in attrs:
+            if ref[1][attr] <= 0:
+                del ref[1][attr]
+                merged.pop(attr, None)
+        return False
+
+    def records_with(self, symbol):
+        """ (absolute index, record) pairs of the held records whose equation contains symbol, oldest first. """
+        return list(self.symbol_index.get(symbol, {}).items())
 
     def get_all(self):
         return list(self.memory)
-    
+
     def latest(self, n=1):
         return list(self.memory)[-n:] if n <= len(self.memory) else list(self.memory)
-    
+
+    @property
+    def start(self):
+        """ Absolute index of the oldest record still held (earlier ones were evicted or cleared). """
+        return self.total_added - len(self.memory)
+
+    def since(self, cursor):
+        """
+        Records added after the first `cursor` records (oldest first), skipping those already evicted,
+        and the new cursor to pass on the next call.
+        """
+        new = min(self.total_added - cursor, len(self.memory))
+        return (list(self.memory)[-new:] if new > 0 else []), self.total_added
+
     def clear(self):
-        self.memory.clear()
\ No newline at end of file
+        self.memory.clear()
+        self.symbol_index.clear()
+        self.global_graph = nx.DiGraph()
+        for refs in (self._node_refs, self._edge_refs, self._graph_attr_refs):
+            refs.clear()
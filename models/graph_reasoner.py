@@ -1,5 +1,6 @@
 # models/graph_reasoner.py
 
+from bisect import insort
 import networkx as nx
 import sympy as sp
 from utils.general_helpers import prime_flag_is_true, prime_flag_is_false, annotate_error
@@ -39,6 +40,8 @@ def equation_to_graph(parse_dict):
 
 
         g = nx.DiGraph()  # Directed graph
+        g.node_index = {section: {} for section in INDEX_SECTIONS} # kept by _add_node, see graph_index
+        g.node_positions = {}
         
         # Add nodes with type/role/meaning
         if isinstance(lhs, list):
@@ -313,18 +316,10 @@ def graph_to_parse_dict(graph):
                 op = d['operation']
                 break
 
-    # 2. Build role-maps and attribute-maps
-    role_map = {} # role: [node ids]
-
-    for n, attrs in graph.nodes(data=True):
-        role_val = attrs.get('role')
-        if role_val is not None:
-            if isinstance(role_val, list):
-                for role in role_val:
-                    role_map.setdefault(role, []).append(n) # set default to not overwrite n (instead append it)
-            else:
-                role_map.setdefault(role_val, []).append(n)
-
+    # 2. Role-maps and attribute-maps, from the graph's node index
+    index = graph_index(graph)
+    role_map = index['roles'] # role: [node ids]
+    attr_map = index['attrs'] # attribute: [node ids]
     
     # 3. Define mapping of graph roles → parse_dict slots
     slots = {
@@ -357,7 +352,15 @@ def graph_to_parse_dict(graph):
 
     # 4. Special fields from node or edge attributes
     # (e.g. prime_order, order/local for exclusion ops)
-    for n, attrs in graph.nodes(data=True):
+    # Prime/Property nodes: handle 'is_prime', 'is_not_prime', etc.
+    for n in attr_map.get('is_prime', ()):
+        if graph.nodes[n]['is_prime'] is True and not 'prime' in role_map:
+            graph_parse['is_prime'] = True
+            trace.append(f"Found is_prime True at node {n}")
+
+    special = {n for key in ('prime_order', 'order', 'local') for n in attr_map.get(key, ())}
+    for n in (n for n in graph if n in special):
+        attrs = graph.nodes[n]
         # For prime order (e.g.: prime_order(x))
         if 'prime_order' in attrs:
             graph_parse['order'] = [attrs['prime_order']]
@@ -369,14 +372,6 @@ def graph_to_parse_dict(graph):
         if 'local' in attrs:
             graph_parse.setdefault('local', []).append(attrs['local'])
             trace.append(f"local from node {n}: {attrs['local']}")
-        
-
-
-        # Prime/Property nodes: handle 'is_prime', 'is_not_prime', etc.
-        for n, attrs in graph.nodes(data=True):
-            if attrs.get('is_prime', None) is True and not 'prime' in role_map:
-                graph_parse['is_prime'] = True
-                trace.append(f"Found is_prime True at node {n}")
 
     # 5. Sometimes, these are on edges (especially for root/power ops)
     for u, v, d in graph.edges(data=True):
@@ -396,10 +391,9 @@ def graph_to_parse_dict(graph):
 
 
     # 6. Concept nodes (optional for downstream use)
-    for n, attrs in graph.nodes(data=True):
-        if attrs.get('type') == 'concept':
-            graph_parse.setdefault('concept', []).append(n)
-            trace.append(f"Concept node: {n}")
+    for n in index['types'].get('concept', ()):
+        graph_parse.setdefault('concept', []).append(n)
+        trace.append(f"Concept node: {n}")
 
 
     # 7. Assign values to the parse dict, compressing if possible.
@@ -483,6 +477,52 @@ def _add_node(g, value, **attrs):
         g.nodes[value]['value'] = value
     else:
         g.add_node(value, type=node_type, value=value, **attrs)
+        if hasattr(g, 'node_positions'):
+            g.node_positions[value] = len(g) - 1
+    _index_node(g, value)
+
+# ======== node index ========
+# role -> nodes, type -> nodes and attribute key -> nodes, each list in graph order: equation_to_graph builds it
+# through _add_node and the graph carries it, so lookups by role or attribute need no scan of the nodes
+INDEX_SECTIONS = ('roles', 'types', 'attrs')
+
+def _index_entries(attrs):
+    """ (section, key) entries of a node with these attributes (every role of a merged role list). """
+    roles = attrs.get('role')
+    for role in roles if isinstance(roles, list) else [roles]:
+        if role is not None:
+            yield 'roles', role
+    yield 'types', attrs.get('type')
+    for key in attrs:
+        yield 'attrs', key
+
+def _index_node(g, node):
+    index = getattr(g, 'node_index', None)
+    if index is None:
+        return
+    positions = g.node_positions
+    if node not in positions: # first indexed after add_edge created it
+        positions[node] = list(g).index(node)
+    for section, key in _index_entries(g.nodes[node]):
+        nodes = index[section].setdefault(key, [])
+        if node not in nodes:
+            insort(nodes, node, key=positions.__getitem__)
+
+def build_graph_index(graph):
+    """ Node index of any graph, by one scan of its nodes. """
+    index = {section: {} for section in INDEX_SECTIONS}
+    for n, attrs in graph.nodes(data=True):
+        for section, key in _index_entries(attrs):
+            index[section].setdefault(key, []).append(n)
+    return index
+
+def graph_index(graph):
+    """
+    {'roles': {role: nodes}, 'types': {type: nodes}, 'attrs': {attribute key: nodes}} of a graph, nodes in graph
+    order. Graphs from equation_to_graph carry theirs; other graphs (copies, hand-built ones) are scanned.
+    """
+    index = getattr(graph, 'node_index', None)
+    return index if index is not None else build_graph_index(graph)
 
 def _get_nth(val, n=0):
     """Returns nth element if list/tuple, else itself if scalar and n==0, else None, always canonicalized."""
@@ -1,17 +1,24 @@
 # reasoning/candidate_generator.py
 
 import sympy as sp
-from .graph_candidate_handlers import get_graph_candidates, clique_candidates, star_candidates, bipartite_candidates, motif_subgraph_candidates
+from time import perf_counter
+from collections import deque
+from config.settings import candidate_graphs
+from .isolating_solver import isolate
+from .rewrite_engine import expression_rewrites
+from .graph_candidate_handlers import get_graph_candidates, clique_candidates, star_candidates, bipartite_candidates, motif_subgraph_candidates, motif_candidate, spanning_motif_candidate
+from .motif_miner import MotifMiner
 from pre_trained.llm_candidate_generator import generate_auto_candidates
 from utils.general_helpers import annotate_error
-from utils.candidate_helpers import PRIME_PATTERN_HANDLERS, safe_unwrap_eq_tuple, make_candidate
+from utils.candidate_helpers import PRIME_PATTERN_HANDLERS, safe_unwrap_eq_tuple, make_candidate, candidate_key, is_known_candidate
 from utils.sympy_helpers import is_trivial_equation
 
 
 def commutative_candidates(eq, eq_type, op_context, scratchpad):
     """
-    Generate candidates by swapping the left and right sides of the equation.
-    This is only valid for commutative operations like addition and multiplication.
+    Generate candidates by rearranging the left side of the equation with commutativity and associativity
+    (rewrite engine, 'rearrange' group). This is only valid for commutative operations like addition and multiplication.
+    A binary sum or product has no rearrangement that differs from it by srepr, so its operands are swapped instead.
     example: x + y = 10 to y + x = 10
     """
     # eq_tuple: (sympy_eq, type), as returend by build_sympy_equation
@@ -20,12 +27,11 @@ def commutative_candidates(eq, eq_type, op_context, scratchpad):
     if eq_type != 'equation' or not isinstance(eq, sp.Equality):
         return candidates
     lhs = eq.lhs
-    rhs = eq.rhs
     try:
-        # Commutative for addition and multiplication
-        if isinstance(lhs, sp.Add) or isinstance(lhs, sp.Mul):
-            rev_lhs = lhs.func(*reversed(lhs.args), evaluate=False)
-            candidates.append(sp.Eq(rev_lhs, rhs, evaluate=False))
+        if isinstance(lhs, (sp.Add, sp.Mul)) and len(lhs.args) == 2:
+            candidates.append(sp.Eq(lhs.func(*reversed(lhs.args), evaluate=False), eq.rhs, evaluate=False))
+        for rearranged in expression_rewrites(lhs)['rearrange']:
+            candidates.append(sp.Eq(rearranged, eq.rhs, evaluate=False))
     except Exception as e:
         return [annotate_error("commutative_candidates", e, str(candidates))]
     return candidates
@@ -36,11 +42,10 @@ def isolating_candidates(eq, eq_type, op_context, scratchpad):
         return candidates
     for sym in eq.free_symbols:
         try:
-            solved = sp.solve(eq, sym)
-            if solved:
-                # handle both cases: solution is a list or not
-                candidate = sp.Eq(sym, solved[0]) if isinstance(solved, list) else sp.Eq(sym, solved)
-                candidates.append(candidate)
+            # linear/monomial fast path, sp.solve fallback
+            solved = isolate(eq, sym)
+            if solved is not None:
+                candidates.append(sp.Eq(sym, solved))
         except Exception as e:
             return [annotate_error("isolating_candidates", e, str(candidates))]
     return candidates
@@ -63,21 +68,22 @@ def prime_candidates(record, op_context, scratchpad):
             'orig_sentence': record.get('sentence')}]
 
 def algebraic_candidates(eq, eq_type, record, op_context, scratchpad, correct):
+    """
+    Factored and expanded forms of the left side, extracted from the same rewrite engine saturation as the
+    commutative candidates (one factor/expand per subexpression, shared by both generators).
+    """
     candidates = []
-    if eq_type == 'equation' and isinstance(eq, sp.Equality):
-        for sym in eq.free_symbols:
-            if isinstance(eq.lhs, sp.Basic):
-                try:
-                    # Factoring possibilities
-                    factored = sp.factor(sp.simplify(eq.lhs))
-                    if factored != sp.simplify(eq.lhs):
-                        candidates.append(make_candidate(record, sp.Eq(factored, eq.rhs, method='factoring_lhs', evaluate=False, correct=correct)))
-                    # Expansion possibilities
-                    expanded = sp.expand(sp.simplify(eq.lhs))
-                    if expanded != eq.lhs:
-                        candidates.append(make_candidate(record, sp.Eq(expanded, eq.rhs, method='expand_lhs', evaluate=False, correct=correct)))
-                except Exception as e:
-                    return [annotate_error("algebraic_candidates", e, str(candidates))]
+    if eq_type == 'equation' and isinstance(eq, sp.Equality) and eq.free_symbols:
+        try:
+            rewrites = expression_rewrites(eq.lhs)
+            # Factoring possibilities
+            for factored in rewrites['factor']:
+                candidates.append(make_candidate(record, sp.Eq(factored, eq.rhs, evaluate=False), 'factoring_lhs', op_context, correct=correct))
+            # Expansion possibilities
+            for expanded in rewrites['expand']:
+                candidates.append(make_candidate(record, sp.Eq(expanded, eq.rhs, evaluate=False), 'expand_lhs', op_context, correct=correct))
+        except Exception as e:
+            return [annotate_error("algebraic_candidates", e, str(candidates))]
     
     return candidates
 
@@ -88,6 +94,10 @@ def modulo_candidates(eq, eq_type, record, op_context, scratchpad, correct):
     """
     candidates = []
 
+    if eq_type == 'equation' and isinstance(eq, sp.Equality):
+        # (a + b) mod m rewritten to ((a mod m) + (b mod m)) mod m by the rewrite engine
+        for reduced in expression_rewrites(eq.lhs)['modular']:
+            candidates.append(make_candidate(record, sp.Eq(reduced, eq.rhs, evaluate=False), 'modular_rewrite', op_context, correct=correct))
     # if the equation involves a single variable and is about primes:
     if eq_type == 'equation' and isinstance(eq, sp.Equality):
         for sym in eq.free_symbols:
@@ -103,6 +113,70 @@ def modulo_candidates(eq, eq_type, record, op_context, scratchpad, correct):
 
     return candidates
 
+def symbol_definitions(eq):
+    """
+    Values the equation assigns to its symbols, {symbol: value}: sym = value (or value = sym) with sym not in value,
+    and the isolated value of the symbol of a single-symbol linear equation (x + 6 = 10 gives x: 4); equations with
+    several roots (x**2 = 81) define nothing.
+    """
+    if not isinstance(eq, sp.Equality):
+        return {}
+    definitions = {}
+    for sym, value in ((eq.lhs, eq.rhs), (eq.rhs, eq.lhs)):
+        if isinstance(sym, sp.Symbol) and sym not in value.free_symbols:
+            definitions.setdefault(sym, value)
+    symbols = eq.free_symbols
+    if not definitions and len(symbols) == 1:
+        sym = next(iter(symbols))
+        expr = (eq.lhs - eq.rhs).doit()
+        if expr.is_polynomial(sym) and sp.degree(expr, sym) == 1:
+            value = isolate(eq, sym)
+            if value is not None:
+                definitions[sym] = value
+    return definitions
+
+def _substitute(eq, sym, value):
+    with sp.evaluate(False):
+        return sp.Eq(eq.lhs.xreplace({sym: value}), eq.rhs.xreplace({sym: value}))
+
+def substitution_candidates(eq, eq_type, record, index, op_context, scratchpad, correct):
+    """
+    Cross-sentence substitution: combines the record with the earlier scratchpad records that share a symbol with it,
+    found through the scratchpad's symbol index (no pairwise scan). A value one of them assigns to the shared symbol
+    is substituted into the other. example: x = 5 (step 1) and x + y = 12 (step 2) give 5 + y = 12.
+    Each candidate keeps the absolute index of the other record ('related_record').
+    """
+    candidates = []
+    if eq_type != 'equation' or not isinstance(eq, sp.Equality) or scratchpad is None or index is None or not hasattr(scratchpad, 'records_with'):
+        return candidates
+    try:
+        definitions = symbol_definitions(eq)
+        for sym in sorted(eq.free_symbols, key=str):
+            for other_index, other in scratchpad.records_with(sym):
+                if other_index >= index:
+                    continue
+                other_eq, other_type = safe_unwrap_eq_tuple(other['sympy_eq']['eq'])
+                if other_type != 'equation' or not isinstance(other_eq, sp.Equality):
+                    continue
+                # A value from the earlier record substituted into this one, and this record's value into the earlier one
+                pairs = []
+                other_definitions = symbol_definitions(other_eq)
+                if sym in other_definitions and other_definitions[sym] != sym:
+                    pairs.append((eq, other_definitions[sym], other))
+                if sym in definitions and other_eq != eq:
+                    pairs.append((other_eq, definitions[sym], other))
+                for target, value, source in pairs:
+                    derived_eq = _substitute(target, sym, value)
+                    if derived_eq == target or derived_eq.lhs == derived_eq.rhs:
+                        continue
+                    cand = make_candidate(record, derived_eq, 'cross_sentence_substitution', op_context,
+                                          note=f"{sym} = {value} substituted across steps {source.get('step')} and {record.get('step')}", correct=correct)
+                    cand['related_record'] = other_index
+                    candidates.append(cand)
+    except Exception as e:
+        return [annotate_error("substitution_candidates", e, str(candidates))]
+    return candidates
+
 def advanced_candidates(eq, eq_type, record, op_context):
     """
     Generating more complex transformations, e.g. function substitutions,
@@ -115,24 +189,11 @@ def unique_candidates(candidates):
     seen = set()
     out = []
     for cand in candidates:
+        key = candidate_key(cand)
         # If candidate has an error, always keep it
-        if "error_stage" in cand:
+        if key is None:
             out.append(cand)
             continue
-        # Robust key: handle sympy or string equations, fallback to string
-        eq_key = cand.get('derived_eq')
-        method = cand.get('generation_method', '')
-        try:
-            if isinstance(eq_key, sp.Equality):
-                # Key is: method, frozenset of sides (so Eq(a,b) == Eq(b,a))
-                key = (method, frozenset([sp.srepr(eq_key.lhs), sp.srepr(eq_key.rhs)]))
-            elif isinstance(eq_key, sp.Basic):
-                key = (method, sp.srepr(eq_key))
-            else:
-                key = (method, str(eq_key))
-        except Exception:
-            key = (method, str(eq_key))
-
         if key not in seen:
             seen.add(key)
             out.append(cand)
@@ -155,62 +216,190 @@ def filter_candidates(candidates):
         filtered.append(cand)
     return filtered
 
-def generate_manual_candidates(scratchpad):
+# ======== candidate generator plugins ========
+# name -> {'func': plugin(record, ctx) -> list of candidate dicts, 'kind': 'standard' or 'graph', 'methods': generation methods it emits,
+#          'scope': 'record' (run per scratchpad record) or 'scratchpad' (run once over all held records: plugin(ctx), after the record plugins)}
+# Plugins run in registration order, which is also the order of their candidates in the output.
+CANDIDATE_PLUGINS = {}
+# name -> {'calls', 'seconds', 'candidates'}, accumulated over the process (see plugin_stats / reset_plugin_stats)
+PLUGIN_STATS = {}
+
+def register_candidate_plugin(name, kind, methods=(), scope='record'):
+    def decorator(func):
+        CANDIDATE_PLUGINS[name] = {'func': func, 'kind': kind, 'methods': set(methods), 'scope': scope}
+        PLUGIN_STATS[name] = {'calls': 0, 'seconds': 0.0, 'candidates': 0}
+        return func
+    return decorator
+
+def enabled_plugins(enabled=None):
+    """
+    Names of the plugins to run, in registration order. enabled lists plugin names and/or generation methods
+    (default: config.settings.candidate_graphs); a plugin runs if its name or any method it emits is listed.
+    """
+    enabled = set(candidate_graphs if enabled is None else enabled)
+    return [name for name, plugin in CANDIDATE_PLUGINS.items() if name in enabled or plugin['methods'] & enabled]
+
+def plugin_stats():
+    """ Per-plugin cost accounting: calls, total seconds, candidates produced, and candidates per second. """
+    return {name: {**stats, 'seconds': round(stats['seconds'], 4), 'candidates_per_second': round(stats['candidates'] / stats['seconds'], 1) if stats['seconds'] else 0.0}
+            for name, stats in PLUGIN_STATS.items()}
+
+def reset_plugin_stats():
+    for stats in PLUGIN_STATS.values():
+        stats.update({'calls': 0, 'seconds': 0.0, 'candidates': 0})
+
+@register_candidate_plugin('direct', 'standard', methods=['direct_sympy'])
+def direct_plugin(record, ctx):
+    # add raw sympy_eq as a candidate
+    eq_tuple = ctx['eq_tuple']
+    return [make_candidate(record, eq_tuple[0] if isinstance(eq_tuple, tuple) else eq_tuple, 'direct_sympy', ctx['op'], note=ctx['primality_constraint'], correct=ctx['is_correct'])]
+
+@register_candidate_plugin('commutative', 'standard', methods=['commutativity_or_rearrangement'])
+def commutative_plugin(record, ctx):
+    return [make_candidate(record, candidate_eq, 'commutativity_or_rearrangement', ctx['op'], correct=ctx['is_correct'])
+            for candidate_eq in commutative_candidates(ctx['eq'], ctx['eq_type'], ctx['op'], ctx['scratchpad'])]
+
+@register_candidate_plugin('isolating', 'standard', methods=['isolating_solve'])
+def isolating_plugin(record, ctx):
+    return [make_candidate(record, candidate_eq, 'isolating_solve', ctx['op'], correct=ctx['is_correct'])
+            for candidate_eq in isolating_candidates(ctx['eq'], ctx['eq_type'], ctx['op'], ctx['scratchpad'])]
+
+@register_candidate_plugin('algebraic', 'standard', methods=['factoring_lhs', 'expand_lhs'])
+def algebraic_plugin(record, ctx):
+    return algebraic_candidates(ctx['eq'], ctx['eq_type'], record, ctx['op'], ctx['scratchpad'], correct=ctx['is_correct'])
+
+@register_candidate_plugin('modulo', 'standard', methods=['odd_prime_mod_2', 'fermat_little_theorem', 'modular_rewrite'])
+def modulo_plugin(record, ctx):
+    return modulo_candidates(ctx['eq'], ctx['eq_type'], record, ctx['op'], ctx['scratchpad'], correct=ctx['is_correct'])
+
+@register_candidate_plugin('prime_patterns', 'standard') # emits per-op methods, so it is enabled by name
+def prime_plugin(record, ctx):
+    op = ctx['op']
+    if not (op and op in PRIME_PATTERN_HANDLERS):
+        return []
+    return [make_candidate(record, candidate['derived_eq'], candidate['generation_method'], op, candidate.get('note', None), correct=ctx['is_correct'])
+            for candidate in prime_candidates(record, op, ctx['scratchpad'])]
+
+@register_candidate_plugin('substitution', 'standard', methods=['cross_sentence_substitution'])
+def substitution_plugin(record, ctx):
+    return substitution_candidates(ctx['eq'], ctx['eq_type'], record, ctx['index'], ctx['op'], ctx['scratchpad'], correct=ctx['is_correct'])
+
+@register_candidate_plugin('paths_cycles', 'graph', methods=['graph_path_discovery', 'graph_cycle_discovery'])
+def paths_cycles_plugin(record, ctx):
+    return get_graph_candidates(ctx['graph'], record, ctx['is_correct']) if ctx['graph'] is not None else []
+
+@register_candidate_plugin('clique', 'graph', methods=['graph_clique_discovery'])
+def clique_plugin(record, ctx):
+    return clique_candidates(ctx['graph'], record, ctx['is_correct']) if ctx['graph'] is not None else []
+
+@register_candidate_plugin('star', 'graph', methods=['graph_star_discovery'])
+def star_plugin(record, ctx):
+    return star_candidates(ctx['graph'], record, ctx['is_correct']) if ctx['graph'] is not None else []
+
+@register_candidate_plugin('bipartite', 'graph', methods=['graph_bipartite_discovery'])
+def bipartite_plugin(record, ctx):
+    return bipartite_candidates(ctx['graph'], record, ctx['is_correct']) if ctx['graph'] is not None else []
+
+@register_candidate_plugin('motif', 'graph', methods=['graph_motif_subgraph_discovery'])
+def motif_plugin(record, ctx):
+    miner = ctx['motifs']
+    if miner is not None and ctx['index'] in miner.records:
+        # Matched in the batch sweep over all held records
+        return [motif_candidate(record, motif_name, mapping, ctx['is_correct']) for motif_name, mapping in miner.record_matches(ctx['index'])]
+    return motif_subgraph_candidates(ctx['graph'], record, ctx['is_correct']) if ctx['graph'] is not None else []
+
+@register_candidate_plugin('motif_spanning', 'graph', methods=['graph_motif_spanning_discovery'], scope='scratchpad')
+def motif_spanning_plugin(ctx):
+    miner = ctx['motifs']
+    if miner is None:
+        return []
+    return [spanning_motif_candidate(miner.records[indices[-1]], motif_name, mapping, [miner.records[index].get('step') for index in indices])
+            for motif_name, mapping, indices in miner.spanning_matches()]
+
+MOTIF_PLUGINS = ('motif', 'motif_spanning') # plugins reading the batch motif miner
+
+def motif_miner(scratchpad, plugins):
+    """ MotifMiner over the held scratchpad records, if a plugin reading it is enabled (else None). """
+    if not any(name in MOTIF_PLUGINS for name in plugins):
+        return None
+    miner = MotifMiner()
+    miner.add(enumerate(scratchpad.get_all(), start=getattr(scratchpad, 'start', 0)))
+    return miner
+
+def _run_plugin(name, *args):
+    plugin = CANDIDATE_PLUGINS[name]
+    t0 = perf_counter()
+    produced = plugin['func'](*args)
+    stats = PLUGIN_STATS[name]
+    stats['calls'] += 1
+    stats['seconds'] += perf_counter() - t0
+    stats['candidates'] += len(produced)
+    return plugin['kind'], produced
+
+def iter_record_candidates(record, scratchpad=None, enabled=None, index=None, motifs=None):
+    """
+    Candidates of a single scratchpad record (before dedup), yielded as ('standard' | 'graph', candidates) per plugin,
+    as soon as each enabled plugin has run (enabled: list of plugin names, as returned by enabled_plugins; default:
+    from config.settings.candidate_graphs). index: absolute scratchpad index of the record (for cross-record plugins).
+    motifs: optional MotifMiner holding the record, whose matches are used instead of matching the record's graph.
+    """
+    # record contains 'step', 'sentence', 'normalized (sentence)', 'parsed: op, lhs, rhs', '{sympy_eq: eq, type, {meta:op, correct}}, 'graph'
+    # only work with those with valid sympy equations
+    eq_tuple = record['sympy_eq']['eq']
+    eq, eq_type = safe_unwrap_eq_tuple(eq_tuple)
+    correct_val = str(record['sympy_eq']['meta'].get('correct', ''))
+    ctx = {'eq_tuple': eq_tuple, 'eq': eq, 'eq_type': eq_type, 'op': record['parsed'].get('op'), 'scratchpad': scratchpad, 'index': index, 'motifs': motifs, 'graph': record.get('graph'),
+           'primality_constraint': record['sympy_eq']['meta'].get('primality_constraint'), 'is_correct': correct_val if correct_val else 'Concept'}
+
+    for name in (enabled_plugins() if enabled is None else enabled):
+        if CANDIDATE_PLUGINS[name]['scope'] == 'record':
+            yield _run_plugin(name, record, ctx)
+
+def iter_scratchpad_candidates(scratchpad, enabled=None, motifs=None):
+    """
+    Candidates of the scratchpad-scope plugins (built over all held records, e.g. motifs spanning several sentences),
+    yielded as ('standard' | 'graph', candidates) per plugin. motifs: MotifMiner over the held records.
+    """
+    ctx = {'scratchpad': scratchpad, 'motifs': motifs}
+    for name in (enabled_plugins() if enabled is None else enabled):
+        if CANDIDATE_PLUGINS[name]['scope'] == 'scratchpad':
+            yield _run_plugin(name, ctx)
+
+def record_candidates(record, scratchpad=None, enabled=None, index=None, motifs=None):
+    """
+    Standard and graph candidates generated from a single scratchpad record (before dedup) by the enabled plugins
+    (enabled: list of plugin names, as returned by enabled_plugins; default: from config.settings.candidate_graphs).
+    """
+    standard_candidates = []
+    graph_candidates = []
+    for kind, produced in iter_record_candidates(record, scratchpad, enabled, index, motifs):
+        (standard_candidates if kind == 'standard' else graph_candidates).extend(produced)
+    return standard_candidates, graph_candidates
+
+def generate_manual_candidates(scratchpad, enabled=None, known=None):
     """
     For each entry in scratchpad, generate commutative, rearranged, algebraic, modulo, or primality equations.
-    Also generates graph candidates such as clique, star, bipartite, and motif subgraphs.
+    Also generates graph candidates such as clique, star, bipartite, and motif subgraphs (matched in one sweep over all
+    records by the motif miner, which also finds motifs spanning several sentences).
+    Only the plugins enabled by config.settings.candidate_graphs (or the enabled list) run; candidates in known
+    (optional CandidateFilter of candidates processed in earlier runs) are skipped.
     Returns a list of candidate dicts (like step_dict, but 'generated').
     """
     # for each node/edge, try simple manipulations: swap, invert, substitute
     try:
         standard_candidates = []
         graph_candidates = []
+        plugins = enabled_plugins(enabled)
+        motifs = motif_miner(scratchpad, plugins)
+        for index, record in enumerate(scratchpad.get_all(), start=getattr(scratchpad, 'start', 0)):
+            standard, graph = record_candidates(record, scratchpad, plugins, index, motifs)
+            standard_candidates.extend(standard)
+            graph_candidates.extend(graph)
+        for kind, produced in iter_scratchpad_candidates(scratchpad, plugins, motifs):
+            (standard_candidates if kind == 'standard' else graph_candidates).extend(produced)
 
-        # record contains 'step', 'sentence', 'normalized (sentence)', 'parsed: op, lhs, rhs', '{sympy_eq: eq, type, {meta:op, correct}}, 'graph'
-        for record in scratchpad.get_all():
-            # only work with those with valid sympy equations
-            eq_tuple = record['sympy_eq']['eq']
-            eq, eq_type = safe_unwrap_eq_tuple(eq_tuple)
-            op = record['parsed'].get('op')
-            primality_constraint = record['sympy_eq']['meta'].get('primality_constraint')
-            correct_val = str(record['sympy_eq']['meta'].get('correct', ''))
-            is_correct = correct_val if correct_val else 'Concept'
-
-            # ======== standard candidates ========
-            # add raw sympy_eq as a candidate
-            standard_candidates.append(make_candidate(record, eq_tuple[0] if isinstance(eq_tuple, tuple) else eq_tuple, 'direct_sympy', op, note=primality_constraint, correct=is_correct))
-            # Commutative and Isolating candidates
-            for candidate_eq in commutative_candidates(eq, eq_type, op, scratchpad) + isolating_candidates(eq, eq_type, op, scratchpad):
-                candidate = {'source_step': record['step'], 'orig_sentence': record['sentence'], 'derived_eq': candidate_eq, 'generation_method': 'commutativity_or_rearrangement'}
-                standard_candidates.append(make_candidate(record, candidate_eq, 'commutativity_or_rearrangement', op, correct=is_correct))
-            # Algebraic candidates
-            for candidate_eq in algebraic_candidates(eq, eq_type, record, op, scratchpad, correct=is_correct):
-                standard_candidates.append(candidate_eq)
-            # Modulo candidates
-            for candidate_eq in modulo_candidates(eq, eq_type, record, op, scratchpad, correct=is_correct): # cannot access local variable 'sym' where its not associated with a value
-                standard_candidates.append(candidate_eq)
-            # Prime candidates
-            if op and op in PRIME_PATTERN_HANDLERS:
-                for candidate in prime_candidates(record, op, scratchpad):
-                    note = candidate.get('note', None)
-                    standard_candidates.append(make_candidate(record, candidate['derived_eq'], candidate['generation_method'], op, note, correct=is_correct))
-
-            # ======== graph-based candidates ========
-            graph = record.get('graph')
-            if graph is not None:
-                for candidate_eq in get_graph_candidates(graph, record, is_correct):
-                    graph_candidates.append(candidate_eq)
-                for candidate_eq in clique_candidates(graph, record, is_correct):
-                    graph_candidates.append(candidate_eq)
-                for candidate_eq in star_candidates(graph, record, is_correct):
-                    graph_candidates.append(candidate_eq)
-                for candidate_eq in bipartite_candidates(graph, record, is_correct):
-                    graph_candidates.append(candidate_eq)
-                for candidate_eq in motif_subgraph_candidates(graph, record, is_correct):
-                    graph_candidates.append(candidate_eq)
-
-        unique_standard = unique_candidates(standard_candidates)
-        unique_graph = unique_candidates(graph_candidates)
+        unique_standard = [cand for cand in unique_candidates(standard_candidates) if not is_known_candidate(cand, known)]
+        unique_graph = [cand for cand in unique_candidates(graph_candidates) if not is_known_candidate(cand, known)]
 
         #filtered_standard = filter_candidates(unique_standard)
         #filtered_graph = filter_candidates(unique_graph)
@@ -219,22 +408,164 @@ def generate_manual_candidates(scratchpad):
     
     except Exception as e:
         return [annotate_error("candidate_generator", e, str(scratchpad))]
-    
-def generate_candidates(scratchpad, sp_rec, generator_type='manual'):
+
+def stream_manual_candidates(scratchpad, enabled=None, known=None):
+    """
+    Streaming form of generate_manual_candidates: yields ('standard' | 'graph', candidate) pairs, deduped, as the
+    plugins produce them. Collected per kind, the output is the same as generate_manual_candidates'.
+    """
+    plugins = enabled_plugins(enabled)
+    motifs = motif_miner(scratchpad, plugins)
+    indices = {'standard': CandidateIndex(), 'graph': CandidateIndex()}
+    for index, record in enumerate(scratchpad.get_all(), start=getattr(scratchpad, 'start', 0)):
+        for kind, produced in iter_record_candidates(record, scratchpad, plugins, index, motifs):
+            for cand in indices[kind].add(produced):
+                if not is_known_candidate(cand, known):
+                    yield kind, cand
+    for kind, produced in iter_scratchpad_candidates(scratchpad, plugins, motifs):
+        for cand in indices[kind].add(produced):
+            if not is_known_candidate(cand, known):
+                yield kind, cand
+
+
+class CandidateIndex:
+    """
+    Insertion-ordered dedup index of candidates (keyed by candidate_key); error candidates are always kept.
+    """
+    def __init__(self):
+        self.entries = {}
+
+    def add(self, candidates):
+        """ Index candidates; returns the ones that were not seen before. """
+        added = []
+        for cand in candidates:
+            key = candidate_key(cand)
+            if key is None:
+                key = ('error', len(self.entries))
+            if key not in self.entries:
+                self.entries[key] = cand
+                added.append(cand)
+        return added
+
+    def values(self):
+        return list(self.entries.values())
+
+
+class IncrementalCandidateGenerator:
+    """
+    Manual candidate generation that keeps its candidates between calls and only generates candidates for the
+    scratchpad records added since the previous call, so a run costs O(records) generation instead of O(records^2).
+    The output is the same as generate_manual_candidates on the current scratchpad contents (union over all held
+    records, deduped in record order). When records are evicted from the scratchpad, their candidates are dropped
+    and the dedup indices are rebuilt from the stored per-record candidates (no regeneration).
+    The motif miner is kept as well (records are added to / evicted from it), and the scratchpad-scope plugins
+    run on it after the new records.
+    """
+    def __init__(self, enabled=None, known=None):
+        self.plugins = enabled_plugins(enabled)
+        self.known = known # optional CandidateFilter: candidates processed in earlier runs are skipped
+        self.reset()
+
+    def reset(self, scratchpad=None):
+        self.scratchpad = scratchpad
+        self.cursor = 0
+        self.records = deque() # (absolute record index, standard candidates, graph candidates)
+        self.standard = CandidateIndex()
+        self.graph = CandidateIndex()
+        self.motifs = MotifMiner() if any(name in MOTIF_PLUGINS for name in self.plugins) else None
+
+    def _rebuild(self):
+        self.standard, self.graph = CandidateIndex(), CandidateIndex()
+        for _, standard, graph in self.records:
+            self.standard.add(standard)
+            self.graph.add(graph)
+
+    def __call__(self, scratchpad):
+        try:
+            standard, graph = [], []
+            for kind, cand in self.stream(scratchpad):
+                (standard if kind == 'standard' else graph).append(cand)
+            return standard, graph
+
+        except Exception as e:
+            return [annotate_error("candidate_generator", e, str(scratchpad))]
+
+    def stream(self, scratchpad):
+        """
+        Streaming form of __call__: yields ('standard' | 'graph', candidate) pairs, first the candidates held for earlier
+        records, then the new unique candidates of the records added since the previous call, plugin by plugin.
+        Collected per kind, the output is the same as __call__'s.
+        """
+        if scratchpad is not self.scratchpad:
+            self.reset(scratchpad)
+        # Drop candidates of records that left the scratchpad, and cross-record candidates built with them
+        evicted = []
+        while self.records and self.records[0][0] < scratchpad.start:
+            evicted.append(self.records.popleft()[0])
+        if evicted:
+            if self.motifs is not None:
+                self.motifs.evict(evicted)
+            self.records = deque((index, [c for c in standard if c.get('related_record', scratchpad.start) >= scratchpad.start],
+                                  [c for c in graph if c.get('related_record', scratchpad.start) >= scratchpad.start]) for index, standard, graph in self.records)
+            self._rebuild()
+
+        new_records, cursor = scratchpad.since(self.cursor)
+        held = [('standard', cand) for cand in self.standard.values()] + [('graph', cand) for cand in self.graph.values()]
+        yield from ((kind, cand) for kind, cand in held if not is_known_candidate(cand, self.known))
+        if self.motifs is not None:
+            self.motifs.add(enumerate(new_records, start=cursor - len(new_records)))
+        for index, record in enumerate(new_records, start=cursor - len(new_records)):
+            candidates = {'standard': [], 'graph': []}
+            for kind, produced in iter_record_candidates(record, scratchpad, self.plugins, index, self.motifs):
+                candidates[kind].extend(produced)
+                for cand in (self.standard if kind == 'standard' else self.graph).add(produced):
+                    if not is_known_candidate(cand, self.known):
+                        yield kind, cand
+            # A record only counts as done once all its plugins ran (an abandoned stream resumes from it)
+            self.records.append((index, candidates['standard'], candidates['graph']))
+            self.cursor = index + 1
+        self.cursor = cursor
+        # Scratchpad-scope candidates are rebuilt from the held records on every call, so they are not kept
+        for kind, produced in iter_scratchpad_candidates(scratchpad, self.plugins, self.motifs):
+            held = self.standard if kind == 'standard' else self.graph
+            for cand in CandidateIndex().add(produced):
+                if candidate_key(cand) not in held.entries and not is_known_candidate(cand, self.known):
+                    yield kind, cand
+
+
+def generate_candidates(scratchpad, sp_rec, generator_type='manual', manual_generator=None):
     """
     Chooses candidate generation backend:
     - 'manual': Calls rule-based generation.
     - 'auto': Calls LLM/neural backend.
     - 'both': Combines both (dedupes, merges provenance etc).
+    manual_generator: optional IncrementalCandidateGenerator used instead of regenerating over the whole scratchpad.
     """
+    generate_manual_candidates_fn = manual_generator or generate_manual_candidates
     if generator_type == 'manual':
-        return generate_manual_candidates(scratchpad)
+        return generate_manual_candidates_fn(scratchpad)
     elif generator_type == 'auto':
-        
+
         return generate_auto_candidates(sp_rec)
     elif generator_type == 'both':
-        manual_cands, manual_graphs = generate_manual_candidates(scratchpad)
+        manual_cands, manual_graphs = generate_manual_candidates_fn(scratchpad)
         auto_cands, auto_graphs = generate_auto_candidates(sp_rec)
         return manual_cands + auto_cands, manual_graphs + auto_graphs
     else:
-        raise ValueError(f"Unknown generator type: {generator_type}")
\ No newline at end of file
+        raise ValueError(f"Unknown generator type: {generator_type}")
+
+
+def stream_candidates(scratchpad, sp_rec, generator_type='manual', manual_generator=None):
+    """
+    Streaming form of generate_candidates: yields ('standard' | 'graph', candidate) pairs as they are generated
+    (manual candidates first, then the LLM/neural ones), so enhancement and verification can start on the first
+    candidates while later ones are still being generated.
+    """
+    if generator_type not in ('manual', 'auto', 'both'):
+        raise ValueError(f"Unknown generator type: {generator_type}")
+    if generator_type in ('manual', 'both'):
+        yield from (manual_generator.stream(scratchpad) if manual_generator is not None else stream_manual_candidates(scratchpad))
+    if generator_type in ('auto', 'both'):
+        auto_cands, auto_graphs = generate_auto_candidates(sp_rec)
+        yield from (('standard', cand) for cand in auto_cands)
+        yield from (('graph', cand) for cand in auto_graphs)
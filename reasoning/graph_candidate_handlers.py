@@ -2,8 +2,184 @@
 
 import networkx as nx
 from utils.candidate_helpers import make_candidate
-from .graph_candidate_motifs import KNOWN_MOTIFS
+from .graph_candidate_motifs import candidate_motifs, MOTIF_STATS
+from .structure_cache import cached_analysis
 from utils.general_helpers import annotate_error
+from config.settings import GRAPH_CYCLE_MAX_LENGTH
+
+# ========= Bounded path / cycle enumeration ============
+
+def transitive_paths(graph):
+    """
+    All simple paths n1 -> m -> n2 of length 2 (n1 != n2), read directly off the out-adjacency (neighbors for
+    undirected graphs): O(sum of in-degree * out-degree) instead of a path search per ordered node pair.
+    Paths come grouped by n1, then n2 in node order, then m in adjacency order, the order the pairwise
+    nx.all_simple_paths(graph, n1, n2, cutoff=2) loop produced them in.
+    """
+    position = {node: i for i, node in enumerate(graph.nodes())}
+    for n1 in graph.nodes():
+        by_target = {}
+        for m in graph.adj[n1]:
+            if m == n1:
+                continue
+            for n2 in graph.adj[m]:
+                if n2 != n1 and n2 != m:
+                    by_target.setdefault(n2, []).append(m)
+        for n2 in sorted(by_target, key=position.__getitem__):
+            for m in by_target[n2]:
+                yield [n1, m, n2]
+
+def bounded_cycles(graph, max_length=GRAPH_CYCLE_MAX_LENGTH):
+    """
+    Simple cycles of at most max_length nodes. Directed graphs use the length-bounded search of nx.simple_cycles,
+    which prunes every branch at the bound instead of enumerating all cycles and filtering; undirected graphs use
+    the cycle basis.
+    """
+    if graph.is_directed():
+        return nx.simple_cycles(graph, length_bound=max_length)
+    return (cycle for cycle in nx.cycle_basis(graph) if len(cycle) <= max_length)
+
+# ========= Structural analyses ============
+# Each analysis returns (tag, nodes) items and only looks at node types, is_prime and edge labels, so graphs of the
+# same shape share one run through reasoning/structure_cache.py; the handlers below only format the items.
+
+def cycle_analysis(graph):
+    items = []
+    try:
+        for cycle in bounded_cycles(graph):
+            if len(cycle) > 1:
+                items.append(('cycle', tuple(cycle)))
+    except Exception:
+        pass
+    return items
+
+def path_analysis(graph):
+    return [('path', tuple(path)) for path in transitive_paths(graph)]
+
+def undirected_neighbors(graph):
+    """ Neighbor lists of the undirected view, in the adjacency order graph.to_undirected() would give them. """
+    if not graph.is_directed():
+        return {node: list(graph.adj[node]) for node in graph}
+    neighbors = {node: {} for node in graph} # dicts as ordered sets
+    for u, nbrs in graph.adj.items():
+        for v in nbrs:
+            neighbors[u][v] = None
+            neighbors[v][u] = None
+    return {node: list(nbrs) for node, nbrs in neighbors.items()}
+
+def maximal_cliques(nodes, neighbors):
+    """ Maximal cliques, by the pivoting Bron-Kerbosch search of nx.find_cliques (same cliques, same order). """
+    if not nodes:
+        return
+    adj = {u: {v for v in neighbors[u] if v != u} for u in nodes}
+    Q = [None]
+    cand = set(nodes)
+    subg = cand.copy()
+    stack = []
+    u = max(subg, key=lambda u: len(cand & adj[u]))
+    ext_u = cand - adj[u]
+    while True:
+        if ext_u:
+            q = ext_u.pop()
+            cand.remove(q)
+            Q[-1] = q
+            subg_q = subg & adj[q]
+            if not subg_q:
+                yield Q[:]
+            else:
+                cand_q = cand & adj[q]
+                if cand_q:
+                    stack.append((subg, cand, ext_u))
+                    Q.append(None)
+                    subg, cand = subg_q, cand_q
+                    u = max(subg, key=lambda u: len(cand & adj[u]))
+                    ext_u = cand - adj[u]
+        elif stack:
+            Q.pop()
+            subg, cand, ext_u = stack.pop()
+        else:
+            return
+
+def two_coloring(nodes, neighbors):
+    """ Colors (1 / 0) of a proper two-coloring, as nx.bipartite.color assigns them; None if the graph has an odd cycle. """
+    color = {}
+    for n in nodes:
+        if n in color or not neighbors[n]:
+            continue
+        queue = [n]
+        color[n] = 1
+        while queue:
+            v = queue.pop()
+            c = 1 - color[v]
+            for w in neighbors[v]:
+                if w in color:
+                    if color[w] == color[v]:
+                        return None
+                else:
+                    color[w] = c
+                    queue.append(w)
+    color.update((n, 0) for n in nodes if not neighbors[n])
+    return color
+
+def components(nodes, neighbors):
+    seen = set()
+    for n in nodes:
+        if n in seen:
+            continue
+        seen.add(n)
+        component, queue = [n], [n]
+        while queue:
+            for w in neighbors[queue.pop()]:
+                if w not in seen:
+                    seen.add(w)
+                    component.append(w)
+                    queue.append(w)
+        yield component
+
+def undirected_structure_analysis(graph):
+    """
+    One pass over the undirected view, shared by the clique, star and bipartite handlers: its neighbor lists and sets
+    are built once, then give the maximal cliques (of at least 3 nodes), the stars, the connected components and a
+    two-coloring. The bipartite sides are only defined for a connected graph; otherwise the item is the error
+    nx.bipartite.sets would raise.
+    """
+    nodes = list(graph)
+    neighbors = undirected_neighbors(graph)
+    adj = {node: set(nbrs) for node, nbrs in neighbors.items()}
+    items = [('clique', tuple(clique)) for clique in maximal_cliques(nodes, neighbors) if len(clique) >= 3]
+    for center in nodes:
+        leaves = adj[center]
+        # A star center has at least 3 neighbors, none of them connected to each other
+        if len(leaves) >= 3 and all(adj[leaf].isdisjoint(leaves) for leaf in leaves):
+            items.append(('star', (center,) + tuple(neighbors[center])))
+    parts = list(components(nodes, neighbors))
+    items.extend(('component', tuple(part)) for part in parts)
+    color = two_coloring(nodes, neighbors)
+    if color is not None:
+        if not nodes:
+            items.append((('bipartite_error', nx.NetworkXPointlessConcept, "Connectivity is undefined for the null graph."), ()))
+        elif len(parts) > 1:
+            items.append((('bipartite_error', nx.AmbiguousSolution, "Disconnected graph: Ambiguous solution for bipartite sets."), ()))
+        else:
+            side1 = tuple(n for n in nodes if color[n])
+            items.append((('bipartite', len(side1)), side1 + tuple(n for n in nodes if not color[n])))
+    return items
+
+def _structure(graph, kind):
+    """ (tag, nodes) items of one kind from the shared undirected structure pass (cached per graph shape). """
+    return [(tag, nodes) for tag, nodes in cached_analysis(graph, 'undirected_structure', undirected_structure_analysis)
+            if (tag[0] if isinstance(tag, tuple) else tag).startswith(kind)]
+
+def motif_analysis(graph):
+    items = []
+    # Motifs are compiled once; VF2 only runs on those whose node count and edge-label multiset fit the graph
+    for compiled in candidate_motifs(graph):
+        MOTIF_STATS["vf2_runs"] += 1
+        matcher = nx.algorithms.isomorphism.DiGraphMatcher(graph, compiled["graph"], node_match = flexible_node_match, edge_match = flexible_edge_match)
+        for subiso in matcher.subgraph_isomorphisms_iter():
+            items.append(((compiled["name"], tuple(subiso.values())), tuple(subiso)))
+    return items
+
 
 def get_graph_candidates(graph, record, is_correct):
     """
@@ -18,26 +194,19 @@ def get_graph_candidates(graph, record, is_correct):
     if not isinstance(graph, (nx.Graph, nx.DiGraph)):
         return candidates
 
-    # Example: Find all simple cycles up to length 4
-    try:
-        for cycle in nx.simple_cycles(graph) if graph.is_directed() else nx.cycle_basis(graph):
-            if len(cycle) > 1 and len(cycle) <= 4:
-                cycle_vars = ', '.join(str(n) for n in cycle)
-                formula_str = f"Cycle: {cycle_vars}"
-                candidates.append(make_candidate(record, formula_str, 'graph_cycle_discovery', correct=is_correct))
-    except Exception:
-        pass
+    # Simple cycles up to GRAPH_CYCLE_MAX_LENGTH (a cycle basis depends on more than the shape: never cached)
+    cycles = cached_analysis(graph, 'cycles', cycle_analysis) if graph.is_directed() else cycle_analysis(graph)
+    for _, cycle in cycles:
+        cycle_vars = ', '.join(str(n) for n in cycle)
+        formula_str = f"Cycle: {cycle_vars}"
+        candidates.append(make_candidate(record, formula_str, 'graph_cycle_discovery', correct=is_correct))
 
-    # Example: All paths of length 2 (indicate transitive formula relationships)
+    # All paths of length 2 (indicate transitive formula relationships)
     try:
-        for n1 in graph.nodes():
-            for n2 in graph.nodes():
-                if n1 != n2:
-                    for path in nx.all_simple_paths(graph, n1, n2, cutoff=2):
-                        if len(path) == 3:  # cutoff includes intermediary
-                            path_vars = ', '.join(str(x) for x in path)
-                            formula_str = f"TransitivePath: {path_vars}"
-                            candidates.append(make_candidate(record, formula_str, 'graph_path_discovery', correct=is_correct))
+        for _, path in cached_analysis(graph, 'paths', path_analysis):
+            path_vars = ', '.join(str(x) for x in path)
+            formula_str = f"TransitivePath: {path_vars}"
+            candidates.append(make_candidate(record, formula_str, 'graph_path_discovery', correct=is_correct))
     except Exception as e:
         return [annotate_error("get_graph_candidates", e, str(candidates))]
     
@@ -52,15 +221,12 @@ def clique_candidates(graph, record, is_correct):
 
     if not isinstance(graph, (nx.Graph, nx.DiGraph)):
         return candidates
-    G = graph.to_undirected() if graph.is_directed() else graph
     try:
-        # Only want maximal cliques of at least 3 nodes
-        for clique in nx.find_cliques(G):
-            if len(clique) >= 3:
-                cli_str = ','.join(str(x) for x in clique)
-                formula_str = f"Clique relation among [{cli_str}]"
-                note = "All these variables/constants are mutually related (fully connected subgraph)."
-                candidates.append(make_candidate(record, formula_str, 'graph_clique_discovery', note, correct=is_correct))
+        for _, clique in _structure(graph, 'clique'):
+            cli_str = ','.join(str(x) for x in clique)
+            formula_str = f"Clique relation among [{cli_str}]"
+            note = "All these variables/constants are mutually related (fully connected subgraph)."
+            candidates.append(make_candidate(record, formula_str, 'graph_clique_discovery', note, correct=is_correct))
     except Exception as e:
         return [annotate_error("clique_candidates", e, str(candidates))]
 
@@ -76,20 +242,12 @@ def star_candidates(graph, record, is_correct):
 
     if not isinstance(graph, (nx.Graph, nx.DiGraph)):
         return candidates
-    G = graph.to_undirected() if graph.is_directed() else graph
     try:
-        # Only want maximal cliques of at least 3 nodes
-        for center in G.nodes():
-            neighbors = set(G.neighbors(center))
-            if len(neighbors) >= 3:
-                # Are the neigbors connected to each other?
-                subgraph = G.subgraph(neighbors)
-                if subgraph.number_of_edges() == 0:
-                    # It's a star
-                    leaf_str = ', '.join(str(x) for x in neighbors)
-                    formula_str = f"Star: Center={center} → [{leaf_str}]"
-                    note = f"This resembles a star structure where {center} connects all others, with no mutual connections among leaves."
-                    candidates.append(make_candidate(record, formula_str, 'graph_star_discovery', note, correct=is_correct))
+        for _, (center, *leaves) in _structure(graph, 'star'):
+            leaf_str = ', '.join(str(x) for x in leaves)
+            formula_str = f"Star: Center={center} → [{leaf_str}]"
+            note = f"This resembles a star structure where {center} connects all others, with no mutual connections among leaves."
+            candidates.append(make_candidate(record, formula_str, 'graph_star_discovery', note, correct=is_correct))
     except Exception as e:
         return [annotate_error("star_candidates", e, str(candidates))]
 
@@ -106,17 +264,17 @@ def bipartite_candidates(graph, record, is_correct):
 
     if not isinstance(graph, (nx.Graph, nx.DiGraph)):
         return candidates
-    G = graph.to_undirected() if graph.is_directed() else graph
 
     try:
-        if nx.is_bipartite(G):
-            set1, set2 = nx.bipartite.sets(G)
-            s1 = ', '.join(str(x) for x in set1)
-            s2 = ', '.join(str(x) for x in set2)
+        for tag, nodes in _structure(graph, 'bipartite'):
+            if tag[0] == 'bipartite_error':
+                raise tag[1](tag[2])
+            size = tag[1]
+            s1 = ', '.join(str(x) for x in nodes[:size])
+            s2 = ', '.join(str(x) for x in nodes[size:])
             formula_str = f"Bipartite relation: [{s1}] <-> [{s2}]"
             note = "These nodes form a bipartite structure: all connections are between sets, not within."
             candidates.append(make_candidate(record, formula_str, 'graph_bipartite_discovery', note, correct=is_correct))
-            any_found = True
     except Exception as e:
         return [annotate_error("bipartite_candidates", e, str(candidates))]
     return candidates
@@ -139,14 +297,23 @@ def flexible_node_match(nattr1, nattr2):
 
 def motif_subgraph_candidates(graph, record, is_correct):
     candidates = []
-    G = graph
-    for motif_name, motif_graph in KNOWN_MOTIFS.items():
-        motif = motif_graph if motif_graph.is_directed() else motif_graph.to_directed()
-        matcher = nx.algorithms.isomorphism.DiGraphMatcher(G, motif, node_match = flexible_node_match, edge_match = flexible_edge_match)
-        for subiso in matcher.subgraph_isomorphisms_iter():
-            mapping = ', '.join(f"{pattern}->{data}" for pattern, data in subiso.items())
-            formula_str = f"Motif subgraph matched: {motif_name}, mapping [{mapping}]"
-            note = f"This subgraph resembles the {motif_name} algebraic motif."
-            candidates.append(make_candidate(record, formula_str, 'graph_motif_subgraph_discovery', note, correct=is_correct))
+    for (motif_name, pattern), hosts in cached_analysis(graph, 'motifs', motif_analysis):
+        candidates.append(motif_candidate(record, motif_name, zip(hosts, pattern), is_correct))
+
+    return candidates
+
+def motif_candidate(record, motif_name, mapping, is_correct):
+    """ Candidate for a motif match; mapping: (graph node, motif node) pairs. """
+    mapping = ', '.join(f"{pattern}->{data}" for pattern, data in mapping)
+    formula_str = f"Motif subgraph matched: {motif_name}, mapping [{mapping}]"
+    note = f"This subgraph resembles the {motif_name} algebraic motif."
+    return make_candidate(record, formula_str, 'graph_motif_subgraph_discovery', note, correct=is_correct)
 
-    return candidates
\ No newline at end of file
+def spanning_motif_candidate(record, motif_name, mapping, steps):
+    """ Candidate for a motif matched across the graphs of several sentences (steps); record is the latest of them. """
+    mapping = ', '.join(f"{pattern}->{data}" for pattern, data in mapping)
+    formula_str = f"Motif spanning sentences matched: {motif_name}, mapping [{mapping}]"
+    note = f"The graphs of steps {', '.join(str(step) for step in steps)} together resemble the {motif_name} algebraic motif."
+    cand = make_candidate(record, formula_str, 'graph_motif_spanning_discovery', note, correct='Concept')
+    cand['source_steps'] = list(steps)
+    return cand
\ No newline at end of file
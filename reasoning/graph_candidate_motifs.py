@@ -1,5 +1,6 @@
 # reasoning/graph_candidate_motifs.py
 
+from collections import Counter
 import networkx as nx
 
 # ========= Algebraic Motif Subgraph Isomorphism ============
@@ -364,4 +365,52 @@ KNOWN_MOTIFS = {
     "prime_exclusion_zone_range": prime_exclusion_zone_range_motif(),
     "prime_exclusion_vals": prime_exclusion_vals_motif(),
     "goldbach": goldbach_motif(),
-}
\ No newline at end of file
+}
+
+# ========= Compiled motifs / label-signature prefilter ============
+
+MOTIF_STATS = {"graphs": 0, "vf2_runs": 0, "skipped": 0, "sweeps": 0, "anchored_runs": 0}
+
+def edge_label_signature(graph):
+    """ Multiset of edge labels of a graph (directed edges, None for unlabeled edges). """
+    return Counter(label for _, _, label in graph.edges(data='label'))
+
+def compile_motif(name, motif_graph):
+    """
+    Directed form of a motif (undirected motifs get both edge directions, as the VF2 DiGraphMatcher sees them)
+    with its requirements on a host graph: node count and edge-label multiset, plus its node order and whether it is
+    (weakly) connected, for the batch miner (reasoning/motif_miner.py).
+    """
+    motif = motif_graph if motif_graph.is_directed() else motif_graph.to_directed()
+    return {"name": name, "graph": motif, "nodes": motif.number_of_nodes(), "labels": edge_label_signature(motif),
+            "order": {node: i for i, node in enumerate(motif.nodes())}, "connected": nx.is_weakly_connected(motif)}
+
+COMPILED_MOTIFS = [dict(compile_motif(name, motif_graph), position=position) for position, (name, motif_graph) in enumerate(KNOWN_MOTIFS.items())]
+
+# edge label -> positions (in COMPILED_MOTIFS) of the motifs requiring it
+MOTIF_LABEL_INDEX = {}
+for _position, _compiled in enumerate(COMPILED_MOTIFS):
+    for _label in _compiled["labels"]:
+        MOTIF_LABEL_INDEX.setdefault(_label, []).append(_position)
+
+def candidate_motifs(graph, labels=None):
+    """
+    Compiled motifs graph can contain, in KNOWN_MOTIFS order. A (node-induced) subgraph isomorphism maps every motif
+    edge to a distinct host edge with the same label, so a motif is kept only if graph has at least as many nodes and
+    contains its edge-label multiset; only those are worth a VF2 run. labels: the graph's signature, if already known.
+    """
+    MOTIF_STATS["graphs"] += 1
+    try:
+        labels = edge_label_signature(graph) if labels is None else labels
+    except TypeError:
+        # Unhashable edge labels: no signature, test every motif
+        return list(COMPILED_MOTIFS)
+    nodes = graph.number_of_nodes()
+    hits = Counter(position for label in labels for position in MOTIF_LABEL_INDEX.get(label, ()))
+    out = []
+    for position, compiled in enumerate(COMPILED_MOTIFS):
+        if hits[position] == len(compiled["labels"]) and compiled["nodes"] <= nodes \
+                and all(labels[label] >= count for label, count in compiled["labels"].items()):
+            out.append(compiled)
+    MOTIF_STATS["skipped"] += len(COMPILED_MOTIFS) - len(out)
+    return out
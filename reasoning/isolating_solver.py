@@ -0,0 +1,121 @@
+# reasoning/isolating_solver.py
+
+from collections import OrderedDict
+import sympy as sp
+from config.settings import ISOLATE_SHAPE_CACHE_SIZE
+
+# (equation shape, symbol) -> solving plan, least recently used first (bounded by ISOLATE_SHAPE_CACHE_SIZE); see isolate()
+SHAPE_CACHE = OrderedDict()
+SOLVER_STATS = {"fast": 0, "fallback": 0, "shape_hits": 0, "shape_misses": 0, "shape_evictions": 0}
+_PLACEHOLDERS = []
+
+
+def _placeholder(i):
+    while len(_PLACEHOLDERS) <= i:
+        _PLACEHOLDERS.append(sp.Dummy(f"c{len(_PLACEHOLDERS)}"))
+    return _PLACEHOLDERS[i]
+
+def equation_shape(expr):
+    """
+    Shape of an expression: every number is replaced by a placeholder c0, c1, ... (in traversal order), except
+    exponents, which are part of the shape. Returns (shape, numbers), so 3*x + 5 and 7*x - 2 share a shape.
+    """
+    numbers = []
+    def walk(node, keep_numbers=False):
+        if node.is_Number:
+            if keep_numbers:
+                return node
+            numbers.append(node)
+            return _placeholder(len(numbers) - 1)
+        if not node.args:
+            return node
+        if node.is_Pow:
+            return sp.Pow(walk(node.base), walk(node.exp, keep_numbers=True), evaluate=False)
+        return node.func(*[walk(arg) for arg in node.args], evaluate=False)
+    with sp.evaluate(False):
+        shape = walk(expr)
+    return shape, numbers
+
+def _plan(shape, sym):
+    """
+    Solving plan for shape = 0 in sym: ('linear', x) for a*sym + b, ('power', n, x) for a*sym**n + b (n >= 2),
+    ('radical', n, x) for a*sym**(1/n) + b (n >= 2), where x = -b/a is expressed in the placeholders, or None if
+    the shape is none of these forms.
+    """
+    shape = shape.doit()
+    indep, dep = shape.as_independent(sym, as_Add=True)
+    coeff, power = dep.as_independent(sym, as_Add=False)
+    if power == sym:
+        n = 1
+    elif power.is_Pow and power.base == sym and power.exp.is_Integer and power.exp > 1:
+        n = int(power.exp)
+    elif power.is_Pow and power.base == sym and power.exp.is_Rational and power.exp.p == 1 and power.exp.q > 1:
+        n = -int(power.exp.q)
+    else:
+        return None
+    if coeff == 0 or coeff.has(sym) or indep.has(sym):
+        return None
+    value = -indep / coeff
+    if n == 1:
+        return ('linear', value)
+    return ('power', n, value) if n > 1 else ('radical', -n, value)
+
+def _first_root(plan, numbers):
+    """ First root of the plan, in the same form and order as sp.solve returns it, or None to fall back. """
+    value = plan[-1].xreplace(dict(zip(_PLACEHOLDERS, numbers)))
+    if plan[0] == 'linear':
+        return value
+    # Symbolic radicands are rewritten by sp.solve (denominators pulled out), so only concrete ones take the fast path
+    n = plan[1]
+    if not value.is_number:
+        return None
+    if plan[0] == 'radical':
+        # Principal roots are non-negative, so only a positive value has the (single) root value**n
+        return value ** n if value.is_positive else None
+    if n == 2:
+        # sp.solve lists -sqrt(value) first, whatever the sign of value
+        return -sp.sqrt(value)
+    if value.is_positive:
+        # Real principal root first for odd n, negative real root first for even n
+        return value ** sp.Rational(1, n) if n % 2 else -value ** sp.Rational(1, n)
+    return None
+
+def _cached_plan(shape, sym):
+    key = (shape, sym)
+    if key in SHAPE_CACHE:
+        SOLVER_STATS["shape_hits"] += 1
+        SHAPE_CACHE.move_to_end(key)
+        return SHAPE_CACHE[key]
+    SOLVER_STATS["shape_misses"] += 1
+    plan = SHAPE_CACHE[key] = _plan(shape, sym)
+    if len(SHAPE_CACHE) > ISOLATE_SHAPE_CACHE_SIZE:
+        SHAPE_CACHE.popitem(last=False)
+        SOLVER_STATS["shape_evictions"] += 1
+    return plan
+
+def isolate(eq, sym):
+    """
+    Isolate sym in eq and return the first solution (as sp.solve(eq, sym)[0] would), or None if there is none.
+    Linear equations, monomial powers and radicals with a concrete right-hand side are solved by coefficient extraction, with
+    a per-shape plan cache; anything else (floats, and symbols with assumptions, which sp.solve uses to filter roots)
+    goes through sp.solve.
+    """
+    if sym.assumptions0 == {'commutative': True}:
+        try:
+            expr = (eq.lhs - eq.rhs).doit()
+            shape, numbers = equation_shape(expr)
+            if any(number.is_Float for number in numbers):
+                # Floats: keep sp.solve's own rounding
+                raise ValueError("float coefficients")
+            plan = _cached_plan(shape, sym)
+            root = _first_root(plan, numbers) if plan is not None else None
+            if root is not None:
+                SOLVER_STATS["fast"] += 1
+                return root
+        except Exception:
+            pass
+    SOLVER_STATS["fallback"] += 1
+    solved = sp.solve(eq, sym)
+    if not solved:
+        return None
+    return solved[0] if isinstance(solved, list) else solved
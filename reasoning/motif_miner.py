@@ -0,0 +1,283 @@
+# reasoning/motif_miner.py
+
+import networkx as nx
+from collections import Counter, deque
+from .graph_candidate_motifs import COMPILED_MOTIFS, MOTIF_STATS, candidate_motifs, edge_label_signature
+from .graph_candidate_handlers import flexible_node_match, flexible_edge_match
+
+_PLANS = {} # (motif position, start node) -> search plan, see _search_plan
+
+
+def _match_text(mapping):
+    return ', '.join(f"{host}->{pattern}" for host, pattern in mapping)
+
+def _search_plan(compiled, start):
+    """
+    Order in which the nodes of a connected motif are placed when start is anchored, start first: (node, its
+    is_prime requirement, placed node it is reached from, whether the motif edge goes out of that node, the label of
+    that edge, motif edges (a, b, label) it closes).
+    """
+    key = (compiled["position"], start)
+    plan = _PLANS.get(key)
+    if plan is None:
+        motif = compiled["graph"]
+        loops = [(start, start, motif[start][start].get('label', None))] if motif.has_edge(start, start) else []
+        placed, plan = {start}, [(start, motif.nodes[start].get('is_prime', None), None, None, None, loops)]
+        frontier = deque([start])
+        while frontier:
+            node = frontier.popleft()
+            for neighbor, outgoing in [(n, True) for n in motif.succ[node]] + [(n, False) for n in motif.pred[node]]:
+                if neighbor in placed:
+                    continue
+                placed.add(neighbor)
+                label = (motif[node][neighbor] if outgoing else motif[neighbor][node]).get('label', None)
+                closing = [(a, b, data.get('label', None)) for a, b, data in motif.edges(data=True) if neighbor in (a, b) and {a, b} <= placed]
+                plan.append((neighbor, motif.nodes[neighbor].get('is_prime', None), node, outgoing, label, closing))
+                frontier.append(neighbor)
+        _PLANS[key] = plan
+    return plan
+
+
+class MotifMiner:
+    """
+    Batch motif matching over scratchpad records (by absolute index). The record graphs are composed into one labeled
+    multigraph, stored as a DiGraph whose edges map each record having them to its label ('records': {index: label})
+    and whose nodes map each record holding them to its is_prime value. Adding records only changes the matches that
+    contain one of their nodes, so connected KNOWN_MOTIFS are matched by a search anchored at those nodes, grown edge
+    by edge along the composed graph (a monomorphism: every motif edge onto a host edge carrying its label). Every
+    match keeps, per motif edge and node, the records supporting it, which attributes it back to its records:
+      - a record match: one record holds the whole match as an induced subgraph (what motif_subgraph_candidates
+        finds on that record's graph alone)
+      - a spanning match: no single record has all of its edges, the match only exists across several records' graphs
+    Disconnected motifs only relate records through unrelated edges, so they are matched on each record's graph.
+    Records can be added and evicted; the matches are always those of the records held.
+    """
+    def __init__(self):
+        self.graph = nx.DiGraph() # composed graph; node attr 'records': {index: is_prime}, edge attr 'records': {index: label}
+        self.labels = Counter() # edge label -> composed edges carrying it
+        # Matching index over integer node ids (cheaper to hash than SymPy nodes): label -> {node: nodes reached by an
+        # edge carrying it} out of / into each node, and the is_prime value of the composed nodes that restrict it
+        self.ids, self.names, self.next_id = {}, {}, 0
+        self.out, self.inn = {}, {}
+        self.primes = {}
+        self.records = {} # record index -> record
+        self.graphs = {} # record index -> directed graph of the record
+        self.matches = {} # (motif position, host nodes in motif node order) -> {'compiled', 'mapping', 'text', 'edges', 'nodes'}
+        self.supported = {} # record index -> keys of the matches it supports
+        self.spanning = set() # keys of the spanning matches
+        self.local = {} # record index -> [(motif position, mapping, text)], the record's own matches
+
+    # ======== composed graph ========
+    def add(self, indexed_records):
+        """ Add (absolute index, record) pairs (already added indices are skipped) and match motifs around them. """
+        new = []
+        for index, record in indexed_records:
+            if index in self.records:
+                continue
+            self.records[index] = record
+            self.supported[index] = set()
+            self.local[index] = []
+            graph = record.get('graph') if isinstance(record, dict) else None
+            if not isinstance(graph, (nx.Graph, nx.DiGraph)):
+                continue
+            graph = self.graphs[index] = graph if graph.is_directed() else graph.to_directed()
+            for node, is_prime in graph.nodes(data='is_prime'):
+                if node not in self.graph:
+                    self.graph.add_node(node, records={})
+                    self.ids[node], self.next_id = self.next_id, self.next_id + 1
+                    self.names[self.ids[node]] = node
+                self.graph.nodes[node]['records'][index] = is_prime
+                self._relax(node)
+            for u, v, label in graph.edges(data='label'):
+                if not self.graph.has_edge(u, v):
+                    self.graph.add_edge(u, v, records={})
+                records = self.graph[u][v]['records']
+                if label not in records.values():
+                    self.labels[label] += 1
+                    self.out.setdefault(label, {}).setdefault(self.ids[u], set()).add(self.ids[v])
+                    self.inn.setdefault(label, {}).setdefault(self.ids[v], set()).add(self.ids[u])
+                records[index] = label
+            new.append(index)
+        if new:
+            self._sweep(new)
+
+    def evict(self, indices):
+        """ Remove records (by absolute index) with their edges, node memberships and matches. """
+        for index in indices:
+            if self.records.pop(index, None) is None:
+                continue
+            self.local.pop(index, None)
+            graph = self.graphs.pop(index, None)
+            if graph is not None:
+                for u, v in graph.edges():
+                    records = self.graph[u][v]['records']
+                    label = records.pop(index)
+                    if label not in records.values():
+                        self.labels[label] -= 1
+                        if not self.labels[label]:
+                            del self.labels[label]
+                        self._unlink(self.out[label], self.ids[u], self.ids[v])
+                        self._unlink(self.inn[label], self.ids[v], self.ids[u])
+                    if not records:
+                        self.graph.remove_edge(u, v)
+                for node in graph.nodes():
+                    records = self.graph.nodes[node]['records']
+                    records.pop(index, None)
+                    if records:
+                        self._relax(node)
+                    else:
+                        self.graph.remove_node(node)
+                        self.primes.pop(self.ids[node], None)
+                        del self.names[self.ids.pop(node)]
+            for key in self.supported.pop(index, ()):
+                match = self.matches.get(key)
+                if match is None:
+                    continue
+                for supporters in match['edges'] + match['nodes']:
+                    supporters.discard(index)
+                if all(match['edges']) and all(match['nodes']):
+                    self._classify(key)
+                else:
+                    self._drop(key)
+
+    @staticmethod
+    def _unlink(index, u, v):
+        nodes = index[u]
+        nodes.discard(v)
+        if not nodes:
+            del index[u]
+
+    def _relax(self, node):
+        # The composed node only restricts is_prime if every record holding it agrees on a value
+        data = self.graph.nodes[node]
+        values = list(data['records'].values())
+        if values[0] is not None and all(value == values[0] for value in values):
+            data['is_prime'] = self.primes[self.ids[node]] = values[0]
+        else:
+            data.pop('is_prime', None)
+            self.primes.pop(self.ids[node], None)
+
+    # ======== matching ========
+    def _sweep(self, new):
+        MOTIF_STATS["sweeps"] += 1
+        anchors = list(dict.fromkeys(node for index in new for node in self.graphs[index]))
+        # Every match contains some node: anchoring one motif node at every composed node finds each match once
+        everything = len(anchors) == self.graph.number_of_nodes()
+        found = set()
+        for compiled in candidate_motifs(self.graph, self.labels):
+            if compiled["connected"]:
+                MOTIF_STATS["anchored_runs"] += 1
+                starts = list(compiled["graph"])[:1] if everything else list(compiled["graph"])
+                for start in starts:
+                    for subiso in self._anchored(compiled, start, anchors):
+                        key = (compiled["position"], tuple(node for node, _ in self._mapping(compiled, subiso)))
+                        if key not in found and self._store(compiled, subiso) is not None:
+                            found.add(key)
+            else:
+                for index in new:
+                    graph = self.graphs[index]
+                    labels = edge_label_signature(graph)
+                    if graph.number_of_nodes() < compiled["nodes"] or any(labels[label] < count for label, count in compiled["labels"].items()):
+                        continue
+                    MOTIF_STATS["vf2_runs"] += 1
+                    matcher = nx.algorithms.isomorphism.DiGraphMatcher(graph, compiled["graph"], node_match=flexible_node_match, edge_match=flexible_edge_match)
+                    for subiso in matcher.subgraph_isomorphisms_iter():
+                        mapping = self._mapping(compiled, subiso)
+                        self.local[index].append((compiled["position"], mapping, _match_text(mapping)))
+        for index in new:
+            for key in found:
+                match = self.matches[key]
+                if self._holds(index, match):
+                    self.local[index].append((key[0], match['mapping'], match['text']))
+            self.local[index].sort(key=lambda entry: entry[0::2])
+
+    def _anchored(self, compiled, start, anchors):
+        """ Monomorphisms {host node: motif node} of a connected motif into the composed graph with start on an anchor. """
+        plan = _search_plan(compiled, start)
+        _, want, _, _, _, loops = plan[0]
+        for anchor in anchors:
+            anchor = self.ids[anchor]
+            if self._fits(anchor, want) and self._closes({start: anchor}, loops):
+                yield from self._extend(plan, 1, {start: anchor}, {anchor})
+
+    def _extend(self, plan, step, mapping, used):
+        if step == len(plan):
+            yield {self.names[host]: pattern for pattern, host in mapping.items()}
+            return
+        node, want, parent, outgoing, label, closing = plan[step]
+        for host in (self.out if outgoing else self.inn).get(label, {}).get(mapping[parent], ()):
+            if host in used or not self._fits(host, want):
+                continue
+            mapping[node] = host
+            if self._closes(mapping, closing):
+                used.add(host)
+                yield from self._extend(plan, step + 1, mapping, used)
+                used.discard(host)
+            del mapping[node]
+
+    def _fits(self, host, want):
+        # flexible_node_match on the composed node
+        have = self.primes.get(host)
+        return want is None or have is None or have == want
+
+    def _closes(self, mapping, closing):
+        return all(mapping[b] in self.out.get(label, {}).get(mapping[a], ()) for a, b, label in closing)
+
+    @staticmethod
+    def _mapping(compiled, subiso):
+        return tuple(sorted(subiso.items(), key=lambda item: compiled["order"][item[1]]))
+
+    def _store(self, compiled, subiso):
+        """ Record (or refresh) a match with its supporting records; returns its key, or None if no record supports part of it. """
+        mapping = self._mapping(compiled, subiso)
+        host = {pattern: node for node, pattern in mapping}
+        motif = compiled["graph"]
+        edges = [{index for index, label in self.graph[host[a]][host[b]]['records'].items() if label == data.get('label', None)}
+                 for a, b, data in motif.edges(data=True)]
+        nodes = [{index for index, is_prime in self.graph.nodes[host[pattern]]['records'].items()
+                  if flexible_node_match({'is_prime': is_prime}, data)} for pattern, data in motif.nodes(data=True)]
+        key = (compiled["position"], tuple(node for node, _ in mapping))
+        if not all(edges) or not all(nodes):
+            self._drop(key)
+            return None
+        text = self.matches[key]['text'] if key in self.matches else _match_text(mapping)
+        self.matches[key] = {'compiled': compiled, 'mapping': mapping, 'text': text, 'edges': edges, 'nodes': nodes}
+        for index in set().union(*edges, *nodes):
+            self.supported[index].add(key)
+        self._classify(key)
+        return key
+
+    def _classify(self, key):
+        if set.intersection(*self.matches[key]['edges']):
+            self.spanning.discard(key)
+        else:
+            self.spanning.add(key)
+
+    def _drop(self, key):
+        self.spanning.discard(key)
+        match = self.matches.pop(key, None)
+        if match is not None:
+            for index in set().union(*match['edges'], *match['nodes']):
+                self.supported.get(index, set()).discard(key)
+
+    def _holds(self, index, match):
+        """ Whether record index holds the whole match as an induced subgraph of its own graph. """
+        if not all(index in supporters for supporters in match['edges'] + match['nodes']):
+            return False
+        return self.graphs[index].subgraph([node for node, _ in match['mapping']]).number_of_edges() == match['compiled']['graph'].number_of_edges()
+
+    # ======== results ========
+    def record_matches(self, index):
+        """ (motif name, mapping) matches of a held record's own graph, in motif order; mapping: (graph node, motif node) pairs. """
+        return [(COMPILED_MOTIFS[position]["name"], mapping) for position, mapping, _ in self.local.get(index, [])]
+
+    def spanning_matches(self):
+        """
+        (motif name, mapping, record indices) of the matches whose edges no single record has, in motif order. The
+        records are the latest supporter of every motif edge.
+        """
+        out = []
+        for key in sorted(self.spanning, key=lambda key: (key[0], self.matches[key]['text'])):
+            match = self.matches[key]
+            out.append((match['compiled']["name"], match['mapping'], sorted({max(supporters) for supporters in match['edges']})))
+        return out
@@ -0,0 +1,51 @@
+# reasoning/op_registry.py
+
+from collections import namedtuple
+from config.settings import action_ops
+from utils import reasoning_helpers
+from reasoning.tree_search_core import CallAction
+
+# reason: reasoning helper Reasoner.process_graph runs, reason(graph, get_node_by_role)
+# action: CallAction method the tree search runs for the op (config.settings.action_ops), unbound
+OpSpec = namedtuple("OpSpec", ["op", "reason", "action"])
+
+_REASONERS = {
+    'eq': reasoning_helpers.reason_equals,
+    'add': reasoning_helpers.reason_addition,
+    'mul': reasoning_helpers.reason_multiplication,
+    'sub': reasoning_helpers.reason_subtraction,
+    'div': reasoning_helpers.reason_division,
+    'squared': reasoning_helpers.reason_squared,
+    'divisible': reasoning_helpers.reason_divisible,
+    'divides': reasoning_helpers.reason_divides,
+    'factor': reasoning_helpers.reason_factor,
+    'cubed': reasoning_helpers.reason_cubed,
+    'power': reasoning_helpers.reason_power,
+    'sqrt': reasoning_helpers.reason_sqrt,
+    'cbrt': reasoning_helpers.reason_cbrt,
+    'root': reasoning_helpers.reason_root,
+    'remainder': reasoning_helpers.reason_remainder,
+    'sum_of_two_primes': reasoning_helpers.reason_sum_of_two_primes,
+    'twin_primes': reasoning_helpers.reason_twin_primes,
+    'prime_gap': reasoning_helpers.reason_prime_gap,
+    'prime_factors': reasoning_helpers.reason_prime_factors,
+    'is_prime': reasoning_helpers.reason_is_prime,
+    'is_not_prime': reasoning_helpers.reason_is_not_prime,
+    'prime_order': reasoning_helpers.reason_prime_order,
+    'next_prime': reasoning_helpers.reason_next_prime,
+    'where_is_prime': reasoning_helpers.reason_where_is_prime,
+    'quadruplet_primes': reasoning_helpers.reason_quadruplet_primes,
+    'triplet_primes': reasoning_helpers.reason_triplet_primes,
+    'diff_of_primes': reasoning_helpers.reason_diff_of_primes,
+    'prime_exclusion_zone': reasoning_helpers.reason_prime_exclusion_zone,
+    'prime_exclusion_zone_range': reasoning_helpers.reason_prime_exclusion_zone_range,
+    'prime_exclusion_vals': reasoning_helpers.reason_prime_exclusion_vals,
+}
+
+def resolve_action(action_name):
+    """ CallAction method of that name (AttributeError if there is none). """
+    return getattr(CallAction, action_name)
+
+# op -> OpSpec, built once at import: dispatching an op is a single dict lookup
+OP_SPECS = {op: OpSpec(op, reason, resolve_action(action_ops[op]) if op in action_ops else None)
+            for op, reason in _REASONERS.items()}
@@ -0,0 +1,275 @@
+# reasoning/rewrite_engine.py
+
+import sympy as sp
+from itertools import islice, product, zip_longest
+from config.settings import REWRITE_MAX_ITERATIONS, REWRITE_MAX_NODES, REWRITE_MAX_CANDIDATES, REWRITE_SYMPY_MAX_OPS, REWRITE_SYMPY_MAX_DEGREE
+from utils.sympy_helpers import SIMPLIFY_MEMO, cached_expand, cached_factor, within_budget
+
+# rule tag -> rewrite group; a candidate belongs to a group if every node it uses is original ('input') or tagged with a rule of that group
+REWRITE_GROUPS = {'comm': 'rearrange', 'assoc': 'rearrange', 'factor': 'factor', 'expand': 'expand', 'mod': 'modular'}
+REWRITE_STATS = {"graphs": 0, "iterations": 0, "saturated": 0, "budget_exhausted": 0}
+
+
+class EGraph:
+    """
+    E-graph over SymPy expressions: equivalence classes of e-nodes (head, child class ids), where head is the
+    function of the node (sp.Add, sp.Mod, ...) or the expression itself for leaves. Kept congruence-closed by
+    rebuild(), so a rewrite found for a subexpression is shared by every expression containing it.
+    Every e-node remembers the rule that introduced it (tags), which is how extracted terms are attributed to rules.
+    """
+    def __init__(self):
+        self.parent = []
+        self.classes = {} # root id -> list of e-nodes
+        self.hashcons = {} # canonical e-node -> class id
+        self.tags = {} # e-node -> rule tag ('input' for the original expression)
+        self.commutative = {} # root id -> whether the class is commutative (Mul arguments may be swapped)
+
+    def find(self, cid):
+        while self.parent[cid] != cid:
+            self.parent[cid] = self.parent[self.parent[cid]]
+            cid = self.parent[cid]
+        return cid
+
+    def add_node(self, head, children=(), tag='input'):
+        node = (head, tuple(self.find(child) for child in children))
+        if node in self.hashcons:
+            return self.find(self.hashcons[node])
+        cid = len(self.parent)
+        self.parent.append(cid)
+        self.classes[cid] = [node]
+        self.hashcons[node] = cid
+        self.tags[node] = tag
+        self.commutative[cid] = bool(head.is_commutative) if not children else all(self.commutative[child] for child in node[1])
+        return cid
+
+    def add(self, expr, tag='input'):
+        if not expr.args:
+            return self.add_node(expr, (), tag)
+        return self.add_node(expr.func, [self.add(arg, tag) for arg in expr.args], tag)
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if len(self.classes[a]) < len(self.classes[b]):
+            a, b = b, a
+        self.parent[b] = a
+        self.classes[a].extend(self.classes.pop(b))
+        self.commutative[a] = self.commutative[a] and self.commutative.pop(b)
+        return True
+
+    def rebuild(self):
+        """ Restore congruence: re-canonicalize all e-nodes and merge classes that now hold the same e-node. """
+        changed = True
+        while changed:
+            changed = False
+            hashcons, tags = {}, {}
+            for cid in list(self.classes):
+                if self.find(cid) != cid:
+                    continue
+                for head, children in self.classes[cid]:
+                    tag = self.tags.get((head, children), 'input')
+                    node = (head, tuple(self.find(child) for child in children))
+                    if node in hashcons and self.find(hashcons[node]) != self.find(cid):
+                        changed |= self.union(hashcons[node], cid)
+                    hashcons.setdefault(node, cid)
+                    tags[node] = 'input' if 'input' in (tag, tags.get(node)) else tags.get(node, tag)
+            self.hashcons, self.tags = hashcons, tags
+            for cid in list(self.classes):
+                nodes = list(dict.fromkeys((head, tuple(self.find(child) for child in children)) for head, children in self.classes[cid]))
+                self.classes[cid] = nodes
+
+    def size(self):
+        return len(self.hashcons)
+
+    def best_terms(self):
+        """ Smallest term (by node count) of every class: root id -> (cost, expression). """
+        best = {}
+        changed = True
+        while changed:
+            changed = False
+            for cid, nodes in self.classes.items():
+                for head, children in nodes:
+                    kids = [best.get(self.find(child)) for child in children]
+                    if any(kid is None for kid in kids):
+                        continue
+                    cost = 1 + sum(kid[0] for kid in kids)
+                    if cid not in best or cost < best[cid][0]:
+                        best[cid] = (cost, _build(head, [kid[1] for kid in kids]))
+                        changed = True
+        return best
+
+    def terms(self, cid, allowed, limit):
+        """
+        Up to limit distinct terms of a class built only from e-nodes whose tag is in allowed, with the set of tags
+        each one uses. Terms are distinct by srepr, as candidates are (SymPy orders Add/Mul arguments there, so
+        swapped operands are the same term). Alternatives are interleaved across the e-nodes of a class, so rewrites
+        at the top of the expression are not crowded out by variants of its subexpressions.
+        """
+        memo = {}
+        def class_terms(c, stack):
+            c = self.find(c)
+            if c in memo:
+                return memo[c]
+            if c in stack:
+                return []
+            per_node = []
+            for head, children in self.classes[c]:
+                tag = self.tags.get((head, children), 'input')
+                if tag not in allowed:
+                    continue
+                child_terms = [class_terms(child, stack | {c}) for child in children]
+                per_node.append([(_build(head, [term for term, _ in combo]), frozenset({tag}).union(*(tags for _, tags in combo)))
+                                 for combo in islice(product(*child_terms), limit)])
+            out, seen = [], set()
+            for term, tags in (entry for group in zip_longest(*per_node) for entry in group if entry is not None):
+                key = sp.srepr(term)
+                if key not in seen:
+                    seen.add(key)
+                    out.append((term, tags))
+            memo[c] = out[:limit]
+            return memo[c]
+        return class_terms(cid, frozenset())
+
+
+def _build(head, args):
+    if not args:
+        return head
+    try:
+        return head(*args, evaluate=False)
+    except TypeError:
+        return head(*args)
+
+# ======== rewrite rules ========
+# node rules: (egraph, class id, e-node) -> class ids equivalent to the class; class rules: (egraph, class id, best term) -> same
+
+def _rearrangeable(egraph, node):
+    # Only original and rearranged e-nodes are rearranged; rearranging factored/expanded/reduced forms would just
+    # produce variants of the same rewrite
+    return REWRITE_GROUPS.get(egraph.tags.get(node, 'input'), 'rearrange') == 'rearrange'
+
+def commutativity_rule(egraph, cid, node):
+    head, children = node
+    if head not in (sp.Add, sp.Mul) or len(children) < 2 or not egraph.commutative[egraph.find(cid)] or not _rearrangeable(egraph, node):
+        return []
+    return [egraph.add_node(head, children[::-1], 'comm'), egraph.add_node(head, children[1:] + children[:1], 'comm')]
+
+def associativity_rule(egraph, cid, node):
+    head, children = node
+    if head not in (sp.Add, sp.Mul) or not _rearrangeable(egraph, node):
+        return []
+    out = []
+    if len(children) > 2:
+        # (a + b + c) -> ((a + b) + c)
+        inner = egraph.add_node(head, children[:2], 'assoc')
+        out.append(egraph.add_node(head, (inner,) + children[2:], 'assoc'))
+    for i, child in enumerate(children):
+        # (a + (b + c)) -> (a + b + c)
+        for child_head, grandchildren in list(egraph.classes[egraph.find(child)]):
+            if child_head is head and grandchildren:
+                out.append(egraph.add_node(head, children[:i] + grandchildren + children[i + 1:], 'assoc'))
+    return out
+
+def modular_rule(egraph, cid, node):
+    """
+    (a + b) mod m -> ((a mod m) + (b mod m)) mod m. The product form is left out: SymPy evaluates Mod(c*Mod(a, m), m)
+    to c*Mod(a, m), so the rewritten candidate would not verify as equal.
+    """
+    head, children = node
+    if head is not sp.Mod or len(children) != 2:
+        return []
+    arg, modulus = children
+    out = []
+    for arg_head, terms in list(egraph.classes[egraph.find(arg)]):
+        if arg_head is not sp.Add or len(terms) < 2:
+            continue
+        if all(_is_reduced(egraph, term, modulus) for term in terms):
+            continue
+        reduced = [term if _is_reduced(egraph, term, modulus) else egraph.add_node(sp.Mod, (term, modulus), 'mod') for term in terms]
+        out.append(egraph.add_node(sp.Mod, (egraph.add_node(arg_head, reduced, 'mod'), modulus), 'mod'))
+    return out
+
+def _is_reduced(egraph, cid, modulus):
+    modulus = egraph.find(modulus)
+    return any(head is sp.Mod and egraph.find(children[1]) == modulus for head, children in egraph.classes[egraph.find(cid)])
+
+def factor_rule(egraph, cid, term):
+    return _sympy_rewrite(egraph, term, cached_factor, 'factor')
+
+def expand_rule(egraph, cid, term):
+    return _sympy_rewrite(egraph, term, cached_expand, 'expand')
+
+def _sympy_rewrite(egraph, term, func, tag):
+    if not isinstance(term, sp.Expr) or term.is_Atom or not term.free_symbols:
+        return []
+    # Runs in the parent process, outside the verification deadline
+    if not within_budget(term, REWRITE_SYMPY_MAX_OPS, REWRITE_SYMPY_MAX_DEGREE):
+        return []
+    value = term.doit()
+    result = func(value)
+    if result == value:
+        return []
+    return [egraph.add(result, tag)]
+
+NODE_RULES = [commutativity_rule, associativity_rule, modular_rule]
+CLASS_RULES = [factor_rule, expand_rule]
+
+
+def saturate(egraph, max_iterations=REWRITE_MAX_ITERATIONS, max_nodes=REWRITE_MAX_NODES):
+    """
+    Apply the rewrite rules until no rule adds anything (saturation) or the budget (iterations / e-nodes) runs out.
+    Class rules (SymPy factor/expand) run once per class. Returns True if the e-graph saturated.
+    """
+    REWRITE_STATS["graphs"] += 1
+    done = set()
+    for _ in range(max_iterations):
+        REWRITE_STATS["iterations"] += 1
+        size = egraph.size()
+        best = egraph.best_terms()
+        matches = [(cid, node) for cid, nodes in egraph.classes.items() for node in nodes]
+        for cid, node in matches:
+            for rule in NODE_RULES:
+                for new in rule(egraph, cid, node):
+                    egraph.union(cid, new)
+            if egraph.size() > max_nodes:
+                break
+        for cid, (_, term) in best.items():
+            for rule in CLASS_RULES:
+                if (rule, cid) in done or egraph.size() > max_nodes:
+                    continue
+                done.add((rule, cid))
+                for new in rule(egraph, cid, term):
+                    egraph.union(cid, new)
+        egraph.rebuild()
+        if egraph.size() > max_nodes:
+            REWRITE_STATS["budget_exhausted"] += 1
+            return False
+        if egraph.size() == size and all((rule, cid) in done for cid in egraph.classes for rule in CLASS_RULES):
+            REWRITE_STATS["saturated"] += 1
+            return True
+    REWRITE_STATS["budget_exhausted"] += 1
+    return False
+
+def _rewrites(expr):
+    egraph = EGraph()
+    root = egraph.add(expr)
+    saturate(egraph)
+    rewrites = {}
+    original = sp.srepr(expr)
+    for group in dict.fromkeys(REWRITE_GROUPS.values()):
+        allowed = {'input'} | {tag for tag, tag_group in REWRITE_GROUPS.items() if tag_group == group}
+        # terms() is already distinct by srepr; forms that are the input again are dropped before truncating
+        terms = [term for term, tags in egraph.terms(root, allowed, 4 * REWRITE_MAX_CANDIDATES) if tags - {'input'} and sp.srepr(term) != original]
+        rewrites[group] = tuple(terms[:REWRITE_MAX_CANDIDATES])
+    return rewrites
+
+def expression_rewrites(expr):
+    """
+    Equivalent forms of expr found by equality saturation, by rewrite group: 'rearrange' (commutativity and
+    associativity), 'factor', 'expand' and 'modular', each at most REWRITE_MAX_CANDIDATES terms, distinct and
+    different from expr by srepr (the candidate key). Memoized in the shared simplify memo, so every generator asking about the same expression
+    shares one saturation.
+    """
+    if not isinstance(expr, sp.Expr):
+        return {group: () for group in dict.fromkeys(REWRITE_GROUPS.values())}
+    return SIMPLIFY_MEMO.apply("rewrites", _rewrites, expr)
@@ -0,0 +1,120 @@
+# reasoning/structure_cache.py
+
+import hashlib
+from weakref import WeakKeyDictionary
+import networkx as nx
+from config.settings import STRUCTURE_CACHE_SIZE, STRUCTURE_WL_ITERATIONS
+
+# WL hash -> [{'graph': representative graph, 'results': {analysis name: items}}], oldest hash first
+STRUCTURE_CACHE = {}
+STRUCTURE_STATS = {"hits": 0, "misses": 0, "ordered_hits": 0, "collisions": 0}
+_RESOLVED = WeakKeyDictionary() # graph -> ((nodes, edges), cache entry, representative node -> graph node)
+
+
+def node_signature(data):
+    """ What the structural analyses see of a node: its type and is_prime flag (never its concrete value). """
+    return (str(data.get('type')), str(data.get('is_prime')))
+
+def _edge_label(data):
+    return str(data.get('label'))
+
+def _digest(value, size=8):
+    return hashlib.blake2b(repr(value).encode(), digest_size=size).hexdigest()
+
+def structure_hash(graph, iterations=STRUCTURE_WL_ITERATIONS):
+    """
+    Weisfeiler-Lehman hash of a graph over node types (node_signature) and edge labels: every round, a node's label
+    becomes the digest of its label and the sorted labels of its out- and in-neighbors, each with the connecting
+    edge label. Isomorphic graphs (same shape, whatever the concrete values) get the same hash; the converse does not
+    hold, so a hash only selects cache entries to verify.
+    """
+    directed = graph.is_directed()
+    labels = {node: _digest(node_signature(data)) for node, data in graph.nodes(data=True)}
+    for _ in range(iterations):
+        labels = {node: _digest((labels[node],
+                                 sorted(f"{_edge_label(data)}>{labels[nbr]}" for nbr, data in graph.adj[node].items()),
+                                 sorted(f"{_edge_label(data)}<{labels[nbr]}" for nbr, data in graph.pred[node].items()) if directed else []))
+                  for node in graph}
+    return _digest((directed, graph.number_of_edges(), sorted(labels.values())), size=16)
+
+def _same_node(data1, data2):
+    return node_signature(data1) == node_signature(data2)
+
+def _same_edge(data1, data2):
+    return _edge_label(data1) == _edge_label(data2)
+
+def _positional_mapping(representative, graph):
+    """
+    Node i of the representative -> node i of graph, if that is an isomorphism that also keeps every adjacency in the
+    same order: then the analyses would have produced exactly the remapped results (same iteration order).
+    """
+    mapping = dict(zip(representative, graph))
+    views = [(representative.adj, graph.adj)] + ([(representative.pred, graph.pred)] if graph.is_directed() else [])
+    for node, other in mapping.items():
+        if not _same_node(representative.nodes[node], graph.nodes[other]):
+            return None
+        for rep_adj, adj in views:
+            if [mapping[nbr] for nbr in rep_adj[node]] != list(adj[other]):
+                return None
+            if not all(_same_edge(data, adj[other][mapping[nbr]]) for nbr, data in rep_adj[node].items()):
+                return None
+    return mapping
+
+def _isomorphism(representative, graph):
+    matcher_type = nx.algorithms.isomorphism.DiGraphMatcher if graph.is_directed() else nx.algorithms.isomorphism.GraphMatcher
+    matcher = matcher_type(representative, graph, node_match=_same_node, edge_match=_same_edge)
+    return dict(matcher.mapping) if matcher.is_isomorphic() else None
+
+def _resolve(graph):
+    """ Cache entry of graph's shape and the verified mapping representative node -> graph node (a new entry on a miss). """
+    shape = (graph.number_of_nodes(), graph.number_of_edges())
+    resolved = _RESOLVED.get(graph)
+    if resolved is not None and resolved[0] == shape:
+        return resolved[1], resolved[2]
+    key = structure_hash(graph)
+    entries = STRUCTURE_CACHE.get(key, [])
+    for entry in entries:
+        representative = entry['graph']
+        if (representative.number_of_nodes(), representative.number_of_edges()) != shape or representative.is_directed() != graph.is_directed():
+            continue
+        mapping = _positional_mapping(representative, graph)
+        if mapping is not None:
+            STRUCTURE_STATS["ordered_hits"] += 1
+        else:
+            mapping = _isomorphism(representative, graph)
+        if mapping is not None:
+            STRUCTURE_STATS["hits"] += 1
+            break
+    else:
+        # Same hash without an isomorphism is a WL collision: the graph gets its own entry
+        STRUCTURE_STATS["collisions" if entries else "misses"] += 1
+        entry = {'graph': graph.copy(), 'results': {}}
+        mapping = {node: node for node in graph}
+        STRUCTURE_CACHE.setdefault(key, []).append(entry)
+        while len(STRUCTURE_CACHE) > STRUCTURE_CACHE_SIZE:
+            del STRUCTURE_CACHE[next(iter(STRUCTURE_CACHE))]
+    _RESOLVED[graph] = (shape, entry, mapping)
+    return entry, mapping
+
+def cached_analysis(graph, name, analyze):
+    """
+    Structural analysis of graph through the cache: analyze(graph) returns a list of (tag, nodes) items, where nodes is
+    a tuple of graph nodes and tag holds everything else. Graphs of the same shape (isomorphic over node types and
+    edge labels, verified exactly on every hit) share one analysis, remapped onto their own nodes. A hit returns the
+    same structures a direct run would find, but possibly listed (or, for cycles and cliques, ordered) differently:
+    networkx orders them by node hashing and adjacency order, which the shape does not fix. analyze must only depend
+    on the shape; exceptions of analyze propagate and nothing is cached.
+    """
+    if not isinstance(graph, (nx.Graph, nx.DiGraph)) or graph.is_multigraph():
+        return analyze(graph)
+    entry, mapping = _resolve(graph)
+    results = entry['results']
+    if name in results:
+        return [(tag, tuple(mapping[node] for node in nodes)) for tag, nodes in results[name]]
+    items = analyze(graph)
+    inverse = {other: node for node, other in mapping.items()}
+    results[name] = [(tag, tuple(inverse[node] for node in nodes)) for tag, nodes in items]
+    return items
+
+def structure_cache_info():
+    return {**STRUCTURE_STATS, "shapes": len(STRUCTURE_CACHE)}
@@ -3,6 +3,7 @@
 import sympy as sp
 from utils.sympy_helpers import get_field_obj
 from utils.general_helpers import prime_flag_is_true, prime_flag_is_false, annotate_error, all_ints_or_float
+from utils.prime_service import prime, nextprime
 
 def build_sympy_equation(parse_dict):
     """
@@ -170,7 +171,7 @@ def build_sympy_equation(parse_dict):
         elif op == 'prime_order':
             # Numeric order
             if lhs_obj[0] and all_ints_or_float(lhs_obj[0], order_obj[0]):
-                prime_val = sp.prime(int(order_obj[0]))
+                prime_val = prime(int(order_obj[0]))
                 primes_constraint = f'isprime({int(lhs[0])})'
                 eq = sp.Eq(lhs_obj[0], prime_val, evaluate=False)
                 result.update({'eq': eq, 'type': 'equation'})
@@ -179,7 +180,7 @@ def build_sympy_equation(parse_dict):
                 result['meta']['correct'] = correct
                 result['meta']['primality_constraint'] = primes_constraint
             if not lhs_obj[0] and all_ints_or_float(order_obj[0]):
-                prime_val = sp.prime(int(order_obj[0]))
+                prime_val = prime(int(order_obj[0]))
                 eq = sp.Eq(sp.Function("prime")(order_obj[0]), prime_val, evaluate=False)  # prime(n) = 11
                 result.update({'eq': eq, 'type': 'equation'})
                 result['meta'].update({'order': order_obj[0]})
@@ -256,9 +257,9 @@ def build_sympy_equation(parse_dict):
 
             # If both are numbers (not variables)
             if all_ints_or_float(lhs_obj[0], rhs):
-                is_nextprime = (sp.nextprime(rhs) == lhs)
-                primes_constraint = f'isprime({sp.nextprime(rhs)})'
-                eq = sp.Eq(lhs, sp.nextprime(rhs), evaluate=False)
+                is_nextprime = (nextprime(rhs) == lhs)
+                primes_constraint = f'isprime({nextprime(rhs)})'
+                eq = sp.Eq(lhs, nextprime(rhs), evaluate=False)
                 
                 result.update({'eq': eq, 'type': 'equation'})
                 result['meta'].update({ 'lhs': lhs, 'rhs': rhs, 'is_nextprime': is_nextprime})
@@ -276,10 +277,10 @@ def build_sympy_equation(parse_dict):
             n = lhs_obj[0]
             # If n is a number, give the nth prime (numeric result)
             if all_ints_or_float(n):
-                nth_prime = sp.prime(int(n))
+                nth_prime = prime(int(n))
                 eq = sp.Eq(sp.Function("prime")(n), nth_prime, evaluate=False)
                 primes_constraint = f'isprime({nth_prime})'
-                # sp.prime returns the nth prime (e.g., sp.prime(1) == 2)
+                # prime returns the nth prime (e.g., prime(1) == 2)
                 result.update({'eq': eq, 'type': 'equation'})
                 result['meta']['primality_constraint'] = primes_constraint
             # If n is a symbol (symbolic variable), just return the symbolic function (prime(n))
@@ -316,7 +317,7 @@ def build_sympy_equation(parse_dict):
                 vals = [int(x) for x in lhs_obj]
                 is_prime = all(prime_flag_is_true(x) for x in vals)
                 primes_constraint = [f'isprime({p})' for p in vals]
-                is_consecutive = all(vals[i] == sp.nextprime(vals[i-1]) for i in range(1, 4))
+                is_consecutive = all(vals[i] == nextprime(vals[i-1]) for i in range(1, 4))
                 expected = [vals[0], vals[0]+2, vals[0]+6, vals[0]+8]
                 eq = sp.Eq(tuple(vals), tuple(expected), evaluate=False)
                 is_expected = vals == expected
@@ -342,7 +343,7 @@ def build_sympy_equation(parse_dict):
                 vals = [int(x) for x in lhs_obj]
                 is_prime = all(prime_flag_is_true(x) for x in vals)
                 primes_constraint = [f'isprime({p})' for p in vals]
-                is_consecutive = all(vals[i] == sp.nextprime(vals[i - 1]) for i in range(1, 3))
+                is_consecutive = all(vals[i] == nextprime(vals[i - 1]) for i in range(1, 3))
                 spacing_valid = all((vals[i] - vals[i - 1]) <= 6 for i in range(1, 3))
                 # Tuple equality
                 eq_tuple = sp.Eq(tuple(vals), tuple(vals), evaluate=False)
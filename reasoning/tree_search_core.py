@@ -108,6 +108,8 @@ class CallAction:
         - state: dict, should include 'reasoner' (instance), and may have 'rhs'
         Returns: (graph, state, result_str)
         """
+    __slots__ = ('graph', 'state', 'display', 'reasoner')
+
     def __init__(self, graph, state, display):
         self.graph = graph
         self.state = state
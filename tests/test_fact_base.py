@@ -0,0 +1,45 @@
+# tests/test_fact_base.py
+
+import sympy as sp
+from verification.fact_base import FactBase
+
+x, y = sp.symbols('x y')
+TRUE = ("verified", 1.0, "True")
+
+
+def test_equivalent_formula_hits_the_exact_index():
+    facts = FactBase()
+    facts.record(sp.Eq(sp.Add(4, 6, evaluate=False), 10, evaluate=False), 'eq', TRUE)
+    explanation, confidence, verdict = facts.lookup(sp.Eq(sp.Add(6, 4, evaluate=False), 10, evaluate=False), 'eq')
+    assert (confidence, verdict) == (1.0, "True")
+    assert explanation.startswith("Known fact (equivalent to")
+    assert facts.stats["equivalent_hits"] == 1
+
+
+def test_instance_of_a_symbolic_fact_inherits_its_verdict():
+    facts = FactBase()
+    facts.record(sp.Eq(sp.sin(x)**2 + sp.cos(x)**2, 1), 'eq', TRUE)
+    explanation, _, verdict = facts.lookup(sp.Eq(sp.sin(3*y)**2 + sp.cos(3*y)**2, 1), 'eq')
+    assert verdict == "True"
+    assert "instance of" in explanation
+    assert facts.stats["instance_hits"] == 1
+
+
+def test_non_matching_formulas_miss():
+    facts = FactBase()
+    facts.record(sp.Eq(sp.Add(4, 6, evaluate=False), 10, evaluate=False), 'eq', TRUE)
+    facts.record(sp.Eq(sp.sin(x)**2 + sp.cos(x)**2, 1), 'eq', TRUE)
+    assert facts.lookup(sp.Eq(sp.Add(6, 5, evaluate=False), 10, evaluate=False), 'eq') is None
+    # x bound inconsistently
+    assert facts.lookup(sp.Eq(sp.sin(y)**2 + sp.cos(x)**2, 1), 'eq') is None
+    # Same formula under another op
+    assert facts.lookup(sp.Eq(sp.Add(6, 4, evaluate=False), 10, evaluate=False), 'divides') is None
+    assert facts.stats["equivalent_hits"] == facts.stats["instance_hits"] == 0
+
+
+def test_only_decided_verdicts_are_stored():
+    facts = FactBase()
+    facts.record(sp.Eq(x**2, 4), 'eq', ("timed out", 0.0, "timeout"))
+    facts.record(sp.Eq(x + 1, 3), 'eq', ("symbolic", 0.5, "symbolic"))
+    assert len(facts) == 0
+    assert facts.lookup(sp.Eq(x**2, 4), 'eq') is None
@@ -0,0 +1,25 @@
+# tests/test_isolating_solver.py
+
+import sympy as sp
+from reasoning import isolating_solver
+from reasoning.isolating_solver import isolate, SHAPE_CACHE, SOLVER_STATS
+
+x = sp.Symbol('x')
+
+
+def test_isolate_matches_solve():
+    for eq in (sp.Eq(3*x + 5, 11), sp.Eq(7*x - 2, 4), sp.Eq(x**2, 9), sp.Eq(2*x**3, 54)):
+        assert isolate(eq, x) == sp.solve(eq, x)[0]
+
+
+def test_shape_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(isolating_solver, "ISOLATE_SHAPE_CACHE_SIZE", 3)
+    SHAPE_CACHE.clear()
+    evictions = SOLVER_STATS["shape_evictions"]
+    for power in range(1, 8):
+        eq = sp.Eq(x**power + 1, 2)
+        assert isolate(eq, x) == sp.solve(eq, x)[0]
+    assert len(SHAPE_CACHE) == 3
+    assert SOLVER_STATS["shape_evictions"] == evictions + 4
+    # The most recently used shapes are the ones kept
+    assert (isolating_solver.equation_shape((x**7 + 1 - 2).doit())[0], x) in SHAPE_CACHE
@@ -0,0 +1,56 @@
+# tests/test_prime_service.py
+
+import pytest
+import sympy as sp
+from utils.prime_service import PrimeTable, lucy_primepi, nth_prime
+
+MAX_LIMIT = 10**4 # small bound, so both sides of the table boundary are cheap to check
+
+
+@pytest.fixture
+def table():
+    return PrimeTable(path=None, min_limit=1000, max_limit=MAX_LIMIT)
+
+
+def test_isprime_across_the_boundary(table):
+    for n in list(range(-2, 50)) + list(range(MAX_LIMIT - 100, MAX_LIMIT + 100)) + [10**12 + 39, 10**12 + 41]:
+        assert table.isprime(n) == sp.isprime(n), n
+
+
+def test_nextprime_across_the_boundary(table):
+    for n in [0, 1, 2, 997, 1000, MAX_LIMIT - 30, MAX_LIMIT - 1, MAX_LIMIT, 10**9]:
+        assert table.nextprime(n) == sp.nextprime(n), n
+
+
+def test_primepi_across_the_boundary(table):
+    for x in [0, 1, 2, 3, 100, 1000, 1001, 1999, 2000, MAX_LIMIT - 1, MAX_LIMIT, MAX_LIMIT + 1, 10**5, 10**6 + 3]:
+        assert table.primepi(x) == sp.primepi(x), x
+    assert table.limit <= MAX_LIMIT
+
+
+def test_prime_across_the_boundary(table):
+    last = sp.primepi(MAX_LIMIT)
+    for nth in [1, 2, 168, 169, last - 1, last, last + 1, 5000, 20000]:
+        assert table.prime(nth) == sp.prime(nth), nth
+    with pytest.raises(ValueError):
+        table.prime(0)
+
+
+def test_table_grows_by_doubling(table):
+    assert table.isprime(499)
+    assert table.limit == 1000 # min_limit
+    assert table.isprime(1009)
+    assert table.limit == 2000
+    assert not table.isprime(MAX_LIMIT)
+    assert table.limit == MAX_LIMIT
+    assert list(table.primes) == list(sp.primerange(2, MAX_LIMIT + 1))
+
+
+@pytest.mark.parametrize("x", [2, 10, 97, 1000, 12345, 10**6, 10**7 + 19])
+def test_lucy_primepi(x):
+    assert lucy_primepi(x) == sp.primepi(x)
+
+
+@pytest.mark.parametrize("nth", [1, 2, 10, 1000, 78498, 78499, 10**5 + 7])
+def test_nth_prime(nth):
+    assert nth_prime(nth) == sp.prime(nth)
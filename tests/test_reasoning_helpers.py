@@ -0,0 +1,24 @@
+# tests/test_reasoning_helpers.py
+
+import pytest
+import sympy as sp
+from utils.reasoning_helpers import prime_gap_lookup, exclusion_zone_lookup
+
+
+@pytest.mark.parametrize("x, y", [(89, 97), (97, 89), (7, 13), (2, 3), (10**12 + 39, 10**12 + 61), (10**12 + 39, 10**12 + 63)])
+def test_consecutive_primes(x, y):
+    lo, hi = sorted((x, y))
+    expected = sp.isprime(lo) and sp.isprime(hi) and sp.nextprime(lo) == hi
+    assert prime_gap_lookup(x, y, None)["consecutive"] == expected
+
+
+def test_exclusion_zone_count():
+    lookup = exclusion_zone_lookup(97)
+    assert lookup["zone"] == (2, 192)
+    assert lookup["primes_in_zone"] == sp.primepi(192)
+
+
+def test_exclusion_zone_count_is_skipped_past_the_table():
+    lookup = exclusion_zone_lookup(10**12)
+    assert lookup["is_prime"] is False
+    assert lookup["primes_in_zone"] is None
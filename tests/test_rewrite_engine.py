@@ -0,0 +1,44 @@
+# tests/test_rewrite_engine.py
+
+import pytest
+import sympy as sp
+from config.settings import REWRITE_MAX_CANDIDATES
+from reasoning.rewrite_engine import expression_rewrites
+
+x, y = sp.symbols('x y')
+
+CASES = [
+    x + 6,
+    x + y,
+    x * y,
+    (x + 1) * (x + 2),
+    x**2 + 2*x*y + y**2,
+    sp.Mod(x + y, 7, evaluate=False),
+]
+
+
+@pytest.mark.parametrize("expr", CASES, ids=str)
+def test_rewrites_are_distinct_and_differ_from_input(expr):
+    original = sp.srepr(expr)
+    for group, terms in expression_rewrites(expr).items():
+        keys = [sp.srepr(term) for term in terms]
+        assert original not in keys, group
+        assert len(keys) == len(set(keys)), group
+        assert len(terms) <= REWRITE_MAX_CANDIDATES
+
+
+def test_real_rewrites_are_kept():
+    assert sp.srepr((x + y)**2) in {sp.srepr(t) for t in expression_rewrites(x**2 + 2*x*y + y**2)['factor']}
+    assert sp.srepr(x**2 + 3*x + 2) in {sp.srepr(t) for t in expression_rewrites((x + 1) * (x + 2))['expand']}
+    assert len(expression_rewrites(sp.Mod(x + y, 7, evaluate=False))['modular']) == 1
+
+
+def test_binary_nodes_have_no_rearrangement():
+    # Swapping the operands gives the same srepr: the commutative plugin swaps them itself
+    assert expression_rewrites(x + y)['rearrange'] == ()
+    assert expression_rewrites(x * y)['rearrange'] == ()
+    assert len(expression_rewrites(x + y + 3)['rearrange']) == REWRITE_MAX_CANDIDATES
+
+
+def test_large_powers_are_not_expanded():
+    assert expression_rewrites((x + 1)**200)['expand'] == ()
@@ -0,0 +1,35 @@
+# tests/test_verification_executor.py
+
+import sympy as sp
+from verification.verification_executor import VerificationExecutor
+
+x, y, z = sp.symbols('x y z')
+FAST = (sp.Eq(sp.Add(4, 6, evaluate=False), 10, evaluate=False), 'eq')
+SLOW = (sp.Eq(sp.expand((x + y + z)**20), (x + y + z)**20, evaluate=False), 'eq') # seconds of simplify
+
+
+def test_timeout_kills_and_replaces_the_worker():
+    with VerificationExecutor(workers=1, timeout=0.5) as executor:
+        assert executor.verify_many([FAST])[0][2] == "True"
+        first = executor.workers[0].process
+        slow, fast = executor.verify_many([SLOW, FAST])
+        assert slow[2] == "timeout"
+        # The single worker was killed on the deadline: the next candidate ran on its replacement
+        assert fast[2] == "True"
+        assert executor.stats["timeouts"] == 1
+        assert not first.is_alive()
+        assert executor.workers[0].process is not first
+
+
+def test_closing_a_stream_early_drops_busy_workers():
+    with VerificationExecutor(workers=2, timeout=30) as executor:
+        stream = executor.verify_iter([FAST, SLOW])
+        task_id, result = next(stream)
+        assert (task_id, result[2]) == (0, "True")
+        busy = [w.process for w in executor.workers if w.busy]
+        assert busy
+        stream.close()
+        assert not any(w.busy for w in executor.workers)
+        assert all(not process.is_alive() for process in busy)
+        # The executor stays usable: a fresh worker replaces the dropped one
+        assert executor.verify_many([FAST, FAST]) == [executor.verify(*FAST)] * 2
@@ -1,12 +1,15 @@
 # utils/cache_helpers.py
 
 import os
+import math
 import pickle
+import hashlib
 import numpy as np
 from time import time
-from config.settings import cache_dir, embedding_cache_file
+from config.settings import cache_dir, embedding_cache_file, CANDIDATE_FILTER_FILE, CANDIDATE_FILTER_CAPACITY, CANDIDATE_FILTER_FP_RATE
 
 CACHE_VERSION = "0.2.0"
+FILTER_VERSION = "1.0.0"
 DEFAULT_TTL = 60 * 60 * 24 # time-to-live (60 * 60 * 24 is 1 day (in seconds))
 
 def default_key(text):
@@ -133,4 +136,117 @@ class DiskCache:
         self.cache = {}
         self.embs = {}
         if os.path.exists(self.cache_path):
-            os.remove(self.cache_path)
\ No newline at end of file
+            os.remove(self.cache_path)
+
+class BloomFilter:
+    """
+    Bloom filter over string keys: a packed bit array of num_bits bits and num_hashes positions per key (double
+    hashing of a blake2b digest). Sized for capacity keys at false-positive rate fp_rate; never gives false negatives.
+    Filters with the same parameters merge with update() (bitwise OR).
+    """
+    def __init__(self, capacity, fp_rate):
+        if capacity < 1 or not 0 < fp_rate < 1:
+            raise ValueError("capacity should be >= 1 and 0 < fp_rate < 1")
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf8"), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return np.array([(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)], dtype=np.int64)
+
+    def add(self, key):
+        """ Add a key; returns False if it was (probably) already present. """
+        positions = self._positions(key)
+        masks = (1 << (positions & 7)).astype(np.uint8)
+        if np.all(self.bits[positions >> 3] & masks):
+            return False
+        np.bitwise_or.at(self.bits, positions >> 3, masks)
+        self.count += 1
+        return True
+
+    def __contains__(self, key):
+        positions = self._positions(key)
+        return bool(np.all(self.bits[positions >> 3] & (1 << (positions & 7)).astype(np.uint8)))
+
+    def update(self, other):
+        if (other.num_bits, other.num_hashes) != (self.num_bits, self.num_hashes):
+            raise ValueError("Bloom filters with different parameters cannot be merged")
+        self.bits |= other.bits
+        self.count += other.count
+
+    def estimated_fp_rate(self):
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def to_dict(self):
+        return {'capacity': self.capacity, 'fp_rate': self.fp_rate, 'num_bits': self.num_bits, 'num_hashes': self.num_hashes,
+                'count': self.count, 'bits': self.bits.tobytes()}
+
+    @classmethod
+    def from_dict(cls, data):
+        bloom = cls(data['capacity'], data['fp_rate'])
+        bloom.num_bits, bloom.num_hashes, bloom.count = data['num_bits'], data['num_hashes'], data['count']
+        bloom.bits = np.frombuffer(data['bits'], dtype=np.uint8).copy()
+        return bloom
+
+
+class CandidateFilter:
+    """
+    Persistent, memory-compact index of the candidates processed in earlier runs (canonical candidate keys in a Bloom
+    filter on disk, see utils.candidate_helpers.candidate_fingerprint).
+    - key in filter: the key was processed in an earlier run (false positives at about fp_rate, no false negatives)
+    - add(key): record a key processed in this run; it only becomes 'known' after save(), so a run never skips its
+      own candidates
+    The stored filter keeps the parameters it was built with; rebuild() (e.g. from stored results) resizes it.
+    """
+    def __init__(self, path=CANDIDATE_FILTER_FILE, capacity=CANDIDATE_FILTER_CAPACITY, fp_rate=CANDIDATE_FILTER_FP_RATE):
+        self.path = path
+        self.known = BloomFilter(capacity, fp_rate)
+        self.stats = {"lookups": 0, "known": 0}
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+            if isinstance(data, dict) and data.get('version') == FILTER_VERSION:
+                self.known = BloomFilter.from_dict(data['filter'])
+        self.seen = BloomFilter(self.known.capacity, self.known.fp_rate)
+
+    def __contains__(self, key):
+        self.stats["lookups"] += 1
+        if key in self.known:
+            self.stats["known"] += 1
+            return True
+        return False
+
+    def add(self, key):
+        if key is not None:
+            self.seen.add(key)
+
+    def save(self):
+        """ Merge the keys of this run into the stored filter and write it (atomically). """
+        self.known.update(self.seen)
+        self.seen = BloomFilter(self.known.capacity, self.known.fp_rate)
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({'version': FILTER_VERSION, 'filter': self.known.to_dict()}, f)
+        os.replace(tmp_path, self.path)
+
+    def rebuild(self, keys, capacity=None, fp_rate=None):
+        """ Replace the stored filter by one holding exactly keys (sized for at least twice their number) and save it. """
+        keys = [key for key in keys if key is not None]
+        capacity = capacity or max(self.known.capacity, 2 * len(keys))
+        self.known = BloomFilter(capacity, fp_rate or self.known.fp_rate)
+        for key in keys:
+            self.known.add(key)
+        self.seen = BloomFilter(self.known.capacity, self.known.fp_rate)
+        self.save()
+
+    def info(self):
+        return {**self.stats, "stored": self.known.count, "this_run": self.seen.count, "capacity": self.known.capacity,
+                "fp_rate": self.known.fp_rate, "estimated_fp_rate": round(self.known.estimated_fp_rate(), 6), "bytes": self.known.bits.nbytes}
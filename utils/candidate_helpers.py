@@ -1,7 +1,10 @@
 # utils/candidate_helpers.py
 
+import json
 import sympy as sp
 from utils.sympy_helpers import is_symbolic
+from utils.cache_helpers import CandidateFilter
+from config.settings import PROVENANCE_FILE
 from pre_trained.novelty_classification import score_mathiness
 from reasoning.symbolic_tools import build_sympy_equation
 from models.graph_reasoner import graph_to_parse_dict
@@ -265,19 +268,102 @@ def make_candidate(record, derived_eq, method, str_eq=None, op_context=None, not
         cand['is_correct'] = correct
     return cand
 
-def enhance_candidates(candidate_list):
+def candidate_key(cand):
+    """
+    Dedup key of a candidate: (generation method, equation), where Eq(a, b) and Eq(b, a) share a key.
+    Error candidates have no key (None) since they are always kept.
+    """
+    if "error_stage" in cand:
+        return None
+    eq = cand.get('derived_eq')
+    method = cand.get('generation_method', '')
+    try:
+        if isinstance(eq, sp.Equality):
+            return (method, frozenset([sp.srepr(eq.lhs), sp.srepr(eq.rhs)]))
+        elif isinstance(eq, sp.Basic):
+            return (method, sp.srepr(eq))
+    except Exception:
+        pass
+    return (method, str(eq))
+
+def candidate_fingerprint(cand):
+    """
+    Run-independent key of a candidate for the persistent candidate filter: (generation method, printed sides), where
+    Eq(a, b) and Eq(b, a) share a key. Built from the printed equation, which is what stored results keep, so the
+    filter can be rebuilt from them. None for error candidates.
+    """
+    if "error_stage" in cand:
+        return None
+    return _printed_fingerprint(cand.get('generation_method', ''), str(cand.get('derived_eq')))
+
+def _printed_fingerprint(method, printed):
+    # str(Eq(a, b)) is 'Eq(a, b)': split the sides at the top-level comma
+    if printed.startswith("Eq(") and printed.endswith(")"):
+        depth = 0
+        for i, char in enumerate(printed[3:-1], start=3):
+            depth += char in "([{"
+            depth -= char in ")]}"
+            if char == "," and depth == 0:
+                return repr((method, sorted([printed[3:i].strip(), printed[i + 1:-1].strip()])))
+    return repr((method, printed))
+
+def is_known_candidate(cand, known):
+    """ Whether the candidate is in known (a CandidateFilter of candidates processed in earlier runs, or None). """
+    if known is None:
+        return False
+    fingerprint = candidate_fingerprint(cand)
+    return fingerprint is not None and fingerprint in known
+
+def stored_fingerprints(paths):
+    """
+    Candidate fingerprints from stored results, to rebuild the candidate filter: provenance logs (JSON lines with a
+    'key') and JSON result files (lists of candidate dicts with the printed 'derived_eq').
+    """
+    for path in paths:
+        try:
+            with open(path) as f:
+                if path.endswith(".json"):
+                    entries = json.load(f)
+                else:
+                    entries = [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError):
+            continue
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            if entry.get('key'):
+                yield entry['key']
+            elif entry.get('derived_eq') is not None:
+                yield _printed_fingerprint(entry.get('generation_method', ''), str(entry['derived_eq']))
+
+def rebuild_candidate_filter(paths=(PROVENANCE_FILE, "pipeline_results.json"), path=None, fp_rate=None):
+    """ Rebuild the persistent candidate filter from stored results (see stored_fingerprints) and save it. """
+    candidate_filter = CandidateFilter() if path is None else CandidateFilter(path)
+    candidate_filter.rebuild(stored_fingerprints(paths), fp_rate=fp_rate)
+    return candidate_filter
+
+def enhance_candidate(cand):
+    # ---- Run novelty classifier ----
+    string_formula = cand.get('str_eq') or str(cand.get('derived_eq'))
+    if string_formula:
+        novelty_res = score_mathiness(string_formula)
+        cand['novelty_label'] = novelty_res['novelty_label']
+        cand['novelty_conf'] = novelty_res['confidence']
+        cand['novelty_response'] = novelty_res['llm_response']
+    # ---- Graph roundtrip test ----
+    if 'graph' in cand and cand['graph'] is not None:
+        roundtrip_parse = graph_to_parse_dict(cand['graph'])
+        cand['graph_roundtrip_parse'] = roundtrip_parse
+        sympy2 = build_sympy_equation(roundtrip_parse)
+        cand['sympy_roundtrip'] = sympy2.get('eq') if sympy2 else None
+    return cand
+
+def enhance_candidates(candidate_list, known=None):
+    """
+    Novelty scoring and graph roundtrip of each candidate. known: optional CandidateFilter; candidates processed in
+    an earlier run are dropped instead of being scored again.
+    """
+    candidate_list = [cand for cand in candidate_list if not is_known_candidate(cand, known)]
     for cand in candidate_list:
-        # ---- Run novelty classifier ----
-        string_formula = cand.get('str_eq') or str(cand.get('derived_eq'))
-        if string_formula:
-            novelty_res = score_mathiness(string_formula)
-            cand['novelty_label'] = novelty_res['novelty_label']
-            cand['novelty_conf'] = novelty_res['confidence']
-            cand['novelty_response'] = novelty_res['llm_response']
-        # ---- Graph roundtrip test ----
-        if 'graph' in cand and cand['graph'] is not None:
-            roundtrip_parse = graph_to_parse_dict(cand['graph'])
-            cand['graph_roundtrip_parse'] = roundtrip_parse
-            sympy2 = build_sympy_equation(roundtrip_parse)
-            cand['sympy_roundtrip'] = sympy2.get('eq') if sympy2 else None
+        enhance_candidate(cand)
     return candidate_list
\ No newline at end of file
@@ -1,7 +1,10 @@
 # utils/general_helpers.py
 
+import queue
+import threading
 from collections.abc import Iterable
 import sympy as sp
+from utils.prime_service import isprime
 
 def handle_unregistered_action(graph, state):
     op = graph.graph.get('operation', None)
@@ -15,6 +18,50 @@ def annotate_error(stage, err, input_data=None):
         "input": str(input_data)[:400],  # preview
         "traceback": tb}
 
+def bounded_prefetch(iterable, maxsize):
+    """
+    Iterate over iterable in a background thread that runs at most maxsize items ahead of the consumer (bounded
+    queue), so producing and consuming overlap without buffering everything. Exceptions raised while producing are
+    re-raised to the consumer; closing the returned generator early stops the producer.
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    done = object()
+
+    def put(entry):
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((None, item)):
+                    return
+        except BaseException as e:
+            put((e, done))
+        else:
+            put((None, done))
+
+    threading.Thread(target=produce, daemon=True).start()
+
+    def consume():
+        try:
+            while True:
+                error, item = buffer.get()
+                if item is done:
+                    if error is not None:
+                        raise error
+                    return
+                yield item
+        finally:
+            stop.set()
+    return consume()
+
 def all_ints_or_float(*args):
     flat = []
     for a in args:
@@ -81,19 +128,19 @@ def graph_to_serializable(g):
 
 def prime_flag_is_true(val):
     """
-    Returns sp.isprime(val) if val can be interpreted as an integer, else True (unknown/assume candidate for prime).
+    Returns isprime(val) if val can be interpreted as an integer, else True (unknown/assume candidate for prime).
     """
     try:
-        return sp.isprime(int(val))
+        return isprime(int(val))
     except Exception:
         return True
     
 def prime_flag_is_false(val):
     """
-    Returns sp.isprime(val) if val can be interpreted as an integer, else True (unknown/assume candidate for prime).
+    Returns not isprime(val) if val can be interpreted as an integer, else False.
     """
     try:
-        return not sp.isprime(int(val))
+        return not isprime(int(val))
     except Exception:
         return False
     
@@ -0,0 +1,153 @@
+# utils/prime_constellations.py
+
+import threading
+from bisect import bisect_left
+import numpy as np
+from config.settings import CONSTELLATION_MIN_LIMIT, PRIME_TABLE_MAX_LIMIT
+from utils.prime_service import prime_table
+
+# Offsets of the members from the smallest one, for every admissible pattern of each constellation
+CONSTELLATION_PATTERNS = {
+    'twin_primes': ((0, 2),),
+    'triplet_primes': ((0, 2, 6), (0, 4, 6)),
+    'quadruplet_primes': ((0, 2, 6, 8),),
+}
+
+
+def _pattern_starts(primes, gaps, offsets):
+    """ Smallest members of the runs of consecutive primes whose gaps follow offsets. """
+    steps = np.diff(offsets)
+    count = len(gaps) - len(steps) + 1
+    if count <= 0:
+        return np.zeros(0, dtype=np.int64)
+    mask = np.ones(count, dtype=bool)
+    for k, step in enumerate(steps):
+        mask &= gaps[k:k + count] == step
+    return primes[:count][mask]
+
+
+class ConstellationTable:
+    """
+    Every twin pair, prime triplet and prime quadruplet with all members <= limit, kept as the sorted array of their
+    smallest members per pattern, plus the maximal prime gaps (each gap larger than every earlier one, with the prime it
+    follows). Built from the prime table in one NumPy pass: confirming a constellation is one binary search, and its
+    position in the list of all of them (3, 5) #1, (5, 7) #2, (11, 13) #3, ... comes with it.
+    Reasoner sizes it to its upper_bound; inputs past the bound extend it (doubling, up to max_limit).
+    """
+    def __init__(self, min_limit=CONSTELLATION_MIN_LIMIT, max_limit=PRIME_TABLE_MAX_LIMIT):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = 0
+        self.starts = {op: {offsets: np.zeros(0, dtype=np.int64) for offsets in patterns}
+                       for op, patterns in CONSTELLATION_PATTERNS.items()}
+        self._starts = self._views(self.starts)
+        self.gap_records = np.zeros(0, dtype=np.int64)
+        self.gap_primes = np.zeros(0, dtype=np.int64)
+        self._lock = threading.Lock()
+
+    def ensure(self, n):
+        """ Extends the tables to cover n (at least doubling their bound); False if n is past max_limit. """
+        if n <= self.limit:
+            return True
+        if n > self.max_limit:
+            return False
+        with self._lock:
+            if n <= self.limit:
+                return True
+            self._build(min(max(n, 2 * self.limit, self.min_limit), self.max_limit))
+        return True
+
+    @staticmethod
+    def _views(starts):
+        # memoryviews: bisect over them is much cheaper than np.searchsorted for a single value
+        return {op: {offsets: memoryview(arr) for offsets, arr in patterns.items()} for op, patterns in starts.items()}
+
+    def _build(self, limit):
+        table = prime_table()
+        table.ensure(limit)
+        primes = np.asarray(table.primes[:table.primepi(limit)], dtype=np.int64)
+        gaps = np.diff(primes)
+        starts = {op: {offsets: _pattern_starts(primes, gaps, offsets) for offsets in patterns}
+                  for op, patterns in CONSTELLATION_PATTERNS.items()}
+        records = np.flatnonzero(gaps > np.concatenate([[0], np.maximum.accumulate(gaps)[:-1]])) if len(gaps) else gaps
+        # Readers see either the old tables or the new ones, never a mix: limit is set last
+        self.starts, self._starts = starts, self._views(starts)
+        self.gap_records, self.gap_primes = gaps[records], primes[records]
+        self.limit = limit
+
+    def index(self, op, members):
+        """
+        1-based position of the constellation members (smallest first) among all constellations of op, 0 if members
+        are not one, None if it is past max_limit.
+        """
+        members = [int(m) for m in members]
+        if not self.ensure(members[-1]):
+            return None
+        start = members[0]
+        views = self._starts[op]
+        pattern_starts = views.get(tuple(m - start for m in members))
+        if pattern_starts is None:
+            return 0
+        pos = bisect_left(pattern_starts, start)
+        if pos == len(pattern_starts) or pattern_starts[pos] != start:
+            return 0
+        if len(views) == 1:
+            return pos + 1
+        # Constellations of the other patterns that start earlier
+        return 1 + sum(bisect_left(other, start) for other in views.values())
+
+    def matches(self, op, members):
+        """
+        Constellations of op agreeing with the known members (ints; None where a member is unknown), smallest first;
+        None if they are past max_limit. With no known member there is nothing to look up: [].
+        """
+        known = [(k, int(m)) for k, m in enumerate(members) if m is not None]
+        if not known or not self.ensure(max(m for _, m in known) + 8):
+            return None if known else []
+        found = []
+        for offsets in CONSTELLATION_PATTERNS[op]:
+            if len(offsets) != len(members):
+                continue
+            starts = {m - offsets[k] for k, m in known}
+            if len(starts) != 1:
+                continue
+            start = starts.pop()
+            pattern_starts = self._starts[op][offsets]
+            pos = bisect_left(pattern_starts, start)
+            if pos < len(pattern_starts) and pattern_starts[pos] == start:
+                found.append(tuple(start + offset for offset in offsets))
+        return sorted(found)
+
+    def contains(self, op, members):
+        """ Rows of the integer array members (one constellation per row, smallest member first) that are constellations of op. """
+        members = np.asarray(members, dtype=np.int64)
+        found = np.zeros(len(members), dtype=bool)
+        if not len(members) or not self.ensure(int(members.max())):
+            return found
+        offsets = members - members[:, :1]
+        for pattern, pattern_starts in self.starts[op].items():
+            rows = np.flatnonzero((offsets == np.array(pattern)).all(axis=1))
+            if len(rows) and len(pattern_starts):
+                pos = np.minimum(np.searchsorted(pattern_starts, members[rows, 0]), len(pattern_starts) - 1)
+                found[rows] = pattern_starts[pos] == members[rows, 0]
+        return found
+
+    def gap_record(self, gap):
+        """
+        (record, prime): the first maximal prime gap of at least gap, found after prime (so a gap of that size first
+        occurs at or before it); None if there is none below the tables' bound (they are not extended for it).
+        """
+        pos = int(np.searchsorted(self.gap_records, gap))
+        if pos == len(self.gap_records):
+            return None
+        return int(self.gap_records[pos]), int(self.gap_primes[pos])
+
+
+_TABLE = None
+
+def constellation_table():
+    """ The process's ConstellationTable, built on first use. """
+    global _TABLE
+    if _TABLE is None:
+        _TABLE = ConstellationTable()
+    return _TABLE
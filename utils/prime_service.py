@@ -0,0 +1,298 @@
+# utils/prime_service.py
+
+import os
+import threading
+from bisect import bisect_right
+from math import isqrt, log
+import numpy as np
+import sympy as sp
+from config.settings import PRIME_TABLE_FILE, PRIME_TABLE_MIN_LIMIT, PRIME_TABLE_MAX_LIMIT, PRIME_SEGMENT_SIZE
+
+TABLE_MAGIC = 0x454D5250 # b"PRME"
+TABLE_VERSION = 2
+HEADER_SIZE = 4 # uint32 words: magic, version, limit, number of primes; then the primes, then the odd-number bitset
+
+
+def _small_primes(limit):
+    """ Primes <= limit by a plain sieve (the base primes of the segmented one). """
+    sieve = np.ones(limit + 1, dtype=bool)
+    sieve[:2] = False
+    for p in range(2, isqrt(limit) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = False
+    return np.flatnonzero(sieve).astype(np.uint32)
+
+def odd_bitset(primes, limit):
+    """ Packed bits over the odd numbers up to limit (bit k: is 2k + 1 prime), as uint8 (little bit order). """
+    flags = np.zeros(limit // 2 + 1, dtype=bool)
+    flags[primes[1:] // 2] = True
+    return np.packbits(flags, bitorder='little')
+
+def segmented_sieve(lo, hi, base_primes, segment_size=PRIME_SEGMENT_SIZE):
+    """
+    Primes in (lo, hi] as a uint32 array (int64 once hi reaches 2**32), sieving one segment of odd numbers at a time.
+    base_primes must hold every prime <= isqrt(hi); memory stays O(segment_size) whatever the range.
+    """
+    dtype = np.uint32 if hi < 2**32 else np.int64
+    chunks = [np.array([2], dtype=dtype)] if lo < 2 <= hi else []
+    odd_base = [int(p) for p in base_primes[1:np.searchsorted(base_primes, isqrt(hi), side='right')]]
+    start = max(lo + 1, 3) | 1 # first odd number of the range
+    while start <= hi:
+        stop = min(start + segment_size, hi + 1) # segment [start, stop), start odd: index i is start + 2i
+        segment = np.ones((stop - start + 1) // 2, dtype=bool)
+        for p in odd_base:
+            if p * p >= stop:
+                break
+            first = max(p * p, (start + p - 1) // p * p)
+            if first % 2 == 0:
+                first += p
+            segment[(first - start) // 2::p] = False
+        chunks.append((start + 2 * np.flatnonzero(segment)).astype(dtype))
+        start = stop | 1
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=dtype)
+
+def lucy_primepi(x):
+    """
+    π(x) in O(x^(3/4)) time and O(√x) memory (Lucy Hedgehog's method), without listing the primes: S(v) = number of
+    primes <= v is kept for the O(√x) values v = x // i, starting at v - 1, and every prime p <= √x strikes its
+    multiples with S(v) -= S(v // p) - S(p - 1). Each round is one NumPy pass over the values v >= p².
+    """
+    if x < 2:
+        return 0
+    r = isqrt(x)
+    small = np.arange(-1, r, dtype=np.int64) # small[v] = S(v), v <= r
+    small[0] = 0
+    index = np.arange(1, r + 1, dtype=np.int64)
+    large = np.zeros(r + 1, dtype=np.int64) # large[i] = S(x // i), i <= r
+    large[1:] = x // index - 1
+    for p in range(2, r + 1):
+        if small[p] == small[p - 1]: # p was struck: not prime
+            continue
+        below = small[p - 1]
+        p2 = p * p
+        # Right-hand sides are computed before the assignment, so every update reads the previous round's S
+        ip = index[:min(r, x // p2)] * p
+        k = int(np.searchsorted(ip, r, side='right')) # x // (i p) is a large value while i p <= r
+        large[1:k + 1] -= large[ip[:k]] - below
+        large[k + 1:len(ip) + 1] -= small[x // ip[k:]] - below
+        if p2 <= r:
+            v = np.arange(p2, r + 1)
+            small[v] -= small[v // p] - below
+    return int(large[1])
+
+def nth_prime_bounds(nth):
+    """ (lower, upper) bounds of the nth prime: n (ln n + ln ln n - 1) < p_n < n (ln n + ln ln n) for n >= 6 (Rosser, Dusart). """
+    if nth < 6:
+        return 1, 13
+    base = log(nth) + log(log(nth))
+    return int(nth * (base - 1)), int(nth * base) + 1
+
+def nth_prime(nth, base_primes=None):
+    """
+    The nth prime by inverting π: π(x) at an estimate x of p_n (Cipolla's asymptotic, kept within nth_prime_bounds),
+    then a segmented sieve walks from x towards p_n one window at a time, counting primes. The bounds keep the search
+    to a few windows (the estimate is off by well under a percent for large n). base_primes must hold the primes up
+    to √(upper bound) if given.
+    """
+    if nth < 1:
+        raise ValueError("nth must be a positive integer; prime(1) == 2")
+    lower, upper = nth_prime_bounds(nth)
+    if nth < 6:
+        estimate = upper
+    else:
+        ln, lnln = log(nth), log(log(nth))
+        estimate = min(max(int(nth * (ln + lnln - 1 + (lnln - 2) / ln)), lower), upper)
+    if base_primes is None or len(base_primes) == 0 or int(base_primes[-1]) < isqrt(upper):
+        base_primes = _small_primes(isqrt(upper) + 1)
+    window = max(2**16, isqrt(estimate))
+    count = lucy_primepi(estimate)
+    if count >= nth: # p_n <= estimate: walk down
+        hi = estimate
+        while True:
+            lo = max(hi - window, 0)
+            primes = segmented_sieve(lo, hi, base_primes) # primes in (lo, hi]
+            if count - len(primes) < nth:
+                return int(primes[nth - (count - len(primes)) - 1])
+            count -= len(primes)
+            hi = lo
+    lo = estimate # p_n > estimate: walk up
+    while True:
+        primes = segmented_sieve(lo, lo + window, base_primes)
+        if count + len(primes) >= nth:
+            return int(primes[nth - count - 1])
+        count += len(primes)
+        lo += window
+
+
+class PrimeTable:
+    """
+    Every prime up to limit, as a sorted uint32 array (primes[i] is the (i + 1)th prime) and a bitset over the odd
+    numbers: isprime is one bit test, the nth prime an index, nextprime and π(x) one binary search. The table is
+    extended on demand by a segmented sieve (doubling its bound, up to max_limit) and saved to path; other processes
+    map that file read-only instead of sieving again (the pages are shared through the OS cache).
+    """
+    def __init__(self, path=PRIME_TABLE_FILE, min_limit=PRIME_TABLE_MIN_LIMIT, max_limit=PRIME_TABLE_MAX_LIMIT):
+        self.path = path
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self._set(0, np.zeros(0, dtype=np.uint32), np.zeros(1, dtype=np.uint8))
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """ Maps the saved table, if there is a valid one. """
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            data = np.memmap(self.path, dtype=np.uint32, mode='r')
+        except (OSError, ValueError):
+            return
+        if len(data) < HEADER_SIZE or data[0] != TABLE_MAGIC or data[1] != TABLE_VERSION:
+            return
+        limit, count = int(data[2]), int(data[3])
+        bits = data[HEADER_SIZE + count:].view(np.uint8)
+        if limit > self.limit and len(bits) >= (limit // 2 + 8) // 8:
+            self._set(limit, data[HEADER_SIZE:HEADER_SIZE + count], bits)
+
+    def _set(self, limit, primes, bits):
+        # memoryviews: indexing them (and bisect over them) is much cheaper than indexing the arrays
+        self.primes, self.bits = primes, bits
+        self._primes, self._bits = memoryview(primes), memoryview(bits)
+        # Published last: threads reading the table without the lock check limit first, and the arrays they then
+        # read are never older than it (the new ones only extend the old)
+        self.limit = limit
+
+    def _save(self):
+        """ Writes the table next to its path and renames it into place, so readers never see a partial file. """
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            header = np.array([TABLE_MAGIC, TABLE_VERSION, self.limit, len(self.primes)], dtype=np.uint32)
+            with open(tmp_path, "wb") as f:
+                header.tofile(f)
+                np.asarray(self.primes, dtype=np.uint32).tofile(f)
+                bits = np.asarray(self.bits, dtype=np.uint8)
+                np.concatenate([bits, np.zeros(-len(bits) % 4, dtype=np.uint8)]).tofile(f) # whole uint32 words
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass # read-only location: the table stays in memory
+
+    def ensure(self, n):
+        """ Extends the table to cover n (at least doubling its bound); False if n is past max_limit. """
+        if n <= self.limit:
+            return True
+        if n > self.max_limit:
+            return False
+        with self._lock:
+            if n <= self.limit:
+                return True
+            self._load() # another process may have sieved further already
+            if n <= self.limit:
+                return True
+            limit = min(max(n, 2 * self.limit, self.min_limit), self.max_limit)
+            base = self.primes if isqrt(limit) <= self.limit else _small_primes(isqrt(limit))
+            new = segmented_sieve(self.limit, limit, base)
+            primes = np.concatenate([np.asarray(self.primes), new]) if self.limit else new
+            self._set(limit, primes, odd_bitset(primes, limit))
+            self._save()
+        return True
+
+    def _reachable(self, n):
+        """
+        Whether prime and primepi should extend the table to n: within max_limit and at most doubling the table.
+        Past that they compute the answer instead (nth_prime, lucy_primepi), which is cheaper than sieving that far.
+        """
+        return n <= self.max_limit and n <= max(2 * self.limit, self.min_limit)
+
+    def isprime(self, n):
+        if n < 2:
+            return False
+        if not self.ensure(n):
+            return bool(sp.isprime(n))
+        if n % 2 == 0:
+            return n == 2
+        k = n >> 1
+        return bool(self._bits[k >> 3] >> (k & 7) & 1)
+
+    def nextprime(self, n):
+        """ Smallest prime > n. """
+        if n < 2:
+            return 2
+        while self.ensure(n + 1):
+            i = bisect_right(self._primes, n)
+            if i < len(self._primes):
+                return self._primes[i]
+            n = self.limit # no prime left in the table: extend past it
+        return int(sp.nextprime(n))
+
+    def prime(self, nth):
+        """ The nth prime, prime(1) == 2 (ValueError for nth < 1, as sympy.prime). """
+        if nth < 1:
+            raise ValueError("nth must be a positive integer; prime(1) == 2")
+        if nth > len(self._primes):
+            upper = nth_prime_bounds(nth)[1]
+            if self._reachable(upper):
+                self.ensure(upper)
+        if nth <= len(self._primes):
+            return self._primes[nth - 1]
+        return nth_prime(nth, self.primes)
+
+    def primepi(self, x):
+        """ π(x): number of primes <= x. """
+        if x < 2:
+            return 0
+        if x <= self.limit or (self._reachable(x) and self.ensure(x)):
+            return bisect_right(self._primes, x)
+        return lucy_primepi(x)
+
+    def first_primes(self, count):
+        """ The first count primes, as ints. """
+        if count < 1:
+            return []
+        last = self.prime(count)
+        if count <= len(self._primes):
+            return self._primes[:count].tolist()
+        return segmented_sieve(0, last, _small_primes(isqrt(last) + 1)).tolist()
+
+    def isprime_array(self, values):
+        """ Elementwise primality of an integer array: table lookups, sp.isprime past max_limit. """
+        values = np.asarray(values, dtype=np.int64)
+        result = np.zeros(values.shape, dtype=bool)
+        in_table = (values >= 2) & (values <= self.max_limit)
+        if in_table.any():
+            self.ensure(int(values[in_table].max()))
+            lookup = values[in_table]
+            k = lookup >> 1
+            odd_prime = (np.asarray(self.bits)[k >> 3] >> (k & 7).astype(np.uint8)) & 1
+            result[in_table] = np.where(lookup % 2 == 1, odd_prime == 1, lookup == 2)
+        for idx in zip(*np.nonzero(values > self.max_limit)):
+            result[idx] = sp.isprime(int(values[idx]))
+        return result
+
+
+_TABLE = None
+
+def prime_table():
+    """ The process's PrimeTable, mapped from PRIME_TABLE_FILE on first use. """
+    global _TABLE
+    if _TABLE is None:
+        _TABLE = PrimeTable()
+    return _TABLE
+
+# Drop-in replacements of sympy's isprime / nextprime / prime / primepi (ints in, ints out)
+def isprime(n):
+    return prime_table().isprime(int(n))
+
+def nextprime(n):
+    return prime_table().nextprime(int(n))
+
+def prime(nth):
+    return prime_table().prime(int(nth))
+
+def primepi(x):
+    return prime_table().primepi(int(x))
+
+def first_primes(count):
+    return prime_table().first_primes(int(count))
@@ -1,7 +1,7 @@
 # utils/reasoning_arithmetic.py
 
 from utils.general_helpers import check_template_args
-import sympy as sp
+from utils.prime_service import prime, first_primes
 
 @check_template_args(['x', 'result'])
 def equals_templates(x, result):
@@ -434,8 +434,8 @@ def prime_order_templates(order):
     elif order_str.isdigit():
         n = int(order_str)
         try:
-            p = sp.prime(n)
-            sequence_str = ", ".join(str(sp.prime(i)) for i in range(1, min(n+1,8)))
+            p = prime(n)
+            sequence_str = ", ".join(str(q) for q in first_primes(min(n, 7)))
         except Exception:
             p = "?"
             sequence_str = "2, 3, 5, 7, 11, ..."
@@ -498,9 +498,9 @@ def where_is_prime_templates(x):
     try:
         n_val = int(x)
         # Get the nth prime
-        prime_n = sp.prime(n_val)
+        prime_n = prime(n_val)
         # Show sequence up to n for context (first 10 only, at most)
-        sequence_str = ", ".join(str(sp.prime(i)) for i in range(1, min(n_val+1, 11)))
+        sequence_str = ", ".join(str(q) for q in first_primes(min(n_val, 10)))
         return {
             "formulas": [
                 f"prime({n_val}) = {prime_n}",
@@ -1,6 +1,46 @@
 # utils/reasoning_helpers.py
 
 from utils import reasoning_arithmetic
+from utils.sympy_helpers import concrete_int
+from utils.prime_service import isprime, nextprime, prime_table
+from utils.prime_constellations import constellation_table
+from models.graph_reasoner import graph_index
+
+def constellation_lookup(op, members):
+    """
+    Index lookup of a constellation claim in the constellation tables: with every member known, its position among
+    all constellations of op (0 if it is not one); otherwise the constellations that fit the known members.
+    """
+    values = [concrete_int(m) for m in members]
+    if None not in values:
+        return {"members": values, "index": constellation_table().index(op, sorted(values))}
+    return {"members": values, "matches": constellation_table().matches(op, values)}
+
+def prime_gap_lookup(x, y, gap):
+    """ Whether x, y are consecutive primes, and the first maximal prime gap of at least gap (index lookups in the tables). """
+    x, y, gap = concrete_int(x), concrete_int(y), concrete_int(gap)
+    lookup = {"consecutive": None, "record": None}
+    if x is not None and y is not None:
+        lo, hi = sorted((x, y))
+        lookup["consecutive"] = isprime(lo) and isprime(hi) and nextprime(lo) == hi
+        constellation_table().ensure(hi) # records up to the pair, past the reasoner's bound if need be
+    if gap is not None and gap > 0:
+        lookup["record"] = constellation_table().gap_record(gap)
+    return lookup
+
+def exclusion_zone_lookup(x):
+    """
+    Primality of x and the primes inside its exclusion zone [x - pez(x), x + pez(x)], by table lookups. The count is
+    only given within the prime table's max_limit (None past it: counting there takes seconds per call).
+    """
+    x = concrete_int(x)
+    if x is None or x < 2:
+        return None
+    pez = 2 * (x - 1) - x
+    lo, hi = x - pez, x + pez
+    table = prime_table()
+    count = table.primepi(hi) - table.primepi(lo - 1) if table.ensure(hi) else None
+    return {"is_prime": isprime(x), "zone": (lo, hi), "primes_in_zone": count}
 
 # ======== equals ========
 def reason_equals(graph, get_node_by_role):
@@ -127,7 +167,7 @@ def reason_twin_primes(graph, get_node_by_role):
     x = get_node_by_role('variable1')
     y = get_node_by_role('variable2')
     template = reasoning_arithmetic.twin_primes_templates(x, y)
-    return [{"pattern": "twin_primes", **template}]
+    return [{"pattern": "twin_primes", **template, "lookup": constellation_lookup("twin_primes", [x, y])}]
 
 # ======== prime_gap ========
 def reason_prime_gap(graph, get_node_by_role):
@@ -135,15 +175,15 @@ def reason_prime_gap(graph, get_node_by_role):
     y = get_node_by_role('variable2')
     result = get_node_by_role('result')
     template = reasoning_arithmetic.prime_gap_templates(x, y, result)
-    return [{"pattern": "prime_gap", **template}]
+    return [{"pattern": "prime_gap", **template, "lookup": prime_gap_lookup(x, y, result)}]
 
 # ======== prime_factors ========
 def reason_prime_factors(graph, get_node_by_role):
     result = get_node_by_role('result')
     # Accept any "variable" role (variable1, variable2, ...)
     factors = []
-    for n, attrs in graph.nodes(data=True):
-        role = attrs.get('role', '')
+    for n in graph_index(graph)['attrs'].get('role', ()):
+        role = graph.nodes[n]['role']
         if role.startswith('variable') and n != result:
             factors.append(n)
     template = reasoning_arithmetic.prime_factors_templates(result, factors)
@@ -163,8 +203,8 @@ def reason_is_not_prime(graph, get_node_by_role):
 
 # ======== prime_order ========
 def reason_prime_order(graph, get_node_by_role):
-    attr = next((attr for node, attr in graph.nodes(data=True) if 'prime_order' in attr), None)
-    prime_order = attr.get('prime_order') if attr else None
+    nodes = graph_index(graph)['attrs'].get('prime_order')
+    prime_order = graph.nodes[nodes[0]]['prime_order'] if nodes else None
     template = reasoning_arithmetic.prime_order_templates(prime_order)
     return [{"pattern": "prime_order", **template}]
 
@@ -189,7 +229,7 @@ def reason_quadruplet_primes(graph, get_node_by_role):
     d = get_node_by_role('variable4')
     x = [a, b, c, d]
     template = reasoning_arithmetic.quadruplet_primes_templates(x)
-    return [{"pattern": "quadruplet_primes", **template}]
+    return [{"pattern": "quadruplet_primes", **template, "lookup": constellation_lookup("quadruplet_primes", x)}]
 
 # ======== triplet_primes ========
 def reason_triplet_primes(graph, get_node_by_role):
@@ -198,7 +238,7 @@ def reason_triplet_primes(graph, get_node_by_role):
     c = get_node_by_role('variable3')
     x = [a, b, c]
     template = reasoning_arithmetic.triplet_primes_templates(x)
-    return [{"pattern": "triplet_primes", **template}]
+    return [{"pattern": "triplet_primes", **template, "lookup": constellation_lookup("triplet_primes", x)}]
 
 # ======== diff_of_primes ========
 def reason_diff_of_primes(graph, get_node_by_role):
@@ -212,7 +252,7 @@ def reason_prime_exclusion_zone(graph, get_node_by_role):
     x = get_node_by_role('variable1')
     result = get_node_by_role('result')
     template = reasoning_arithmetic.prime_exclusion_zone_templates(x, result)
-    return [{"pattern": "prime_exclusion_zone", **template}]
+    return [{"pattern": "prime_exclusion_zone", **template, "lookup": exclusion_zone_lookup(x)}]
 
 # ======== prime_exclusion_zone_range ========
 def reason_prime_exclusion_zone_range(graph, get_node_by_role):
@@ -220,14 +260,13 @@ def reason_prime_exclusion_zone_range(graph, get_node_by_role):
     result1 = get_node_by_role('result1')
     result2 = get_node_by_role('result2')
     template = reasoning_arithmetic.prime_exclusion_zone_range_templates(x, result1, result2)
-    return [{"pattern": "prime_exclusion_zone_range", **template}]
+    return [{"pattern": "prime_exclusion_zone_range", **template, "lookup": exclusion_zone_lookup(x)}]
 
 # ======== prime_exclusion_vals ========
 def reason_prime_exclusion_vals(graph, get_node_by_role):
-    for n, attr in graph.nodes(data=True):
-        order = attr.get('order')
-        local = attr.get('local')
+    attrs = graph_index(graph)['attrs']
+    order, local = (graph.nodes[attrs[key][-1]][key] if key in attrs else None for key in ('order', 'local'))
     x = get_node_by_role('variable1')
     result = get_node_by_role('result')
     template = reasoning_arithmetic.prime_exclusion_vals_templates(x, order, local, result)
-    return [{"pattern": "prime_exclusion_vals", **template}]
\ No newline at end of file
+    return [{"pattern": "prime_exclusion_vals", **template, "lookup": exclusion_zone_lookup(x)}]
\ No newline at end of file
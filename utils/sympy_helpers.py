@@ -1,10 +1,75 @@
 # utils/sympy_helpers.py
 
 import sympy as sp
+from threading import Lock
+from collections import OrderedDict
 from utils.general_helpers import annotate_error
+from config.settings import SIMPLIFY_MEMO_SIZE
 
 symbols = {}
 
+class SimplifyMemo:
+    """
+    Per-process bounded (LRU) memo of simplify/expand/factor results. It is not shared with the verification workers
+    (verification/verification_executor.py): each worker fills its own memo, which starts cold and is dropped when the
+    worker is recycled, so SIMPLIFY_MEMO's stats only count the calls made in this process.
+    Keys are (operation, expression); SymPy expressions hash and compare structurally, so
+    unevaluated forms such as 4 + 6 and 6 + 4 stay distinct. Non-SymPy inputs are computed without caching.
+    """
+    def __init__(self, maxsize=SIMPLIFY_MEMO_SIZE):
+        self.maxsize = maxsize
+        self.table = OrderedDict()
+        self.lock = Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def apply(self, kind, func, expr):
+        if not isinstance(expr, sp.Basic):
+            return func(expr)
+        key = (kind, expr)
+        with self.lock:
+            if key in self.table:
+                self.table.move_to_end(key)
+                self.stats["hits"] += 1
+                return self.table[key]
+            self.stats["misses"] += 1
+        result = func(expr)
+        with self.lock:
+            self.table[key] = result
+            if len(self.table) > self.maxsize:
+                self.table.popitem(last=False)
+                self.stats["evictions"] += 1
+        return result
+
+    def info(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {**self.stats, "size": len(self.table), "maxsize": self.maxsize, "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0}
+
+    def clear(self):
+        with self.lock:
+            self.table.clear()
+            self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+SIMPLIFY_MEMO = SimplifyMemo()
+
+def cached_simplify(expr):
+    return SIMPLIFY_MEMO.apply("simplify", sp.simplify, expr)
+
+def cached_expand(expr):
+    return SIMPLIFY_MEMO.apply("expand", sp.expand, expr)
+
+def cached_factor(expr):
+    return SIMPLIFY_MEMO.apply("factor", sp.factor, expr)
+
+def within_budget(expr, max_ops, max_degree):
+    """
+    Cheap size guard before SymPy work that runs outside the verification deadline (in the parent process): at most
+    max_ops operations (sp.count_ops) and no integer power above max_degree (so (x + 1)**500 is never expanded
+    and 7**10**9 never evaluated).
+    """
+    if sp.count_ops(expr) > max_ops:
+        return False
+    return all(abs(p.exp) <= max_degree for p in expr.atoms(sp.Pow) if p.exp.is_Integer)
+
 # Convert all variable names/numbers to sympy objects
 def get_sp_obj(name):
     # Try to convert to number, else symbol
@@ -40,6 +105,26 @@ def is_symbolic(x):
     # Returns True if x is a sympy symbol or something likely variable
     return (hasattr(x, "is_Symbol") and x.is_Symbol) or (isinstance(x, str) and not str(x).isdigit())
 
+def concrete_int(value):
+    """
+    Integer value of a Python/SymPy number or closed numeric expression (e.g. Abs(-2), unevaluated 4 + 6), else None.
+    Integral floats count as integers; booleans do not.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    if isinstance(value, sp.Basic) and not value.free_symbols:
+        try:
+            value = value.doit()
+        except Exception:
+            return None
+        if value.is_Integer or (value.is_Float and float(value).is_integer()):
+            return int(value)
+    return None
+
 def canonicalize_value(value):
     """
     Forces all values used as node IDs to be SymPy objects:
@@ -78,7 +163,7 @@ def is_trivial_equation(eq):
         # Otherwise, default: try subtracting and simplifying
         # SymPy's canonical test: x == x or numbers equal
         try:
-            return sp.simplify(lhs - rhs) == 0
+            return cached_simplify(lhs - rhs) == 0
         except Exception as e:
             annotate_error("is_trivial_equation", e, str(eq))
             # If not subtractable but strings equal, allow that as fallback
@@ -6,11 +6,8 @@ import networkx as nx
 from utils.sympy_helpers import clean_attributes
 
 def visualize_global_math_graph(scratchpad, fname="math_knowledge_graph.png"):
-    # All graphs as networkx objects
-    global_graph = nx.DiGraph()
-    for rec in scratchpad.get_all():
-        g = rec['graph']
-        global_graph = nx.compose(global_graph, g)
+    # All graphs as networkx objects (the scratchpad keeps them composed)
+    global_graph = scratchpad.global_graph
     plt.figure(figsize=(15,12))
     pos = nx.spring_layout(global_graph, seed=42)
     nx.draw(global_graph, pos, with_labels=True, node_color="skyblue", font_size=10, edge_color="gray")
@@ -34,10 +31,8 @@ def graph_candidates_across_sentences(candidates):
             print(f"Sent #{step}: {derived_eq}")
 
 def build_global_graph(global_graph, scratchpad):
-
-    for rec in scratchpad.get_all():
-        g = rec['graph']
-        global_graph = nx.compose(global_graph, g)
+    # One compose with the scratchpad's knowledge graph (also a copy: clean_attributes edits it in place)
+    global_graph = nx.compose(global_graph, scratchpad.global_graph)
     #for n in global_graph.nodes():
         #global_graph.nodes[n]['label'] = str(n)
     clean_attributes(global_graph)
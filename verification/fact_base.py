@@ -0,0 +1,101 @@
+# verification/fact_base.py
+
+import sympy as sp
+from config.settings import FACT_KEY_MAX_OPS, FACT_KEY_MAX_DEGREE
+from utils.sympy_helpers import cached_expand, within_budget
+from verification.integer_verifier import INTEGER_OPS
+
+# Only decided verdicts become facts; 'symbolic', 'timeout', 'error' etc. are re-verified every time
+FACT_VERDICTS = {"True", "False"}
+
+
+def _canonical_side(expr):
+    """
+    Evaluated, expanded form of one side of an equation, so 4 + 6, 6 + 4 and 10 share a key. None past the size
+    guard: keys are computed in the parent process, where a runaway doit/expand would not be stopped by any deadline.
+    """
+    if not within_budget(expr, FACT_KEY_MAX_OPS, FACT_KEY_MAX_DEGREE):
+        return None
+    try:
+        return cached_expand(expr.doit())
+    except Exception:
+        return expr
+
+def _bind(pattern, expr, binding):
+    """
+    Structural matching of a fact (pattern) against a formula: each free symbol of the fact binds consistently
+    to a subexpression of the formula, every other node has to match exactly (same function, arguments in order).
+    """
+    if pattern.is_Symbol:
+        if pattern in binding:
+            return binding[pattern] == expr
+        binding[pattern] = expr
+        return True
+    if pattern.is_Atom or expr.is_Atom:
+        return pattern == expr
+    if pattern.func != expr.func or len(pattern.args) != len(expr.args):
+        return False
+    return all(_bind(p, e, binding) for p, e in zip(pattern.args, expr.args))
+
+
+class FactBase:
+    """
+    In-memory fact base of formulas verified 'True'/'False' during a run.
+    - exact index: (op, canonical lhs, canonical rhs) -> fact; equivalent formulas resolve by dictionary lookup
+    - symbol index: facts with free symbols, keyed by (op, lhs function, rhs function); a formula obtained by
+      substituting the free symbols of such a fact (a direct instance) inherits its verdict, since symbolic
+      'True'/'False' verdicts hold for every value of the symbols (every integer value for the integer ops)
+    Formulas past the size guard of _canonical_side have no key: they are never stored, and only the (structural)
+    instance lookup applies to them. Hit counts are kept in stats.
+    """
+    def __init__(self):
+        self.exact = {}
+        self.by_symbols = {}
+        self.stats = {"lookups": 0, "equivalent_hits": 0, "instance_hits": 0, "facts": 0}
+
+    @staticmethod
+    def canonical(eq, op):
+        """ Exact-index key of an equation, None if a side is too large to canonicalize safely. """
+        lhs = _canonical_side(eq.lhs)
+        rhs = _canonical_side(eq.rhs) if lhs is not None else None
+        return (op, lhs, rhs) if rhs is not None else None
+
+    def lookup(self, eq, op):
+        """ Verdict (explanation, confidence, verdict) of a known equivalent fact or instance, else None. """
+        if not isinstance(eq, sp.Equality):
+            return None
+        self.stats["lookups"] += 1
+        key = self.canonical(eq, op)
+        fact = self.exact.get(key) if key is not None else None
+        if fact is not None:
+            self.stats["equivalent_hits"] += 1
+            fact_eq, (explanation, confidence, verdict) = fact
+            return f"Known fact (equivalent to {fact_eq}): {explanation}", confidence, verdict
+        for fact_eq, (explanation, confidence, verdict) in self.by_symbols.get((op, eq.lhs.func, eq.rhs.func), []):
+            binding = {}
+            if not _bind(sp.Tuple(fact_eq.lhs, fact_eq.rhs), sp.Tuple(eq.lhs, eq.rhs), binding):
+                continue
+            if op in INTEGER_OPS and any(value.is_integer is False for value in binding.values()):
+                continue
+            self.stats["instance_hits"] += 1
+            return f"Known fact (instance of {fact_eq} with {binding}): {explanation}", confidence, verdict
+        return None
+
+    def record(self, eq, op, result):
+        """ Store a verification result if it is a decided ('True'/'False') verdict on an equation. """
+        if not isinstance(eq, sp.Equality) or not isinstance(result, tuple) or len(result) != 3 or result[2] not in FACT_VERDICTS:
+            return
+        key = self.canonical(eq, op)
+        if key is None or key in self.exact:
+            return
+        self.exact[key] = (eq, result)
+        if eq.free_symbols:
+            self.by_symbols.setdefault((op, eq.lhs.func, eq.rhs.func), []).append((eq, result))
+        self.stats["facts"] += 1
+
+    def info(self):
+        hits = self.stats["equivalent_hits"] + self.stats["instance_hits"]
+        return {**self.stats, "hit_rate": round(hits / self.stats["lookups"], 4) if self.stats["lookups"] else 0.0}
+
+    def __len__(self):
+        return len(self.exact)
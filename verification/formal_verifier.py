@@ -1,10 +1,11 @@
 # verification/formal_verifier.py
 
 import sympy as sp
-from utils.sympy_helpers import is_trivial_equation
+from utils.sympy_helpers import is_trivial_equation, cached_simplify
 from sympy.core.relational import Equality
 from sympy.logic.boolalg import BooleanTrue
 from utils.general_helpers import annotate_error
+from verification.integer_verifier import verify_integer_relation
 
 def iterify(val):
     if isinstance(val, (tuple, list)):
@@ -18,7 +19,19 @@ def iterify(val):
 def explain_symbolic_verification(eq, scratchpad, op, previous_formulas=None):
     """
     Robust symbolic/formal verification for all pipeline math ops, including primes, quadruplets, etc.
+    previous_formulas: optional FactBase (verification/fact_base.py) of formulas already verified in this run.
+    Formulas equivalent to, or instances of, a known fact resolve by lookup; new True/False verdicts are recorded.
     """
+    if previous_formulas is not None:
+        known = previous_formulas.lookup(eq, op)
+        if known is not None:
+            return known
+    result = _verify_formula(eq, scratchpad, op)
+    if previous_formulas is not None:
+        previous_formulas.record(eq, op, result)
+    return result
+
+def _verify_formula(eq, scratchpad, op):
 
     if eq is None:
         return "Rejected: Formula is None", 0.0, "invalid"
@@ -40,9 +53,14 @@ def explain_symbolic_verification(eq, scratchpad, op, previous_formulas=None):
         # fallback
         return f"Formula is not a symbolic equation (type {type(eq).__name__}) not verifiable directly: {eq}", 0.25, "symbolic"
     
+    # --- Integer-domain fast path (divisible, divides, factor, remainder): no simplify/satisfiable needed
+    integer_result = verify_integer_relation(eq, op)
+    if integer_result is not None:
+        return integer_result
+
     # --- Step 3: Fast trivial/identity checks
-    simplified_lhs = sp.simplify(eq.lhs)
-    simplified_rhs = sp.simplify(eq.rhs)
+    simplified_lhs = cached_simplify(eq.lhs)
+    simplified_rhs = cached_simplify(eq.rhs)
     simplified_eq = sp.Eq(simplified_lhs, simplified_rhs)
     if is_trivial_equation(simplified_eq):
         return "Rejected: Formula is mathematically trivial (tautology or obvious equivalence)", 0.0, "trivial"
@@ -65,7 +83,7 @@ def explain_symbolic_verification(eq, scratchpad, op, previous_formulas=None):
             # eq: |a-b| = 2, primality status in meta
             if hasattr(eq, "lhs") and hasattr(eq, "rhs"):
                 try:
-                    diff = abs(sp.simplify(eq.lhs) - sp.simplify(eq.rhs))
+                    diff = abs(cached_simplify(eq.lhs) - cached_simplify(eq.rhs))
                     if diff == 2:
                         return "Twin prime condition met (difference is 2). Primality check is external.", 0.8, "likely_true"
                     else:
@@ -78,8 +96,8 @@ def explain_symbolic_verification(eq, scratchpad, op, previous_formulas=None):
         if op == "quadruplet_primes":
             # Form: (a, b, c, d) = (p, p+2, p+6, p+8)
             if hasattr(eq, "lhs") and hasattr(eq, "rhs"):
-                vals = [sp.simplify(x) for x in iterify(eq.lhs)]
-                expct = [sp.simplify(x) for x in iterify(eq.rhs)]
+                vals = [cached_simplify(x) for x in iterify(eq.lhs)]
+                expct = [cached_simplify(x) for x in iterify(eq.rhs)]
                 if len(vals) == 4 and all(isinstance(v, (sp.Integer, int, float)) for v in vals):
                     diffs = [vals[1] - vals[0], vals[2] - vals[1], vals[3] - vals[2]]
                     if diffs == [2,4,2]:
@@ -92,7 +110,7 @@ def explain_symbolic_verification(eq, scratchpad, op, previous_formulas=None):
         # Triplet Primes
         if op == "triplet_primes":
             if hasattr(eq, "lhs") and isinstance(eq.lhs, (tuple, list)) and len(eq.lhs) == 3:
-                vals = [sp.simplify(x) for x in iterify(eq.lhs)]
+                vals = [cached_simplify(x) for x in iterify(eq.lhs)]
                 diffs = [vals[1] - vals[0], vals[2] - vals[1]]
                 if (diffs == [2,4] or diffs == [4,2]):
                     return "Triplet prime spacing met ([2,4] or [4,2]).", 0.85, "True"
@@ -105,7 +123,7 @@ def explain_symbolic_verification(eq, scratchpad, op, previous_formulas=None):
             # eq: a + b = c, check if c equals (a+b), (primality test is up to caller)
             if hasattr(eq, "lhs") and hasattr(eq, "rhs"):
                 try:
-                    if sp.simplify(eq.lhs) + sp.simplify(eq.rhs) == eq.rhs:
+                    if cached_simplify(eq.lhs) + cached_simplify(eq.rhs) == eq.rhs:
                         return "Sum-of-two-primes relation satisfied.", 0.9, "True"
                 except Exception:
                     pass
@@ -116,7 +134,7 @@ def explain_symbolic_verification(eq, scratchpad, op, previous_formulas=None):
             # eq: |a-b| == k, check for positive integer output
             if hasattr(eq, "lhs") and hasattr(eq, "rhs"):
                 try:
-                    diff = abs(sp.simplify(eq.lhs) - sp.simplify(eq.rhs))
+                    diff = abs(cached_simplify(eq.lhs) - cached_simplify(eq.rhs))
                     if type(diff) in (int, sp.Integer) and diff > 0:
                         return f"Difference of primes yields a positive difference: {diff}.", 0.7, "True"
                 except Exception:
@@ -128,8 +146,8 @@ def explain_symbolic_verification(eq, scratchpad, op, previous_formulas=None):
             # eq: Mul(*vars) == rhs
             if hasattr(eq, "lhs") and hasattr(eq, "rhs"):
                 try:
-                    product = sp.simplify(sp.Mul(*eq.lhs, evaluate=False))
-                    if product == sp.simplify(eq.rhs):
+                    product = cached_simplify(sp.Mul(*eq.lhs, evaluate=False))
+                    if product == cached_simplify(eq.rhs):
                         return "Prime factors product equals the target number.", 0.9, "True"
                     else:
                         return f"Prime factors product not equal to target: {product} vs {eq.rhs}.", 0.2, "False"
@@ -142,8 +160,8 @@ def explain_symbolic_verification(eq, scratchpad, op, previous_formulas=None):
             # eq: |a-b|=gap
             if hasattr(eq, "lhs") and hasattr(eq, "rhs"):
                 try:
-                    gap = sp.simplify(eq.rhs)
-                    diff = abs(sp.simplify(eq.lhs[0]) - sp.simplify(eq.lhs[1]))
+                    gap = cached_simplify(eq.rhs)
+                    diff = abs(cached_simplify(eq.lhs[0]) - cached_simplify(eq.lhs[1]))
                     if diff == gap:
                         return f"Prime gap {gap} matches difference.", 0.9, "True"
                     else:
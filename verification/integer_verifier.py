@@ -0,0 +1,88 @@
+# verification/integer_verifier.py
+
+from math import gcd
+import sympy as sp
+from utils.sympy_helpers import concrete_int
+
+# Ops whose equations have the form Eq(Mod(a, m), r)
+INTEGER_OPS = {'divisible', 'divides', 'factor', 'remainder'}
+
+
+def _linear_form(expr):
+    """
+    ({symbol: coefficient}, constant) of an integer-linear expression such as 6*n + 1, else None.
+    Works on unevaluated forms without calling simplify/expand.
+    """
+    coeffs, const = {}, 0
+    for term in sp.Add.make_args(expr):
+        if not term.free_symbols:
+            value = concrete_int(term)
+            if value is None:
+                return None
+            const += value
+            continue
+        coeff, rest = term.as_coeff_Mul()
+        coeff = concrete_int(coeff)
+        if coeff is None:
+            return None
+        if rest.is_Symbol:
+            coeffs[rest] = coeffs.get(rest, 0) + coeff
+        elif rest.is_Add:
+            inner = _linear_form(rest)
+            if inner is None:
+                return None
+            for sym, c in inner[0].items():
+                coeffs[sym] = coeffs.get(sym, 0) + coeff * c
+            const += coeff * inner[1]
+        else:
+            return None
+    return coeffs, const
+
+def verify_integer_relation(eq, op):
+    """
+    Integer-domain verification of Eq(Mod(a, m), r) for the divisible/divides/factor/remainder ops.
+    - concrete a, m, r: decided with Python integer arithmetic (same sign convention as SymPy's Mod)
+    - a linear in integer symbols (e.g. 6*n + 1), concrete m and r: decided with linear congruence rules
+      (c1*x1 + ... + d = r (mod m) has integer solutions iff gcd(c1, ..., m) divides r - d)
+    Returns an (explanation, confidence, verdict) tuple, or None when the equation is outside this fragment.
+    """
+    if op not in INTEGER_OPS or not isinstance(eq, sp.Equality):
+        return None
+    lhs, rhs = eq.lhs, eq.rhs
+    if not isinstance(lhs, sp.Mod) and isinstance(rhs, sp.Mod):
+        lhs, rhs = rhs, lhs
+    if not isinstance(lhs, sp.Mod):
+        return None
+    dividend, modulus, residue = lhs.args[0], concrete_int(lhs.args[1]), concrete_int(rhs)
+    if modulus is None or residue is None:
+        return None
+    if any(sym.is_integer is False for sym in dividend.free_symbols):
+        return None
+    form = _linear_form(dividend)
+    if form is None:
+        return None
+    coeffs, const = form
+    shown = dividend if dividend.is_Atom else f"({dividend})"
+
+    if modulus == 0:
+        return f"Modulo by zero: {shown} mod 0 is undefined for op='{op}'", 0.0, "False"
+    if residue % modulus != residue:
+        return f"{residue} is not a possible remainder modulo {modulus} for op='{op}'", 0.0, "False"
+
+    # Terms whose coefficient is a multiple of the modulus do not affect the remainder
+    coeffs = {sym: c % modulus for sym, c in coeffs.items() if c % modulus}
+    if not coeffs:
+        value = const % modulus
+        if value == residue:
+            return f"LHS and RHS are equal in integer arithmetic for op='{op}' ({shown} mod {modulus} = {value})", 1.0, "True"
+        return f"LHS and RHS differ in integer arithmetic for op='{op}' ({shown} mod {modulus} = {value}, not {residue})", 0.0, "False"
+
+    g = gcd(*coeffs.values(), modulus)
+    if (residue - const) % g:
+        return f"No integer solution for op='{op}': gcd of coefficients and modulus ({g}) does not divide {residue - const}", 0.0, "False"
+    if len(coeffs) == 1:
+        (sym, c), = coeffs.items()
+        step = abs(modulus) // g
+        root = ((residue - const) // g * pow(c // g, -1, step)) % step
+        return f"LHS and RHS for op='{op}' hold exactly when {sym} = {root} (mod {step})", 0.7, "symbolic"
+    return f"LHS and RHS for op='{op}' hold for some integers (solvable linear congruence modulo {modulus})", 0.7, "symbolic"
@@ -0,0 +1,144 @@
+# verification/prime_batch_verifier.py
+
+import numpy as np
+import sympy as sp
+from utils.sympy_helpers import concrete_int
+from utils.prime_service import prime_table
+from utils.prime_constellations import constellation_table
+from verification.formal_verifier import explain_symbolic_verification
+
+# Ops whose concrete candidates are checked here instead of one by one in explain_symbolic_verification
+BATCH_PRIME_OPS = {"twin_primes", "quadruplet_primes", "triplet_primes", "prime_gap", "diff_of_primes"}
+# Admissible consecutive gaps for each constellation
+GAP_PATTERNS = {"quadruplet_primes": np.array([[2, 4, 2]]), "triplet_primes": np.array([[2, 4], [4, 2]])}
+CONSTELLATION_SIZES = {"quadruplet_primes": 4, "triplet_primes": 3}
+INT64_BOUND = 2**62 # keeps differences of two values inside int64
+
+
+def is_prime_array(values):
+    """ Elementwise primality of an integer array (lookups in the shared prime table, utils/prime_service.py). """
+    return prime_table().isprime_array(values)
+
+def _as_int(value):
+    value = concrete_int(value)
+    return value if value is not None and abs(value) < INT64_BOUND else None
+
+def _as_int_tuple(value):
+    if not isinstance(value, (tuple, list, sp.Tuple)):
+        return None
+    ints = [_as_int(v) for v in value]
+    return None if any(v is None for v in ints) else ints
+
+def _tuple_equation(eq):
+    """ The (values) = (pattern) equation of a constellation candidate, which may come wrapped in an And of constraints. """
+    if isinstance(eq, sp.And):
+        return next((arg for arg in eq.args if isinstance(arg, sp.Equality) and isinstance(arg.lhs, sp.Tuple)), None)
+    return eq if isinstance(eq, sp.Equality) else None
+
+
+def verify_prime_patterns(items, fallback=None):
+    """
+    Batch verification of (eq, op) pairs, returning (explanation, confidence, verdict) results in input order.
+    Concrete twin/quadruplet/triplet/prime_gap/diff_of_primes candidates are decided in one vectorized NumPy pass
+    (gap patterns, constellation and prime table lookups); every other item goes through fallback, a function taking a
+    list of (eq, op) pairs (default: explain_symbolic_verification, one by one).
+    """
+    results = [None] * len(items)
+    pairs, tuples = [], {op: [] for op in CONSTELLATION_SIZES}
+
+    # Pull concrete values out of the candidates
+    for idx, (eq, op) in enumerate(items):
+        if op not in BATCH_PRIME_OPS:
+            continue
+        if op in CONSTELLATION_SIZES:
+            tuple_eq = _tuple_equation(eq)
+            values = _as_int_tuple(tuple_eq.lhs) if tuple_eq is not None else None
+            if values is not None and len(values) == CONSTELLATION_SIZES[op]:
+                tuples[op].append((idx, values))
+        elif isinstance(eq, sp.Equality):
+            # Candidates may carry their operands, Eq((a, b), gap), instead of the evaluated |a - b|
+            operands = _as_int_tuple(eq.lhs)
+            lhs = operands if operands is not None and len(operands) == 2 else _as_int(eq.lhs)
+            rhs = _as_int(eq.rhs)
+            if lhs is not None and rhs is not None:
+                pairs.append((idx, lhs, rhs))
+
+    if pairs:
+        _verify_pairs(items, pairs, results)
+    for op, rows in tuples.items():
+        if rows:
+            _verify_constellations(op, rows, results)
+
+    # Symbolic path for everything that is not concrete
+    missing = [idx for idx, result in enumerate(results) if result is None]
+    if missing:
+        if fallback is None:
+            fallback = lambda batch: [explain_symbolic_verification(eq, None, op) for eq, op in batch]
+        for idx, result in zip(missing, fallback([items[idx] for idx in missing])):
+            results[idx] = result
+    return results
+
+def _verify_pairs(items, pairs, results):
+    """ twin_primes, diff_of_primes and prime_gap: the claimed difference |a - b| against the rhs, over all rows at once. """
+    has_operands = np.array([isinstance(lhs, list) for _, lhs, _ in pairs])
+    operands = np.array([lhs if isinstance(lhs, list) else [2, 2] for _, lhs, _ in pairs], dtype=np.int64)
+    scalar_lhs = np.array([0 if isinstance(lhs, list) else lhs for _, lhs, _ in pairs], dtype=np.int64)
+    value = np.where(has_operands, np.abs(operands[:, 0] - operands[:, 1]), scalar_lhs)
+    claimed = np.array([rhs for _, _, rhs in pairs], dtype=np.int64)
+    matches = value == claimed
+    # Twin pairs are confirmed by a lookup in the twin table; the other rows (and pairs past it) test both members
+    operands_prime = np.zeros(len(pairs), dtype=bool)
+    twins = has_operands & (np.abs(operands[:, 0] - operands[:, 1]) == 2)
+    if twins.any():
+        operands_prime[twins] = constellation_table().contains("twin_primes", np.sort(operands[twins], axis=1))
+    rest = ~operands_prime
+    operands_prime[rest] = is_prime_array(operands[rest]).all(axis=1)
+
+    for row, (idx, _, _) in enumerate(pairs):
+        eq, op = items[idx]
+        if has_operands[row] and not operands_prime[row]:
+            results[idx] = (f"{tuple(eq.lhs)} are not both prime.", 0.2, "False")
+        elif op == "twin_primes":
+            if not matches[row] or value[row] != 2:
+                results[idx] = (f"Twin prime difference not met: {eq.lhs} = {value[row]} (expected 2)", 0.1, "likely_false")
+            elif has_operands[row]:
+                results[idx] = ("Twin prime condition met (difference is 2) and both members are prime.", 0.9, "True")
+            else:
+                results[idx] = ("Twin prime condition met (difference is 2). Primality check is external.", 0.8, "likely_true")
+        elif op == "diff_of_primes":
+            if not matches[row] or value[row] <= 0:
+                results[idx] = (f"Difference of primes is {value[row]}, not the positive difference {claimed[row]}.", 0.2, "False")
+            else:
+                results[idx] = (f"Difference of primes yields a positive difference: {value[row]}.", 0.7, "True")
+        elif not matches[row]:
+            results[idx] = (f"Prime gap {claimed[row]} does not match difference ({value[row]}).", 0.2, "False")
+        else:
+            results[idx] = (f"Prime gap {claimed[row]} matches difference.", 0.9, "True")
+
+def _verify_constellations(op, rows, results):
+    """
+    quadruplet_primes and triplet_primes: gap pattern, then a lookup in the constellation table, for all rows at once.
+    Only rows with the right spacing that are not in the table (or are past it) have their members tested one by one.
+    """
+    values = np.array([vals for _, vals in rows], dtype=np.int64)
+    gaps = np.diff(values, axis=1)
+    spacing_ok = (gaps[:, None, :] == GAP_PATTERNS[op][None, :, :]).all(axis=2).any(axis=1)
+    all_prime = spacing_ok & constellation_table().contains(op, values)
+    primes = np.ones(values.shape, dtype=bool)
+    unsure = np.flatnonzero(spacing_ok & ~all_prime)
+    if len(unsure):
+        primes[unsure] = is_prime_array(values[unsure])
+        all_prime[unsure] = primes[unsure].all(axis=1)
+    name = "Quadruplet" if op == "quadruplet_primes" else "Triplet"
+    expected = " or ".join(str(p.tolist()) for p in GAP_PATTERNS[op])
+    confidence = 0.9 if op == "quadruplet_primes" else 0.85
+
+    for row, (idx, vals) in enumerate(rows):
+        diffs = gaps[row].tolist()
+        if not spacing_ok[row]:
+            results[idx] = (f"{name} gaps not correct: {diffs} (expected {expected})", 0.2, "False")
+        elif not all_prime[row]:
+            composites = [v for v, is_p in zip(vals, primes[row]) if not is_p]
+            results[idx] = (f"{name} spacing met (gaps {diffs}), but {composites} not prime.", 0.2, "False")
+        else:
+            results[idx] = (f"{name} spacing met (gaps {diffs}) and all members are prime.", confidence, "True")
@@ -0,0 +1,315 @@
+# verification/verification_executor.py
+
+import pickle
+import sympy as sp
+from time import monotonic
+from collections import deque
+import multiprocessing as mp
+from multiprocessing.connection import wait
+from config.settings import VERIFICATION_WORKERS, VERIFICATION_TIMEOUT, VERIFICATION_MAX_TASKS_PER_WORKER, VERIFICATION_START_METHOD
+from verification.formal_verifier import explain_symbolic_verification
+from verification.prime_batch_verifier import verify_prime_patterns
+
+MAX_STARTUP_FAILURES = 3 # consecutive worker start-up crashes before pending candidates are failed instead of retried
+
+
+def _verification_worker(conn):
+    """
+    Worker loop: receives pickled (task_id, eq, op) tasks, runs the symbolic verifier and sends back (task_id, result).
+    A None task is the shutdown sentinel.
+    """
+    # Handshake: deadlines only start once the worker has finished its (slow) imports
+    conn.send_bytes(pickle.dumps("ready"))
+    while True:
+        try:
+            data = conn.recv_bytes()
+        except (EOFError, OSError):
+            break
+        # Unpickling rebuilds SymPy objects through their constructors, so keep them unevaluated (Eq(4 + 6, 10) would become True)
+        with sp.evaluate(False):
+            task = pickle.loads(data)
+        if task is None:
+            break
+        task_id, eq, op = task
+        try:
+            result = explain_symbolic_verification(eq, None, op)
+        except Exception as e:
+            result = (f"Verification failed with {type(e).__name__}: {e}", 0.0, "error")
+        try:
+            conn.send_bytes(pickle.dumps((task_id, result)))
+        except Exception as e:
+            # Unpicklable results are reported as strings instead of killing the worker
+            conn.send_bytes(pickle.dumps((task_id, (f"Verification result could not be returned: {e}", 0.0, "error"))))
+    conn.close()
+
+
+class _Worker:
+    """ A single killable verification process and its pipe. """
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe(duplex=True)
+        self.process = ctx.Process(target=_verification_worker, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks_done = 0
+        self.task_id = None
+        self.deadline = None
+        self.ready = False
+
+    @property
+    def busy(self):
+        return self.task_id is not None
+
+    def send(self, task_id, eq, op, timeout):
+        self.conn.send_bytes(pickle.dumps((task_id, eq, op)))
+        self.task_id = task_id
+        self.deadline = monotonic() + timeout
+
+    def close(self):
+        """ Politely stop an idle worker (used for recycling and shutdown). """
+        try:
+            self.conn.send_bytes(pickle.dumps(None))
+        except Exception:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill()
+        self.conn.close()
+
+    def kill(self):
+        """ Hard-stop a worker stuck in a runaway simplify/satisfiable call. """
+        self.process.kill()
+        self.process.join()
+
+
+class VerificationExecutor:
+    """
+    Runs explain_symbolic_verification in a pool of worker processes with a hard per-candidate deadline.
+    - workers: number of worker processes
+    - timeout: per-candidate time budget in seconds; a candidate exceeding it gets a 'timeout' verdict and its worker is killed and replaced
+    - max_tasks_per_worker: workers are recycled after this many tasks so memory leaks (SymPy caches etc.) are contained
+    Workers are started lazily on first use. The verifier is called without the scratchpad (it only reads it when it is a dict).
+    """
+    def __init__(self, workers=VERIFICATION_WORKERS, timeout=VERIFICATION_TIMEOUT, max_tasks_per_worker=VERIFICATION_MAX_TASKS_PER_WORKER,
+                 start_method=VERIFICATION_START_METHOD):
+        if workers < 1:
+            raise ValueError("workers should be >= 1")
+        if max_tasks_per_worker < 1:
+            raise ValueError("max_tasks_per_worker should be >= 1")
+        self.num_workers = workers
+        self.timeout = timeout
+        self.max_tasks_per_worker = max_tasks_per_worker
+        start_method = start_method or ("forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn")
+        self.ctx = mp.get_context(start_method)
+        if start_method == "forkserver":
+            # Import the verifier once in the fork server so fresh/recycled workers start without re-importing SymPy
+            self.ctx.set_forkserver_preload(["__main__", __name__])
+        self.workers = []
+        self.startup_failures = 0
+        self.stats = {"tasks": 0, "timeouts": 0, "crashes": 0, "recycled": 0}
+
+    def _ensure_workers(self):
+        while len(self.workers) < self.num_workers:
+            self.workers.append(_Worker(self.ctx))
+
+    def _replace(self, worker):
+        idx = self.workers.index(worker)
+        self.workers[idx] = _Worker(self.ctx)
+
+    def _abandon_busy(self):
+        """ Kill workers still running a task and drop them; _ensure_workers starts fresh ones on the next call. """
+        for worker in self.workers:
+            if worker.busy:
+                worker.kill()
+                worker.conn.close()
+        self.workers = [w for w in self.workers if not w.busy]
+
+    def verify(self, eq, op):
+        """ Verify a single candidate, blocking until it finishes or its deadline passes. """
+        return self.verify_many([(eq, op)])[0]
+
+    def verify_many(self, items):
+        """
+        Verify a list of (eq, op) pairs and return their (explanation, confidence, verdict) results in input order.
+        """
+        results = [None] * len(items)
+        for task_id, result in self.verify_iter(items):
+            results[task_id] = result
+        return results
+
+    def verify_iter(self, items):
+        """
+        Streaming form of verify_many: items is any iterable of (eq, op) pairs (e.g. a generator still producing
+        candidates), pulled lazily, one per idle worker, so nothing is buffered ahead of the pool.
+        Yields (index, result) pairs in completion order, index being the position of the pair in items.
+        """
+        items = iter(items)
+        pending = deque()
+        pulled, exhausted = 0, False
+
+        def pull(count):
+            nonlocal pulled, exhausted
+            while not exhausted and len(pending) < count:
+                item = next(items, None)
+                if item is None:
+                    exhausted = True
+                else:
+                    pending.append((pulled, item))
+                    pulled += 1
+
+        pull(1)
+        if not pending:
+            return
+        self._ensure_workers()
+        self.startup_failures = 0
+        try:
+            while True:
+                # Hand out work to idle workers
+                pull(sum(1 for w in self.workers if w.ready and not w.busy))
+                for worker in self.workers:
+                    if not pending:
+                        break
+                    if worker.ready and not worker.busy:
+                        task_id, (eq, op) = pending.popleft()
+                        try:
+                            worker.send(task_id, eq, op, self.timeout)
+                        except Exception as e:
+                            worker.kill()
+                            self._replace(worker)
+                            yield task_id, (f"Candidate could not be sent to a verification worker: {e}", 0.0, "error")
+                busy = [w for w in self.workers if w.busy]
+                starting = [w for w in self.workers if not w.ready]
+                if exhausted and not pending and not busy:
+                    return
+
+                # Wait for the next result or handshake, or until the earliest deadline expires
+                wait_for = max(0.0, min(w.deadline for w in busy) - monotonic()) if busy else None
+                ready = wait([w.conn for w in busy + starting], timeout=wait_for)
+                for worker in starting:
+                    if worker.conn in ready:
+                        try:
+                            worker.ready = pickle.loads(worker.conn.recv_bytes()) == "ready"
+                            self.startup_failures = 0
+                        except (EOFError, OSError):
+                            # Worker died during start-up; try a fresh one
+                            self.stats["crashes"] += 1
+                            self.startup_failures += 1
+                            worker.kill()
+                            self._replace(worker)
+                if self.startup_failures >= MAX_STARTUP_FAILURES and not any(w.ready for w in self.workers):
+                    # Workers cannot start at all (e.g. the main module cannot be re-imported); fail instead of respawning forever
+                    while pending or not exhausted:
+                        pull(len(pending) + 1)
+                        if pending:
+                            task_id, _ = pending.popleft()
+                            yield task_id, ("Verification workers failed to start.", 0.0, "error")
+                    return
+                for worker in busy:
+                    if worker.conn in ready:
+                        task_id = worker.task_id
+                        try:
+                            _, result = pickle.loads(worker.conn.recv_bytes())
+                        except (EOFError, OSError):
+                            # Worker died mid-task (e.g. out of memory)
+                            self.stats["crashes"] += 1
+                            result = ("Verification worker exited unexpectedly.", 0.0, "error")
+                            worker.kill()
+                            self._replace(worker)
+                        else:
+                            worker.task_id = None
+                            worker.tasks_done += 1
+                            if worker.tasks_done >= self.max_tasks_per_worker:
+                                self.stats["recycled"] += 1
+                                worker.close()
+                                self._replace(worker)
+                        self.stats["tasks"] += 1
+                        yield task_id, result
+                    elif monotonic() >= worker.deadline:
+                        task_id = worker.task_id
+                        worker.kill()
+                        self._replace(worker)
+                        self.stats["timeouts"] += 1
+                        self.stats["tasks"] += 1
+                        yield task_id, (f"Verification exceeded the {self.timeout}s time budget.", 0.0, "timeout")
+        finally:
+            # Closed early (the consumer broke off or raised): tasks still running belong to this call, so their
+            # late results must not be read by the next one
+            self._abandon_busy()
+
+    def shutdown(self):
+        for worker in self.workers:
+            if worker.busy:
+                worker.kill()
+                worker.conn.close()
+            else:
+                worker.close()
+        self.workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+
+def verify_candidate_batches(executor, batches, facts=None):
+    """
+    Parallel verification stage for one or more sentences.
+    - batches: list of (candidates, op) pairs, one per sentence
+    - facts: optional FactBase; candidates equivalent to (or instances of) known facts are resolved by lookup and
+      new True/False verdicts are added to it
+    Concrete prime-constellation/gap candidates are decided in one vectorized pass; all other candidates are submitted to the
+    executor's pool at once. Verdicts come back per batch, in the original candidate order.
+    """
+    items = [(cand.get('derived_eq'), op) for candidates, op in batches for cand in candidates]
+    flat = [facts.lookup(eq, op) if facts is not None else None for eq, op in items]
+    todo = [idx for idx, known in enumerate(flat) if known is None]
+    for idx, result in zip(todo, verify_prime_patterns([items[idx] for idx in todo], fallback=executor.verify_many)):
+        flat[idx] = result
+        if facts is not None:
+            facts.record(*items[idx], result)
+    results, start = [], 0
+    for candidates, _ in batches:
+        results.append(flat[start:start + len(candidates)])
+        start += len(candidates)
+    return results
+
+def _undecided(batch):
+    return [None] * len(batch)
+
+def verify_candidate_stream(executor, candidates, op, facts=None):
+    """
+    Streaming form of verify_candidate_batches for one sentence: candidates is any iterable of candidate dicts
+    (e.g. a generator that is still producing them). Yields (candidate, result) pairs in candidate order, each as
+    soon as it and every earlier candidate are verified. Fact-base hits and concrete prime patterns are resolved on
+    arrival; the other candidates go to the executor as its workers free up.
+    """
+    arrived, results, task_index = [], {}, []
+
+    def symbolic_items():
+        for cand in candidates:
+            idx = len(arrived)
+            arrived.append(cand)
+            item = (cand.get('derived_eq'), op)
+            result = facts.lookup(*item) if facts is not None else None
+            if result is None:
+                result = verify_prime_patterns([item], fallback=_undecided)[0]
+                if result is not None and facts is not None:
+                    facts.record(*item, result)
+            if result is None:
+                task_index.append(idx)
+                yield item
+            else:
+                results[idx] = result
+
+    released = 0
+    for task_id, result in executor.verify_iter(symbolic_items()):
+        idx = task_index[task_id]
+        results[idx] = result
+        if facts is not None:
+            facts.record(arrived[idx].get('derived_eq'), op, result)
+        while released in results:
+            yield arrived[released], results.pop(released)
+            released += 1
+    while released < len(arrived):
+        yield arrived[released], results.pop(released)
+        released += 1